@@ -0,0 +1,95 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+On-disk cache of advertisement responses, shared by every process using the same data
+directory.
+
+Entries are keyed by aggregate URN and the `geni_available` flag of the request.  Each entry
+is a single line of JSON with the rest of the AM API response (`code`, `output`, ...) and
+the time it was fetched, followed by the advertisement itself as UTF-8, so a hit only reads
+one file and hands the document (as bytes) straight to the parser without any XML-RPC
+decoding.
+"""
+
+
+
+import errno
+import hashlib
+import json
+import os
+import time
+
+import six
+
+from ..rspec import cache as RC
+
+class AdvertisementCache(object):
+  """Cache of `ListResources` responses for advertisements.
+
+  Entries are written to a temporary file and renamed into place, so concurrent writers
+  and readers never see partial entries.  Like `geni.rspec.cache.DirectoryCache` they get
+  the usual permissions for new files, so a data directory shared between users can be
+  read by all of them.
+
+  Args:
+    path (str): The cache directory, which is created if it doesn't exist.
+    ttl (int, float): Number of seconds an entry is used for after it was fetched.
+  """
+
+  def __init__ (self, path, ttl):
+    self.path = os.path.expanduser(os.path.normpath(path))
+    self.ttl = ttl
+    if not os.path.exists(self.path):
+      os.makedirs(self.path)
+
+  def _filepath (self, urn, available):
+    digest = hashlib.sha256(urn.encode("utf-8")).hexdigest()
+    return os.path.join(self.path, "%s-%s.ad" % (digest, "available" if available else "all"))
+
+  def get (self, urn, available):
+    """Returns the cached response for the aggregate with the given URN, or `None` if there
+    isn't one or it is older than `ttl`."""
+    try:
+      with open(self._filepath(urn, available), "rb") as f:
+        header = json.loads(f.readline().decode("utf-8"))
+        if header["urn"] != urn or time.time() - header["fetched"] > self.ttl:
+          return None
+        data = f.read()
+    except (IOError, OSError) as e:
+      if e.errno == errno.ENOENT:
+        return None
+      raise
+    except (ValueError, KeyError, TypeError):
+      # Written by something else, treat it as missing so it gets replaced
+      return None
+
+    response = header["response"]
+    response["value"] = data
+    return response
+
+  def put (self, urn, available, response):
+    """Stores an AM API response dict, whose `value` is the advertisement."""
+    value = response["value"]
+    if isinstance(value, six.text_type):
+      value = value.encode("utf-8")
+    header = {"urn" : urn, "fetched" : time.time(),
+              "response" : dict([(k, v) for (k, v) in response.items() if k != "value"])}
+
+    # Anything in the metadata that JSON can't hold (such as an xmlrpc DateTime) is kept
+    # as its string form
+    RC._replaceFile(self._filepath(urn, available), json.dumps(header, default = str).encode("utf-8"),
+                    b"\n", value)
+
+  def invalidate (self, urn, available = None):
+    """Removes the cached responses for an aggregate (both of them if `available` is
+    `None`)."""
+    for flag in ((True, False) if available is None else (available,)):
+      try:
+        os.unlink(self._filepath(urn, flag))
+      except OSError as e:
+        if e.errno != errno.ENOENT:
+          raise
@@ -0,0 +1,57 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# asyncio versions of the aggregate methods, using geni.minigcf.aio
+
+
+
+import asyncio
+import functools
+
+from ..minigcf import aio as MAIO
+
+class AsyncAM(object):
+  """Coroutine versions of the methods of an :py:class:`geni.aggregate.core.AM`, which take
+  the same arguments and return the same values.  For example::
+
+    ad = await AsyncAM(am).listresources(context)
+    status = await AsyncAM(am).sliverstatus(context, "myslice")
+
+  Other attributes are those of the aggregate itself.
+
+  Args:
+    am (geni.aggregate.core.AM): Aggregate
+    client (geni.minigcf.aio.Client): Client to make calls with (defaults to the client
+      for the running event loop)
+  """
+
+  def __init__ (self, am, client = None):
+    self.am = am
+    self._client = client
+
+  def __getattr__ (self, name):
+    attr = getattr(self.am, name)
+    if name.startswith("_") or not callable(attr):
+      return attr
+    client = self._client
+
+    @functools.wraps(attr)
+    async def call (*args, **kwargs):
+      return await (client or MAIO.default()).run(attr, *args, **kwargs)
+    return call
+
+
+async def getAdvertisements (context, ams, client = None):
+  """Coroutine version of :py:func:`geni.util.getAdvertisements`, fetching every
+  advertisement at once.  Returns a dictionary of `{ aggregate_name : advertisement }`,
+  where the advertisement is `None` if it couldn't be fetched."""
+  async def get (am):
+    try:
+      return await AsyncAM(am, client).listresources(context)
+    except Exception:
+      return None
+  ads = await asyncio.gather(*[get(am) for am in ams])
+  return dict([(am.name, ad) for (am, ad) in zip(ams, ads)])
@@ -52,7 +52,7 @@ class ProtoGENI(AMType):
 
   def parseManifest (self, data):
     from ..rspec import pgmanifest
-    if isinstance(data, (six.string_types)):
+    if isinstance(data, (six.string_types, bytes)):
       manifest = pgmanifest.Manifest(xml = data)
     else:
       manifest = pgmanifest.Manifest(xml = data["value"])
@@ -101,7 +101,7 @@ class VTS(AMType):
 
   def parseManifest (self, data):
     from ..rspec import vtsmanifest
-    if isinstance(data, (six.string_types)):
+    if isinstance(data, (six.string_types, bytes)):
       manifest = vtsmanifest.Manifest(xml = data)
     else:
       manifest = vtsmanifest.Manifest(xml = data["value"])
@@ -119,7 +119,7 @@ class OESS(AMType):
 
   def parseManifest (self, data):
     from ..rspec import oessmanifest
-    if isinstance(data, (six.string_types)):
+    if isinstance(data, (six.string_types, bytes)):
       manifest = oessmanifest.Manifest(xml = data)
     else:
       manifest = oessmanifest.Manifest(xml = data["value"])
@@ -109,7 +109,7 @@ class AMAPIv3(object):
 
 class AMAPIv2(object):
   @staticmethod
-  def listresources (context, url, sname, options = None):
+  def listresources (context, url, sname, options = None, rspec = False):
     if not options: options = {}
 
     from ..minigcf import amapi2 as AM2
@@ -123,7 +123,7 @@ class AMAPIv2(object):
 
     creds.append(open(context.usercred_path, "r", encoding="latin-1").read())
 
-    res = AM2.listresources(url, False, context.cf.cert, context.cf.key, creds, options, surn)
+    res = AM2.listresources(url, False, context.cf.cert, context.cf.key, creds, options, surn, rspec)
     if res["code"]["geni_code"] == 0:
       return res
     if "am_type" in res["code"]:
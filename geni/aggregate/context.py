@@ -124,6 +124,8 @@ class Context(object):
     self.debug = False
     self.uname = None
     self.path = None
+    self.adcache_ttl = None
+    self._adcache = None
 
 #  def save (self):
 #    import geni._coreutil as GCU
@@ -223,6 +225,18 @@ class Context(object):
       os.makedirs(nval)
     self._data_dir = nval
 
+  @property
+  def adcache (self):
+    """The :py:class:`geni.aggregate.adcache.AdvertisementCache` in `datadir` used by
+    `AM.listresources`, or `None` if `adcache_ttl` (in seconds) is not set."""
+    if not self.adcache_ttl:
+      return None
+    if self._adcache is None or self._adcache.path != os.path.join(self.datadir, "adcache"):
+      from .adcache import AdvertisementCache
+      self._adcache = AdvertisementCache(os.path.join(self.datadir, "adcache"), self.adcache_ttl)
+    self._adcache.ttl = self.adcache_ttl
+    return self._adcache
+
 ### TODO: User credentials need to belong to Users, or fix up this profile nonsense
   @property
   def _ucred_info (self):
@@ -141,14 +141,22 @@ class AM(object):
       self._type = AMTypeRegistry.get(self._typestr)
     return self._type
 
-  def listresources (self, context, sname = None, available = False):
+  def listresources (self, context, sname = None, available = False, cached = True, compressed = True):
     """GENI AM APIv2 method to get available resources from an aggregate, or resources allocated to
     a specific sliver.
 
+    If `context.adcache_ttl` is set, advertisements are kept in a cache in `context.datadir` and
+    reused by every process sharing that directory for `adcache_ttl` seconds after they were fetched.
+
     Args:
       context: geni-lib context
       sname (str): Slice name (optional)
       available (bool): Only list available resources
+      cached (bool): Use a cached advertisement if there is a fresh one (the new advertisement
+        is always stored in the cache)
+      compressed (bool): Ask the aggregate to compress the rspec (`geni_compressed`), which is
+        decompressed as it is received.  Aggregates that don't support compression send the
+        rspec as it is, which is also handled.
 
     Returns:
       geni.rspec.RSpec:
@@ -156,11 +164,26 @@ class AM(object):
         `listresources` will return the advertisement rspec for the given aggregate.
     """
 
-    rspec_data = self.api.listresources(context, self.url, sname, {"geni_available" : available})
-    if sname is None:
-      return self.amtype.parseAdvertisement(rspec_data)
-    else:
-      return self.amtype.parseManifest(rspec_data)
+    def fetch ():
+      options = {"geni_available" : available}
+      if compressed:
+        options["geni_compressed"] = True
+      # The parsers take the rspec as bytes, which saves decoding it
+      return self.api.listresources(context, self.url, sname, options, rspec = True)
+
+    if sname is not None:
+      return self.amtype.parseManifest(fetch())
+
+    cache = context.adcache
+    key = self._cmid or self.url
+    rspec_data = None
+    if cache and cached:
+      rspec_data = cache.get(key, available)
+    if rspec_data is None:
+      rspec_data = fetch()
+      if cache:
+        cache.put(key, available, rspec_data)
+    return self.amtype.parseAdvertisement(rspec_data)
 
   def sliverstatus (self, context, sname):
     """GENI AM APIv2 method to get the status of a current sliver at the given aggregate.
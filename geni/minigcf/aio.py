@@ -0,0 +1,400 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# asyncio versions of the MiniGCF calls, over keep-alive HTTP/1.1 connections made with
+# asyncio streams (so no extra dependencies).  For example:
+#
+#   from geni.minigcf import aio
+#
+#   versions = await asyncio.gather(*[aio.amapi2.getversion(url, False, cert, key) for url in urls])
+#
+# The request building and result handling of the synchronous code is reused: `run` calls
+# a synchronous function (any function in amapi2, amapi3, chapi2 and pgch1, a method in
+# `geni.aggregate.apis` or of `geni.aggregate.core.AM` - see `geni.aggregate.aio`) once, in
+# a thread of its own, and `_rpcpost` in that thread hands each XML-RPC call to the event
+# loop and waits for its result.  Only the network I/O runs on the event loop; responses
+# are decoded in the loop's default executor.  Redirects and proxies are not supported
+# (see `Client`).
+
+
+
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import os
+import ssl
+import threading
+import time
+import weakref
+import zlib
+
+import six
+from six.moves.urllib.parse import urlsplit
+
+from . import amapi2 as AM2
+from . import amapi3 as AM3
+from . import chapi2 as CH2
+from . import pgch1 as PGCH1
+from . import config
+from . import rpcdecode
+from . import util
+
+class HTTPError(Exception):
+  def __init__ (self, url, status, reason):
+    super(HTTPError, self).__init__()
+    self.url = url
+    self.status = status
+    self.reason = reason
+  def __str__ (self):
+    return "%d %s: %s" % (self.status, self.reason, self.url)
+
+class _StaleConnection(Exception):
+  """A kept-alive connection was closed by the server before it answered."""
+
+
+class _Feeder(object):
+  """Feeds a response to its parser in the event loop's default executor, one chunk at a
+  time, so that decoding (and decompressing an rspec) doesn't hold up the loop."""
+
+  def __init__ (self, parser):
+    self._parser = parser
+    self._loop = asyncio.get_running_loop()
+
+  async def feed (self, data):
+    if data:
+      await self._loop.run_in_executor(None, self._parser.feed, data)
+
+
+class _Connection(object):
+  def __init__ (self, reader, writer):
+    self.reader = reader
+    self.writer = writer
+
+  def close (self):
+    self.writer.close()
+
+
+async def _body (reader, headers):
+  """Yields the body of a response as it arrives."""
+  if "chunked" in headers.get("transfer-encoding", "").lower():
+    while True:
+      size = int((await reader.readline()).split(b";")[0].strip(), 16)
+      if size == 0:
+        # Skip any trailers
+        while (await reader.readline()).strip():
+          pass
+        return
+      while size:
+        data = await reader.readexactly(min(size, rpcdecode.CHUNK_SIZE))
+        size -= len(data)
+        yield data
+      await reader.readexactly(2)
+  elif "content-length" in headers:
+    remaining = int(headers["content-length"])
+    while remaining:
+      data = await reader.read(min(remaining, rpcdecode.CHUNK_SIZE))
+      if not data:
+        raise asyncio.IncompleteReadError(b"", remaining)
+      remaining -= len(data)
+      yield data
+  else:
+    while True:
+      data = await reader.read(rpcdecode.CHUNK_SIZE)
+      if not data:
+        return
+      yield data
+
+
+def _isCall (name, func, module):
+  # The XML-RPC call wrappers are the public functions defined in the module itself, and
+  # all take the URL to call as their first argument
+  if name.startswith("_") or func.__module__ != module.__name__:
+    return False
+  params = list(inspect.signature(func).parameters)
+  return bool(params) and params[0] == "url"
+
+class _API(object):
+  """Coroutine versions of the XML-RPC call functions in a MiniGCF module, which take the
+  same arguments and return the same values."""
+
+  def __init__ (self, module, client = None):
+    self._module = module
+    self._client = client
+    self._names = frozenset([name for (name, func) in inspect.getmembers(module, inspect.isfunction)
+                             if _isCall(name, func, module)])
+
+  def __dir__ (self):
+    return sorted(self._names)
+
+  def __getattr__ (self, name):
+    if name.startswith("_") or name not in self._names:
+      raise AttributeError(name)
+    func = getattr(self._module, name)
+    client = self._client
+
+    @functools.wraps(func)
+    async def call (*args, **kwargs):
+      return await (client or default()).run(func, *args, **kwargs)
+    return call
+
+
+class Client(object):
+  """Makes XML-RPC calls from asyncio code.
+
+  Connections are kept open (if `config.HTTP.KEEPALIVE` is set) and reused for later calls
+  to the same host with the same certificate, and no more than `max_per_host` calls to
+  any one host (scheme, host and port) are made at once.  Other calls wait for one of those
+  to finish.  A client should only be used from one event loop.
+
+  Requests are made with a small HTTP/1.1 client rather than with `requests`, which
+  doesn't support everything the synchronous calls do:
+
+  * Redirects are never followed, whatever `config.HTTP.ALLOW_REDIRECTS` is set to.
+    A redirect response raises :py:class:`HTTPError` like any other status but 200.
+  * Proxies are not used, including those set in the environment (`HTTPS_PROXY` and
+    similar).  Every host is connected to directly.
+
+  Attributes:
+    amapi2: Coroutine versions of the functions in :py:mod:`geni.minigcf.amapi2`
+    amapi3: Coroutine versions of the functions in :py:mod:`geni.minigcf.amapi3`
+    chapi2: Coroutine versions of the functions in :py:mod:`geni.minigcf.chapi2`
+    pgch1: Coroutine versions of the functions in :py:mod:`geni.minigcf.pgch1`
+
+  Args:
+    max_per_host (int): Calls in progress to the same host at once (defaults to
+      `config.HTTP.MAX_CONNECTIONS`)
+  """
+
+  def __init__ (self, max_per_host = None):
+    self.max_per_host = max_per_host or config.HTTP.MAX_CONNECTIONS
+    self._idle = {}
+    self._limits = {}
+    self._contexts = {}
+    self._pid = os.getpid()
+
+    self.amapi2 = _API(AM2, self)
+    self.amapi3 = _API(AM3, self)
+    self.chapi2 = _API(CH2, self)
+    self.pgch1 = _API(PGCH1, self)
+
+  def close (self):
+    """Close every open connection that isn't in use."""
+    for conns in self._idle.values():
+      for conn in conns:
+        conn.close()
+    self._idle = {}
+
+  async def run (self, func, *args, **kwargs):
+    """Call a synchronous MiniGCF function (or API or AM method), with the XML-RPC calls
+    it makes done by this client, and return its result.
+
+    The function runs in a new thread, so it doesn't hold up the event loop while it
+    builds requests or handles responses.  Objects it shares with other calls in progress
+    (such as an aggregate object) are used from several threads at once."""
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    pending = [None, False]   # The call being waited for, and whether run was cancelled
+
+    def call (*request):
+      if pending[1]:
+        raise concurrent.futures.CancelledError()
+      pending[0] = asyncio.run_coroutine_threadsafe(self.call(*request), loop)
+      try:
+        return pending[0].result()
+      finally:
+        pending[0] = None
+
+    def settle (result, exc):
+      if not done.cancelled():
+        if exc is not None:
+          done.set_exception(exc)
+        else:
+          done.set_result(result)
+
+    def target ():
+      (result, exc) = (None, None)
+      try:
+        with util._forwarding(call):
+          result = func(*args, **kwargs)
+      except BaseException as e: # pylint: disable=broad-except
+        exc = e
+      try:
+        loop.call_soon_threadsafe(settle, result, exc)
+      except RuntimeError:
+        # The loop has been closed, so nothing is waiting for the result
+        pass
+
+    threading.Thread(target = target, name = "geni-aio-run", daemon = True).start()
+    try:
+      return await done
+    except asyncio.CancelledError:
+      pending[1] = True
+      if pending[0] is not None:
+        pending[0].cancel()
+      raise
+
+  def _context (self, cert, verify):
+    key = (cert, verify)
+    ctx = self._contexts.get(key)
+    if ctx is None:
+      if isinstance(verify, six.string_types) and os.path.isdir(verify):
+        ctx = ssl.create_default_context(capath = verify)
+      elif isinstance(verify, six.string_types):
+        ctx = ssl.create_default_context(cafile = verify)
+      else:
+        ctx = ssl.create_default_context()
+      if not verify:
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+      if isinstance(cert, tuple):
+        ctx.load_cert_chain(cert[0], cert[1])
+      elif cert:
+        ctx.load_cert_chain(cert)
+      self._contexts[key] = ctx
+    return ctx
+
+  async def _connect (self, parts, cert, verify):
+    ctx = self._context(cert, verify) if parts.scheme == "https" else None
+    port = parts.port or (443 if ctx else 80)
+    (reader, writer) = await asyncio.wait_for(
+      asyncio.open_connection(parts.hostname, port, ssl = ctx, server_hostname = parts.hostname if ctx else None),
+      config.HTTP.TIMEOUT)
+    return _Connection(reader, writer)
+
+  async def call (self, url, req_data, cert, root_bundle, rspec = False, compressed = False):
+    """Make an XML-RPC call, taking the same arguments as (and returning the same values
+    as) `geni.minigcf.util._rpcpost`.
+
+    Raises:
+      HTTPError: The server's response status wasn't 200
+    """
+    if isinstance(config.HTTP.LOG_URLS, tuple):
+      config.HTTP.LOG_URLS[0].log(config.HTTP.LOG_URLS[1], "POST: %s" % (url))
+    if isinstance(config.HTTP.LOG_RAW_REQUESTS, tuple):
+      config.HTTP.LOG_RAW_REQUESTS[0].log(config.HTTP.LOG_RAW_REQUESTS[1], req_data)
+    if self._pid != os.getpid():
+      # Drop (without closing) connections inherited from the parent
+      (self._idle, self._limits, self._pid) = ({}, {}, os.getpid())
+
+    start = time.time()
+    parts = urlsplit(url)
+    host = (parts.scheme, parts.hostname, parts.port)
+    key = (host, cert, root_bundle)
+    body = req_data.encode("utf-8") if isinstance(req_data, six.text_type) else req_data
+
+    limit = self._limits.get(host)
+    if limit is None:
+      limit = self._limits[host] = asyncio.Semaphore(self.max_per_host)
+    async with limit:
+      while True:
+        idle = self._idle.get(key)
+        conn = idle.pop() if idle else None
+        reused = conn is not None
+        if conn is None:
+          conn = await self._connect(parts, cert, root_bundle)
+        parser = rpcdecode._parser(rspec, compressed)
+        counts = [0, 0]
+        try:
+          keep = await self._exchange(conn, url, parts, body, reused, _Feeder(parser), counts)
+        except _StaleConnection:
+          conn.close()
+          continue
+        except BaseException:
+          conn.close()
+          raise
+        if keep and config.HTTP.KEEPALIVE:
+          self._idle.setdefault(key, []).append(conn)
+        else:
+          conn.close()
+        break
+
+    result = await asyncio.get_running_loop().run_in_executor(None, parser.close)
+    if isinstance(config.HTTP.LOG_TRANSFER_STATS, tuple):
+      config.HTTP.LOG_TRANSFER_STATS[0].log(config.HTTP.LOG_TRANSFER_STATS[1],
+                                            "POST: %s: %d bytes on the wire, %d bytes of XML-RPC, %.3fs" % (
+                                              url, counts[0], counts[1], time.time() - start))
+    return result
+
+  async def _exchange (self, conn, url, parts, body, reused, parser, counts):
+    """Send a request on `conn` and feed the response body to `parser`.  Returns whether
+    the connection can be used again."""
+    path = parts.path or "/"
+    if parts.query:
+      path = "%s?%s" % (path, parts.query)
+    head = ["POST %s HTTP/1.1" % (path), "Host: %s" % (parts.netloc), "Content-Type: text/xml",
+            "Content-Length: %d" % (len(body)), "Accept-Encoding: gzip", "Connection: keep-alive"]
+    head.extend(["%s: %s" % (name, value) for (name, value) in util.headers().items()])
+
+    try:
+      conn.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+      await conn.writer.drain()
+      line = await asyncio.wait_for(conn.reader.readline(), config.HTTP.TIMEOUT)
+    except (ConnectionError, asyncio.IncompleteReadError):
+      if reused:
+        raise _StaleConnection()
+      raise
+    if not line:
+      if reused:
+        raise _StaleConnection()
+      raise ConnectionResetError("Connection closed by %s" % (parts.netloc))
+
+    (version, status, reason) = (line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+    headers = {}
+    while True:
+      line = await conn.reader.readline()
+      if not line.strip():
+        break
+      (name, value) = line.decode("latin-1").split(":", 1)
+      headers[name.strip().lower()] = value.strip()
+    if int(status) != 200:
+      raise HTTPError(url, int(status), reason)
+
+    keep = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            and ("content-length" in headers or "transfer-encoding" in headers))
+    decoder = None
+    if headers.get("content-encoding", "").lower() == "gzip":
+      decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    raw = [] if isinstance(config.HTTP.LOG_RAW_RESPONSES, tuple) else None
+
+    async for data in _body(conn.reader, headers):
+      counts[0] += len(data)
+      if decoder:
+        data = decoder.decompress(data)
+      counts[1] += len(data)
+      if raw is not None:
+        raw.append(data)
+      await parser.feed(data)
+    if decoder:
+      data = decoder.flush()
+      counts[1] += len(data)
+      if raw is not None:
+        raw.append(data)
+      await parser.feed(data)
+
+    if raw is not None:
+      config.HTTP.LOG_RAW_RESPONSES[0].log(config.HTTP.LOG_RAW_RESPONSES[1], b"".join(raw))
+    return keep
+
+
+_CLIENTS = weakref.WeakKeyDictionary()
+
+def default ():
+  """Returns the client used by the module level functions in the running event loop."""
+  loop = asyncio.get_event_loop()
+  client = _CLIENTS.get(loop)
+  if client is None:
+    client = _CLIENTS[loop] = Client()
+  return client
+
+async def run (func, *args, **kwargs):
+  """As :py:meth:`Client.run`, with the default client."""
+  return await default().run(func, *args, **kwargs)
+
+amapi2 = _API(AM2)
+amapi3 = _API(AM3)
+chapi2 = _API(CH2)
+pgch1 = _API(PGCH1)
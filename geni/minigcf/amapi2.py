@@ -19,7 +19,9 @@ def getversion (url, root_bundle, cert, key, options = None):
   req_data = xmlrpclib.dumps((options,), methodname="GetVersion")
   return _rpcpost(url, req_data, (cert, key), root_bundle)
 
-def listresources (url, root_bundle, cert, key, cred_strings, options = None, sliceurn = None):
+# If `rspec` is set the rspec in the `value` of the result is returned as UTF-8 bytes
+# (or written to `rspec`, if it is a writable binary file) rather than as text
+def listresources (url, root_bundle, cert, key, cred_strings, options = None, sliceurn = None, rspec = False):
   if not options: options = {}
   opts = {"geni_rspec_version" : {"version" : "3", "type" : "GENI"},
           "geni_available" : False,
@@ -32,7 +34,8 @@ def listresources (url, root_bundle, cert, key, cred_strings, options = None, sl
   opts.update(options)
 
   req_data = xmlrpclib.dumps((cred_strings, opts), methodname="ListResources")
-  return _rpcpost(url, req_data, (cert, key), root_bundle)
+  return _rpcpost(url, req_data, (cert, key), root_bundle, rspec = rspec,
+                  compressed = bool(opts["geni_compressed"]))
 
 def deletesliver (url, root_bundle, cert, key, creds, slice_urn, options = None):
   if not options: options = {}
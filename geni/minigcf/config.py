@@ -14,6 +14,15 @@ class HTTP(object):
   ALLOW_REDIRECTS = False
   """Allow MiniGCF to follow HTTP redirects (301)."""
 
+  KEEPALIVE = True
+  """Keep connections open and reuse them for later calls to the same aggregate or
+  clearinghouse (with the same certificate) from this process."""
+
+  MAX_CONNECTIONS = 4
+  """Maximum number of connections open at once to each aggregate or clearinghouse (per
+  certificate) when `KEEPALIVE` is set.  Calls made while that many are in use wait for
+  one to be free."""
+
   LOG_RAW_RESPONSES = False
   """If set to a valid `(log_handle, log_level)` tuple, will write all raw responses
   (before any parsing) from AM API and CH API calls to that log at the given level."""
@@ -24,3 +33,8 @@ class HTTP(object):
 
   LOG_URLS = False
   """If set to a valid `(log_handle, log_level)` tuple, will log all URLs as they are used."""
+
+  LOG_TRANSFER_STATS = False
+  """If set to a valid `(log_handle, log_level)` tuple, will log the number of bytes received
+  (as sent on the wire, before any HTTP content decoding, and as decoded) and the time taken
+  by every AM API and CH API call."""
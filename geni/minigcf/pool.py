@@ -0,0 +1,66 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# Process-wide pool of HTTPS sessions, so that calls to the same aggregate or clearinghouse
+# reuse open (keep-alive) connections instead of making a new TLS connection each time
+
+
+
+import os
+import threading
+
+import requests
+from six.moves.urllib.parse import urlsplit
+
+from .. import _coreutil as GCU
+from . import config
+
+_LOCK = threading.Lock()
+_SESSIONS = {}
+_PID = None
+
+def _newSession (prefix):
+  s = requests.Session()
+  s.mount(prefix, GCU.TLSHttpAdapter(pool_connections = 1, pool_maxsize = config.HTTP.MAX_CONNECTIONS,
+                                     pool_block = True))
+  return s
+
+def session (url, cert, verify):
+  """Returns the session to use for a call to `url` with the given client certificate
+  (`(cert, key)` paths) and `verify` setting (as for `requests`), which should still be
+  passed with each request.
+
+  Sessions are shared by every call in this process to the same scheme, host and port
+  with the same certificate and verify setting.  A process forked from one that has
+  made calls starts with no sessions, as connections can't be shared with the parent.
+  If `config.HTTP.KEEPALIVE` is false a new session is returned every time, which the
+  caller should close.
+  """
+  global _PID # pylint: disable=global-statement
+
+  parts = urlsplit(url)
+  prefix = "%s://%s/" % (parts.scheme, parts.netloc.lower())
+  if not config.HTTP.KEEPALIVE:
+    return _newSession(prefix)
+
+  key = (prefix, cert, verify)
+  with _LOCK:
+    if _PID != os.getpid():
+      # Drop (without closing) anything inherited from the parent
+      _SESSIONS.clear()
+      _PID = os.getpid()
+    s = _SESSIONS.get(key)
+    if s is None:
+      s = _SESSIONS[key] = _newSession(prefix)
+  return s
+
+def clear ():
+  """Close every pooled connection in this process."""
+  with _LOCK:
+    sessions = list(_SESSIONS.values()) if _PID == os.getpid() else []
+    _SESSIONS.clear()
+  for s in sessions:
+    s.close()
@@ -0,0 +1,254 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# Incremental XML-RPC response decoding with lxml, producing the same values as
+# xmlrpclib.loads(data, use_datetime=True)[0][0]
+
+
+
+import base64
+import datetime
+import decimal
+import io
+import zlib
+
+from lxml import etree as ET
+from six.moves import xmlrpc_client as xmlrpclib
+import six
+
+CHUNK_SIZE = 64 * 1024
+
+def _boolean (text):
+  if text == "0":
+    return False
+  if text == "1":
+    return True
+  raise TypeError("bad boolean value")
+
+def _datetime (text):
+  return datetime.datetime.strptime(text, "%Y%m%dT%H:%M:%S")
+
+def _binary (text):
+  return xmlrpclib.Binary(base64.decodebytes(text.encode("ascii")))
+
+_SCALARS = {
+  "int" : int, "i1" : int, "i2" : int, "i4" : int, "i8" : int, "biginteger" : int,
+  "boolean" : _boolean,
+  "double" : float, "float" : float, "bigdecimal" : decimal.Decimal,
+  "dateTime.iso8601" : _datetime,
+  "base64" : _binary,
+  "nil" : lambda text: None,
+}
+
+_TAGS = set(_SCALARS) | set(["value", "string", "name", "struct", "array", "data", "member",
+                             "params", "param", "fault", "methodResponse", "methodName"])
+
+class _Inflater(object):
+  """Writes a base64-encoded, zlib-compressed rspec (as sent for `geni_compressed`) to
+  `sink` as it arrives, decoded.  Aggregates that ignore the option send plain XML, which
+  is passed through as is."""
+
+  def __init__ (self, sink):
+    self._sink = sink
+    self._zlib = zlib.decompressobj()
+    self._b64 = b""
+    self._plain = None
+
+  def write (self, data):
+    if self._plain is None:
+      data = data.lstrip()
+      if not data:
+        return
+      self._plain = data.startswith(b"<")
+    if self._plain:
+      self._sink.write(data)
+      return
+
+    # Only whole groups of 4 base64 characters can be decoded
+    data = self._b64 + b"".join(data.split())
+    cut = len(data) - (len(data) % 4)
+    self._b64 = data[cut:]
+    self._sink.write(self._zlib.decompress(base64.b64decode(data[:cut])))
+
+  def close (self):
+    if self._plain is False:
+      self._sink.write(self._zlib.decompress(base64.b64decode(self._b64)))
+      self._sink.write(self._zlib.flush())
+
+
+class Unmarshaller(object):
+  """lxml parser target that builds a response as it is parsed, following the same rules
+  as `xmlrpclib.Unmarshaller`.
+
+  If `rspec` is set, the `value` member of the response struct (the rspec of a
+  ListResources, Describe or similar call) is encoded to UTF-8 as it is parsed rather
+  than being built as a string.  `rspec` can be `True`, to return it as bytes, or a
+  writable binary file, which it is written to and returned in place of the value.  If
+  `compressed` is also set, that member is decompressed (see `geni_compressed` in the AM
+  API) as it is parsed.
+  """
+
+  def __init__ (self, rspec = False, compressed = False):
+    self._stack = []
+    self._marks = []
+    self._data = []
+    self._value = False
+    self._type = None
+    self._failed = False
+
+    self._rspec = rspec
+    self._compressed = compressed
+    self._member = False    # The next value is the rspec member
+    self._pending = False   # Inside the rspec member, which may still turn out not to be a string
+    self._sink = None       # Where rspec text goes once we know it's a string
+    self._out = None        # Where the (decompressed) rspec ends up
+    self._pieces = []       # Text not yet written to the sink
+
+  def start (self, tag, attrib):
+    tag = tag.rsplit("}", 1)[-1]
+    if tag == "array" or tag == "struct":
+      self._marks.append(len(self._stack))
+    self._data = []
+    if self._value and tag not in _TAGS:
+      self._failed = True
+      raise xmlrpclib.ResponseError("unknown tag %r" % tag)
+    self._value = (tag == "value")
+
+    if self._pending:
+      if tag == "string":
+        self._openSink()
+      else:
+        self._pending = False
+    elif self._member and tag == "value":
+      self._member = False
+      self._pending = True
+
+  def data (self, text):
+    if self._sink is not None:
+      # libxml2 passes escaped text in small pieces (split at each entity), so they're
+      # written in batches
+      pieces = self._pieces
+      pieces.append(text)
+      if len(pieces) >= 4096:
+        self._flush()
+    elif self._pending and self._value and text.strip():
+      # Text directly in the <value> is a string, so there won't be a type element
+      self._openSink()
+      self._pieces.append(text)
+    else:
+      self._data.append(text)
+
+  def _flush (self):
+    try:
+      self._sink.write("".join(self._pieces).encode("utf-8"))
+    except Exception:
+      self._failed = True
+      raise
+    self._pieces = []
+
+  def _openSink (self):
+    self._pending = False
+    self._out = io.BytesIO() if self._rspec is True else self._rspec
+    self._sink = _Inflater(self._out) if self._compressed else self._out
+    self._pieces = self._data
+    self._data = []
+
+  def _closeSink (self):
+    self._flush()
+    if self._compressed:
+      try:
+        self._sink.close()
+      except Exception:
+        self._failed = True
+        raise
+    out = self._out
+    (self._sink, self._out) = (None, None)
+    self._stack.append(out.getvalue() if self._rspec is True else out)
+    self._value = False
+
+  def end (self, tag):
+    tag = tag.rsplit("}", 1)[-1]
+    data = "".join(self._data)
+    self._data = []
+
+    if tag == "string" or (tag == "value" and self._value):
+      if self._sink is not None:
+        self._closeSink()
+        return
+      if self._pending:
+        # An empty or whitespace-only rspec
+        self._openSink()
+        self._pieces.append(data)
+        self._closeSink()
+        return
+      self._stack.append(data)
+      self._value = False
+    elif tag == "name":
+      self._stack.append(data)
+      self._value = False
+      self._member = (self._rspec is not False and data == "value" and len(self._marks) == 1)
+    elif tag in _SCALARS:
+      try:
+        self._stack.append(_SCALARS[tag](data))
+      except Exception:
+        self._failed = True
+        raise
+      self._value = False
+    elif tag == "struct":
+      mark = self._marks.pop()
+      items = self._stack[mark:]
+      self._stack[mark:] = [dict(zip(items[::2], items[1::2]))]
+      self._value = False
+    elif tag == "array":
+      mark = self._marks.pop()
+      self._stack[mark:] = [self._stack[mark:]]
+      self._value = False
+    elif tag == "params" or tag == "fault":
+      self._type = tag
+
+  def close (self):
+    if self._failed:
+      # lxml still closes the target after an error in a handler; let that error through
+      return None
+    if self._type is None or self._marks:
+      raise xmlrpclib.ResponseError()
+    if self._type == "fault":
+      raise xmlrpclib.Fault(**self._stack[0])
+    return self._stack[0]
+
+
+def _parser (rspec, compressed):
+  # Rspecs are sent as a single string value, which can be larger than the text node limit
+  # libxml2 applies without huge_tree
+  return ET.XMLParser(target = Unmarshaller(rspec, compressed), huge_tree = True,
+                      resolve_entities = False, no_network = True)
+
+def loadStream (chunks, rspec = False, compressed = False):
+  """Decodes an XML-RPC response from an iterable of bytes chunks (such as
+  `requests.Response.iter_content()`) as they arrive, and returns its single parameter.
+
+  Args:
+    chunks: Iterable of bytes
+    rspec: `True` to return the `value` member of the response as UTF-8 bytes, or a
+      writable binary file to write it to (the file is returned as the `value`)
+    compressed (bool): The `value` member was requested with `geni_compressed`, and is
+      decompressed as it is decoded (only used with `rspec`)
+
+  Raises:
+    xmlrpclib.Fault: The response is a fault
+    xmlrpclib.ResponseError: The response isn't a valid XML-RPC response
+    lxml.etree.XMLSyntaxError: The response isn't well-formed XML
+  """
+  parser = _parser(rspec, compressed)
+  for chunk in chunks:
+    parser.feed(chunk)
+  return parser.close()
+
+def loads (data, rspec = False, compressed = False):
+  """Decodes an XML-RPC response body (bytes), as :py:func:`loadStream`."""
+  if isinstance(data, six.text_type):
+    data = data.encode("utf-8")
+  return loadStream([data], rspec, compressed)
@@ -6,31 +6,82 @@
 
 
 
-from six.moves import xmlrpc_client as xmlrpclib
-
-import requests
+import threading
+import time
 
 from .. import _coreutil as GCU
 from . import config
+from . import pool
+from . import rpcdecode
 
 GCU.disableUrllibWarnings()
 
 def headers ():
   return GCU.defaultHeaders()
 
+class _Forward(threading.local):
+  call = None
+
+_FORWARD = _Forward()
+
+class _forwarding(object):
+  """Context manager under which `_rpcpost`, in this thread, passes its arguments to
+  `call` and returns its result instead of making the request itself.  Used by
+  :py:mod:`geni.minigcf.aio` to make the calls of synchronous code from an event loop."""
+  def __init__ (self, call):
+    self.call = call
+    self._saved = None
+  def __enter__ (self):
+    self._saved = _FORWARD.call
+    _FORWARD.call = self.call
+    return self
+  def __exit__ (self, *args):
+    _FORWARD.call = self._saved
+
+def _counted (chunks, counts):
+  for chunk in chunks:
+    counts[0] += len(chunk)
+    yield chunk
+
 # pylint: disable=unsubscriptable-object
-def _rpcpost (url, req_data, cert, root_bundle):
+def _rpcpost (url, req_data, cert, root_bundle, rspec = False, compressed = False):
+  """POST an XML-RPC request and return the decoded response, which is decoded as it is
+  read from the connection.  If `rspec` is set the `value` of the response is an rspec,
+  and is returned as UTF-8 bytes (or written to `rspec`, if it is a file - see
+  :py:func:`rpcdecode.loadStream`).  If `compressed` is also set the rspec was requested
+  with `geni_compressed`, and is decompressed as it is decoded."""
+  if _FORWARD.call is not None:
+    return _FORWARD.call(url, req_data, cert, root_bundle, rspec, compressed)
+
   if isinstance(config.HTTP.LOG_URLS, tuple):
     config.HTTP.LOG_URLS[0].log(config.HTTP.LOG_URLS[1], "POST: %s" % (url))
-  s = requests.Session()
-  s.mount(url, GCU.TLSHttpAdapter())
+  start = time.time()
+  s = pool.session(url, cert, root_bundle)
   if isinstance(config.HTTP.LOG_RAW_REQUESTS, tuple):
     config.HTTP.LOG_RAW_REQUESTS[0].log(config.HTTP.LOG_RAW_REQUESTS[1], req_data)
-  resp = s.post(url, req_data, cert=cert, verify=root_bundle, headers = headers(),
-                timeout = config.HTTP.TIMEOUT, allow_redirects = config.HTTP.ALLOW_REDIRECTS)
-  if resp.status_code != 200:
-    resp.raise_for_status()
-  if isinstance(config.HTTP.LOG_RAW_RESPONSES, tuple):
-    config.HTTP.LOG_RAW_RESPONSES[0].log(config.HTTP.LOG_RAW_RESPONSES[1], resp.content)
-  return xmlrpclib.loads(resp.content, use_datetime=True)[0][0]
-  
+  resp = None
+  try:
+    resp = s.post(url, req_data, cert=cert, verify=root_bundle, headers = headers(), timeout = config.HTTP.TIMEOUT,
+                  allow_redirects = config.HTTP.ALLOW_REDIRECTS, stream = True)
+    if resp.status_code != 200:
+      resp.raise_for_status()
+    counts = [0]
+    if isinstance(config.HTTP.LOG_RAW_RESPONSES, tuple):
+      config.HTTP.LOG_RAW_RESPONSES[0].log(config.HTTP.LOG_RAW_RESPONSES[1], resp.content)
+      counts[0] = len(resp.content)
+      result = rpcdecode.loads(resp.content, rspec, compressed)
+    else:
+      # iter_content (rather than resp.raw) undoes any Content-Encoding
+      result = rpcdecode.loadStream(_counted(resp.iter_content(rpcdecode.CHUNK_SIZE), counts), rspec,
+                                    compressed)
+    if isinstance(config.HTTP.LOG_TRANSFER_STATS, tuple):
+      config.HTTP.LOG_TRANSFER_STATS[0].log(config.HTTP.LOG_TRANSFER_STATS[1],
+                                            "POST: %s: %d bytes on the wire, %d bytes of XML-RPC, %.3fs" % (
+                                              url, resp.raw.tell(), counts[0], time.time() - start))
+    return result
+  finally:
+    if resp is not None:
+      # Returns the connection to the pool if the whole response was read
+      resp.close()
+    if not config.HTTP.KEEPALIVE:
+      s.close()
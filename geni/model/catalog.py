@@ -0,0 +1,212 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Catalog of the disk images offered across many aggregates.
+
+Advertisements are streamed the same way :py:func:`geni.rspec.pgad.iterAdvertisement` reads
+them, so ingesting a large advertisement doesn't hold the whole document in memory.  The
+catalog can be saved to a JSON file and loaded again without fetching or parsing any
+advertisements::
+
+  from geni.model.catalog import ImageCatalog
+
+  catalog = ImageCatalog("~/.bssw/geni/images.json")
+  for (am, path) in ads:
+    catalog.ingest(am.name, path = path)
+  catalog.save()
+
+  for entry in catalog.find(hardware_type = "d430"):
+    print(entry.image.name, sorted(entry.aggregates))
+"""
+
+
+
+import errno
+import json
+import os
+
+class CatalogEntry(object):
+  """An image and where it is offered.
+
+  Attributes:
+    image (geni.rspec.pgad.Image): The image, as first seen in an advertisement
+    aggregates (dict): Mapping of `{ aggregate : set(hardware_type, ...), ... }` for the
+      aggregates that offer the image and the hardware types of the nodes offering it
+    aggregate_sliver_types (dict): Mapping of `{ aggregate : set(sliver_type, ...), ... }`
+      with the sliver types each aggregate offers the image for
+  """
+
+  def __init__ (self, image):
+    self.image = image
+    self.aggregates = {}
+    self.aggregate_sliver_types = {}
+
+  def __repr__ (self):
+    return "<CatalogEntry: %s, %d aggregates>" % (self.image.name, len(self.aggregates))
+
+  @property
+  def hardware_types (self):
+    """Set of hardware types offering the image at any aggregate."""
+    return set().union(*self.aggregates.values())
+
+  @property
+  def sliver_types (self):
+    """Set of sliver types the image is offered for at any aggregate."""
+    return set().union(*self.aggregate_sliver_types.values())
+
+  def _remove (self, aggregate):
+    self.aggregate_sliver_types.pop(aggregate, None)
+    return self.aggregates.pop(aggregate, None) is not None
+
+  def _json (self):
+    img = self.image
+    aggs = dict([(agg, {"hardware_types" : sorted(hw),
+                        "sliver_types" : sorted(self.aggregate_sliver_types[agg])})
+                 for (agg, hw) in self.aggregates.items()])
+    return {"name" : img.name, "os" : img.os, "version" : img.version, "description" : img.description,
+            "url" : img.url, "aggregates" : aggs}
+
+  @classmethod
+  def _fromjson (cls, obj):
+    from ..rspec.pgad import Image
+
+    img = Image()
+    (img.name, img.os, img.version, img.description, img.url) = (obj["name"], obj["os"], obj["version"],
+                                                                 obj["description"], obj["url"])
+    entry = cls(img)
+    for (agg, info) in obj["aggregates"].items():
+      entry.aggregates[agg] = set(info["hardware_types"])
+      entry.aggregate_sliver_types[agg] = set(info["sliver_types"])
+    return entry
+
+
+class ImageCatalog(object):
+  """Images offered by a set of aggregates, keyed by image name (the image URN, or the URL
+  for images that only have one).
+
+  Args:
+    path (str): JSON file to load the catalog from (if it exists) and save it to
+  """
+
+  VERSION = 1
+
+  class InvalidCatalogError(Exception):
+    def __init__ (self, path, version):
+      super(ImageCatalog.InvalidCatalogError, self).__init__()
+      self.path = path
+      self.version = version
+    def __str__ (self):
+      return "Image catalog %s has unsupported version %s" % (self.path, self.version)
+
+  def __init__ (self, path = None):
+    self._entries = {}
+    self.path = None
+    if path:
+      self.path = os.path.expanduser(os.path.normpath(path))
+      try:
+        self._load()
+      except (IOError, OSError) as e:
+        if e.errno != errno.ENOENT:
+          raise
+
+  def __len__ (self):
+    return len(self._entries)
+
+  def __iter__ (self):
+    return iter(self._entries.values())
+
+  def __contains__ (self, name):
+    return name in self._entries
+
+  def __getitem__ (self, name):
+    return self._entries[name]
+
+  def get (self, name, default = None):
+    return self._entries.get(name, default)
+
+  def remove (self, aggregate):
+    """Forget every image offered by `aggregate`."""
+    for (name, entry) in list(self._entries.items()):
+      if entry._remove(aggregate) and not entry.aggregates:
+        del self._entries[name]
+
+  def ingest (self, aggregate, path = None, xml = None):
+    """Add the images in an advertisement, replacing anything previously ingested for the
+    same aggregate.
+
+    Args:
+      aggregate (str): Name or URN of the aggregate the advertisement is from
+      path (str): Path to an advertisement on disk
+      xml (str, bytes): In-memory advertisement
+
+    Returns:
+      int: Number of distinct images offered by the aggregate
+    """
+    from ..rspec import pgad
+
+    self.remove(aggregate)
+    entries = self._entries
+    seen = set()
+    # Reads the node elements directly (as AdNode would decode hardware_types and images)
+    # so that an Image is only built the first time each name is seen
+    for elem in pgad._iterElements(path, xml, (pgad._NODE,)):
+      node = pgad._NodeChildren(elem)
+      hwtypes = [name for (name, _) in node.hardware_types]
+      for (sname, images) in node.sliver_types:
+        for (name, imelem) in images:
+          entry = entries.get(name)
+          if entry is None:
+            entry = entries[name] = CatalogEntry(pgad.Image._fromdom(imelem))
+          hw = entry.aggregates.get(aggregate)
+          if hw is None:
+            hw = entry.aggregates[aggregate] = set()
+            entry.aggregate_sliver_types[aggregate] = set()
+          hw.update(hwtypes)
+          entry.aggregate_sliver_types[aggregate].add(sname)
+          seen.add(name)
+    return len(seen)
+
+  def find (self, aggregate = None, hardware_type = None, sliver_type = None):
+    """Returns the entries for images offered by the given aggregate, for the given hardware
+    type and sliver type (criteria left as `None` are ignored), sorted by image name."""
+    found = []
+    for entry in self._entries.values():
+      if aggregate is not None:
+        aggs = [aggregate] if aggregate in entry.aggregates else []
+      else:
+        aggs = entry.aggregates
+      for agg in aggs:
+        if hardware_type is not None and hardware_type not in entry.aggregates[agg]:
+          continue
+        if sliver_type is not None and sliver_type not in entry.aggregate_sliver_types[agg]:
+          continue
+        found.append(entry)
+        break
+    found.sort(key = lambda entry: entry.image.name)
+    return found
+
+  def _load (self):
+    with open(self.path, "rb") as f:
+      obj = json.loads(f.read().decode("utf-8"))
+    if obj.get("version") != ImageCatalog.VERSION:
+      raise ImageCatalog.InvalidCatalogError(self.path, obj.get("version"))
+    entries = {}
+    for eobj in obj["images"]:
+      entry = CatalogEntry._fromjson(eobj)
+      entries[entry.image.name] = entry
+    self._entries = entries
+
+  def save (self, path = None):
+    """Write the catalog to `path` (or the path it was loaded from).  The file is written
+    to a temporary name and renamed into place, so readers never see a partial catalog."""
+    if path:
+      self.path = os.path.expanduser(os.path.normpath(path))
+    data = json.dumps({"version" : ImageCatalog.VERSION,
+                       "images" : [entry._json() for entry in self._entries.values()]})
+
+    from ..rspec import cache
+    cache._replaceFile(self.path, data.encode("utf-8"))
@@ -0,0 +1,218 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Nearest-neighbour and radius queries over geographic locations.
+
+Aggregates and nodes can be indexed from advertisements (node locations) and manifests
+(site info).  For example, to find the five aggregates closest to Salt Lake City that
+currently have a free raw PC::
+
+  from geni.model.spatial import GeoIndex
+
+  index = GeoIndex()
+  for (am, ad) in ads.items():
+    index.addAdvertisement(ad, item = am)
+
+  free = lambda am: bool(ads[am].find(sliver_type = "raw-pc", available = True))
+  for (km, am) in index.nearest(40.76, -111.89, count = 5, predicate = free):
+    print("%s: %d km" % (am.name, km))
+"""
+
+
+
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Buckets at most this size are scanned instead of split
+_LEAFSIZE = 8
+
+def _vector (latitude, longitude):
+  lat = math.radians(latitude)
+  lon = math.radians(longitude)
+  return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+def _km (chord2):
+  # Great-circle distance for a squared chord length on the unit sphere
+  return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(chord2) / 2))
+
+def distance (lat1, lon1, lat2, lon2):
+  """Great-circle distance in kilometres between two points given in degrees."""
+  (a, b) = (_vector(lat1, lon1), _vector(lat2, lon2))
+  return _km((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+
+
+class GeoIndex(object):
+  """Index of items by latitude and longitude, answering k-nearest and radius queries
+  without looking at every item.
+
+  Locations are stored as points on the unit sphere in a k-d tree, which is (re)built the
+  first time it is queried after items have been added.  Distances are great-circle
+  distances in kilometres.
+  """
+
+  def __init__ (self):
+    self._points = []
+    self._items = []
+    self._order = None
+
+  def __len__ (self):
+    return len(self._items)
+
+  def add (self, latitude, longitude, item):
+    """Add `item` at the given location (in degrees)."""
+    self._points.append(_vector(float(latitude), float(longitude)))
+    self._items.append(item)
+    self._order = None
+
+  def addNodes (self, nodes):
+    """Add every node in an iterable of :py:class:`geni.rspec.pgad.AdNode` objects that has
+    a location."""
+    for node in nodes:
+      loc = node.location
+      if loc is not None:
+        self.add(loc.latitude, loc.longitude, node)
+
+  def addAdvertisement (self, ad, item = None):
+    """Add the nodes of an advertisement, or if `item` is given add `item` (typically the
+    aggregate) once, at the location of the first node that has one.
+
+    Returns:
+      bool: `False` if no node in the advertisement has a location
+    """
+    if item is None:
+      count = len(self)
+      self.addNodes(ad.nodes)
+      return len(self) > count
+
+    for node in ad.nodes:
+      loc = node.location
+      if loc is not None:
+        self.add(loc.latitude, loc.longitude, item)
+        return True
+    return False
+
+  def addManifest (self, manifest, item = None):
+    """Add `item` (the manifest itself if `None`) at the site location of a manifest.
+
+    Returns:
+      bool: `False` if the manifest has no site location
+    """
+    (lat, lon) = (manifest.latitude, manifest.longitude)
+    if lat is None or lon is None:
+      return False
+    self.add(lat, lon, manifest if item is None else item)
+    return True
+
+  def _build (self):
+    # Implicit k-d tree: the median of each range (on the axis for its depth) sits in the
+    # middle of the range, with smaller values before it and larger ones after.
+    points = self._points
+    order = list(range(len(points)))
+    stack = [(0, len(order), 0)]
+    while stack:
+      (lo, hi, axis) = stack.pop()
+      if hi - lo <= _LEAFSIZE:
+        continue
+      order[lo:hi] = sorted(order[lo:hi], key = lambda idx: points[idx][axis])
+      mid = (lo + hi) // 2
+      naxis = (axis + 1) % 3
+      stack.append((lo, mid, naxis))
+      stack.append((mid + 1, hi, naxis))
+    self._order = order
+
+  def _search (self, query, visit, bound):
+    """Walk the tree nearest-first, calling `visit(chord2, idx)` for each point that could
+    be within `bound()` (a squared chord length)."""
+    if self._order is None:
+      self._build()
+    (points, order) = (self._points, self._order)
+    (qx, qy, qz) = query
+
+    stack = [(0, len(order), 0)]
+    while stack:
+      (lo, hi, axis) = stack.pop()
+      if hi - lo <= _LEAFSIZE:
+        for pos in range(lo, hi):
+          idx = order[pos]
+          (x, y, z) = points[idx]
+          visit((x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2, idx)
+        continue
+
+      mid = (lo + hi) // 2
+      idx = order[mid]
+      (x, y, z) = point = points[idx]
+      visit((x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2, idx)
+
+      diff = query[axis] - point[axis]
+      naxis = (axis + 1) % 3
+      (near, far) = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+      if diff * diff <= bound():
+        stack.append((far[0], far[1], naxis))
+      stack.append((near[0], near[1], naxis))
+
+  def nearest (self, latitude, longitude, count = 1, predicate = None):
+    """Find the items closest to a location.
+
+    Args:
+      latitude (float): Latitude in degrees
+      longitude (float): Longitude in degrees
+      count (int): Maximum number of items to return
+      predicate (callable): If given, only items for which `predicate(item)` is true are
+        returned
+
+    Returns:
+      list: `(distance_km, item)` tuples, nearest first
+    """
+    items = self._items
+    heap = []   # (-chord2, -idx), so the farthest of the best `count` is on top
+    inf = float("inf")
+
+    def bound ():
+      return -heap[0][0] if len(heap) == count else inf
+
+    def visit (chord2, idx):
+      if len(heap) == count and (-chord2, -idx) <= heap[0]:
+        return
+      if predicate is not None and not predicate(items[idx]):
+        return
+      if len(heap) == count:
+        heapq.heapreplace(heap, (-chord2, -idx))
+      else:
+        heapq.heappush(heap, (-chord2, -idx))
+
+    if count > 0 and items:
+      self._search(_vector(float(latitude), float(longitude)), visit, bound)
+    return [(_km(-chord2), items[-nidx]) for (chord2, nidx) in sorted(heap, reverse = True)]
+
+  def within (self, latitude, longitude, radius, predicate = None):
+    """Find the items within `radius` kilometres of a location.
+
+    Args:
+      latitude (float): Latitude in degrees
+      longitude (float): Longitude in degrees
+      radius (float): Distance in kilometres
+      predicate (callable): If given, only items for which `predicate(item)` is true are
+        returned
+
+    Returns:
+      list: `(distance_km, item)` tuples, nearest first
+    """
+    items = self._items
+    found = []
+    angle = radius / EARTH_RADIUS_KM
+    limit = 4.0 if angle >= math.pi else (2 * math.sin(angle / 2)) ** 2
+
+    def visit (chord2, idx):
+      if chord2 <= limit and (predicate is None or predicate(items[idx])):
+        found.append((chord2, idx))
+
+    if items:
+      self._search(_vector(float(latitude), float(longitude)), visit, lambda: limit)
+    found.sort()
+    return [(_km(chord2), items[idx]) for (chord2, idx) in found]
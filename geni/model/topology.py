@@ -0,0 +1,179 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Graph of the physical topology described by the links in an advertisement.
+"""
+
+
+
+from array import array
+import collections
+
+from .. import namespaces as GNS
+from ..rspec import pgad
+
+_INTERFACE_REF = "{%s}interface_ref" % (GNS.REQUEST.name)
+
+class Topology(object):
+  """Undirected graph of the nodes in an advertisement, with an edge for every pair of
+  nodes joined by a link.
+
+  Vertices are numbered from zero: vertex `i` is `Advertisement.nodes[i]`, followed by a
+  vertex for every other device links connect to (such as switches that aren't advertised
+  as nodes), named by the component ID of the interface with its last `:` part removed.
+  Adjacency is stored in compressed sparse row form, so the neighbours of vertex `v` are
+  `targets[offsets[v]:offsets[v + 1]]`.  Nodes joined by several links have an edge for
+  each of them.
+
+  Methods that take a vertex accept either its number or its component ID.
+
+  Attributes:
+    component_ids (list): Component ID of each vertex
+    advertised (int): Number of vertices that are advertised nodes
+    offsets (array.array): Start of the edges of each vertex in `targets` (one extra entry
+      at the end)
+    targets (array.array): Vertex at the other end of each edge
+    edge_links (array.array): Position in `Advertisement.links` of the link for each edge
+  """
+
+  def __init__ (self, ad):
+    root = ad._root
+    self.component_ids = []
+    vertices = {}
+    intfmap = {}
+
+    for elem in root.iterchildren(pgad._NODE):
+      vtx = len(self.component_ids)
+      cid = elem.get("component_id")
+      self.component_ids.append(cid)
+      vertices.setdefault(cid, vtx)
+      for intf in pgad._NodeChildren(elem).interfaces:
+        intfmap[intf.get("component_id")] = vtx
+    self.advertised = len(self.component_ids)
+
+    # (source, target, link) for each direction of each edge
+    (sources, targets, links) = (array("i"), array("i"), array("i"))
+    for (lidx, elem) in enumerate(root.iterchildren(pgad._LINK)):
+      ends = []
+      for iref in elem.iterchildren(_INTERFACE_REF):
+        ref = iref.get("component_id")
+        vtx = intfmap.get(ref)
+        if vtx is None and ref:
+          cid = ref.rsplit(":", 1)[0]
+          vtx = vertices.get(cid)
+          if vtx is None:
+            vtx = vertices[cid] = len(self.component_ids)
+            self.component_ids.append(cid)
+        if vtx is not None and vtx not in ends:
+          ends.append(vtx)
+      for (pos, src) in enumerate(ends):
+        for dst in ends[pos + 1:]:
+          sources.extend((src, dst))
+          targets.extend((dst, src))
+          links.extend((lidx, lidx))
+
+    self._vertices = vertices
+    count = len(self.component_ids)
+
+    # Counting sort of the edges by source vertex
+    self.offsets = array("i", [0]) * (count + 1)
+    for src in sources:
+      self.offsets[src + 1] += 1
+    for vtx in range(count):
+      self.offsets[vtx + 1] += self.offsets[vtx]
+    fill = array("i", self.offsets[:-1])
+    self.targets = array("i", [0]) * len(targets)
+    self.edge_links = array("i", [0]) * len(targets)
+    for (src, dst, lidx) in zip(sources, targets, links):
+      pos = fill[src]
+      self.targets[pos] = dst
+      self.edge_links[pos] = lidx
+      fill[src] = pos + 1
+
+  def __len__ (self):
+    return len(self.component_ids)
+
+  def index (self, component_id):
+    """Returns the vertex number for a component ID, or raises `KeyError`."""
+    return self._vertices[component_id]
+
+  def _vertex (self, vtx):
+    if isinstance(vtx, int):
+      return vtx
+    return self._vertices[vtx]
+
+  def degree (self, vertex):
+    """Number of edges of a vertex."""
+    vtx = self._vertex(vertex)
+    return self.offsets[vtx + 1] - self.offsets[vtx]
+
+  def neighbors (self, vertex):
+    """Vertex numbers adjacent to a vertex (once for each edge)."""
+    vtx = self._vertex(vertex)
+    return self.targets[self.offsets[vtx]:self.offsets[vtx + 1]]
+
+  def distances (self, source):
+    """Number of hops from `source` to every vertex, as an `array.array` (-1 for vertices
+    that can't be reached)."""
+    (offsets, targets) = (self.offsets, self.targets)
+    dist = array("i", [-1]) * len(self.component_ids)
+    src = self._vertex(source)
+    dist[src] = 0
+    queue = collections.deque([src])
+    while queue:
+      vtx = queue.popleft()
+      nd = dist[vtx] + 1
+      for nbr in targets[offsets[vtx]:offsets[vtx + 1]]:
+        if dist[nbr] < 0:
+          dist[nbr] = nd
+          queue.append(nbr)
+    return dist
+
+  def shortestPath (self, source, target):
+    """Returns a path with the fewest hops between two vertices as a list of vertex
+    numbers (including both ends), or `None` if they aren't connected."""
+    (offsets, targets) = (self.offsets, self.targets)
+    (src, dst) = (self._vertex(source), self._vertex(target))
+    parent = [-1] * len(self.component_ids)
+    parent[src] = src
+    queue = collections.deque([src])
+    while queue and parent[dst] < 0:
+      vtx = queue.popleft()
+      for nbr in targets[offsets[vtx]:offsets[vtx + 1]]:
+        if parent[nbr] < 0:
+          parent[nbr] = vtx
+          queue.append(nbr)
+
+    if parent[dst] < 0:
+      return None
+    path = [dst]
+    while path[-1] != src:
+      path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+  def components (self):
+    """Returns the connected components as lists of vertex numbers, largest first."""
+    (offsets, targets) = (self.offsets, self.targets)
+    seen = array("b", [0]) * len(self.component_ids)
+    comps = []
+    for start in range(len(self.component_ids)):
+      if seen[start]:
+        continue
+      seen[start] = 1
+      comp = [start]
+      stack = [start]
+      while stack:
+        vtx = stack.pop()
+        for nbr in targets[offsets[vtx]:offsets[vtx + 1]]:
+          if not seen[nbr]:
+            seen[nbr] = 1
+            comp.append(nbr)
+            stack.append(nbr)
+      comps.append(comp)
+    comps.sort(key = len, reverse = True)
+    return comps
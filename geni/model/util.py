@@ -4,14 +4,80 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import collections
+import os
+
 class XPathXRange(object):
-  def __init__ (self, xp, klass):
+  """Sequence of wrapper objects for a list of elements.
+
+  Wrappers are built with `klass._fromdom` the first time an element is accessed, and the
+  most recently used `cachesize` of them (all of them if `None`) are kept, so repeated
+  iteration and indexing return the same objects.  Slices are ranges over the same cache.
+  The cache is dropped in a forked child process."""
+
+  CACHESIZE = 1024
+
+  def __init__ (self, xp, klass, cachesize = CACHESIZE):
     self._data = xp
     self._klass = klass
+    self._cache = _WrapperCache(cachesize)
+
+  def _wrap (self, elem):
+    return self._cache.get(elem, self._klass)
+
   def __iter__ (self):
     for obj in self._data:
-      yield self._klass._fromdom(obj)
+      yield self._wrap(obj)
+
   def __len__ (self):
     return len(self._data)
+
   def __getitem__ (self, idx):
-    return self._klass._fromdom(self._data[idx])
+    if isinstance(idx, slice):
+      sub = XPathXRange(self._data[idx], self._klass)
+      sub._cache = self._cache
+      return sub
+    return self._wrap(self._data[idx])
+
+
+class _WrapperCache(object):
+  def __init__ (self, size):
+    self._size = size
+    self._objs = collections.OrderedDict()
+    self._pid = os.getpid()
+
+  def get (self, elem, klass):
+    if self._pid != os.getpid():
+      self._objs.clear()
+      self._pid = os.getpid()
+
+    objs = self._objs
+    try:
+      obj = objs[elem]
+    except KeyError:
+      obj = objs[elem] = klass._fromdom(elem)
+      if self._size is not None and len(objs) > self._size:
+        objs.popitem(last = False)
+    else:
+      objs.move_to_end(elem)
+    return obj
+
+
+class xrangeproperty(object):
+  """Like `property`, for methods that build an `XPathXRange`.  The range is built once
+  per object (and again in a forked child process, where documents may be reparsed)."""
+
+  def __init__ (self, func):
+    self._func = func
+    self._name = "_xrange_%s" % (func.__name__)
+    self.__doc__ = func.__doc__
+
+  def __get__ (self, obj, objtype = None):
+    if obj is None:
+      return self
+    pid = os.getpid()
+    cached = obj.__dict__.get(self._name)
+    if cached is None or cached[0] != pid:
+      cached = (pid, self._func(obj))
+      obj.__dict__[self._name] = cached
+    return cached[1]
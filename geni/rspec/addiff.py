@@ -0,0 +1,153 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Differences between two advertisements from the same aggregate.
+
+`diff` compares two snapshots, matching nodes by component ID, and `iterChanges` polls an
+aggregate and yields the changes between each advertisement and the one before it::
+
+  import geni.rspec.addiff as addiff
+
+  poll = lambda: am.listresources(context, cached = False)
+  for change in addiff.iterChanges(poll, interval = 300):
+    if change.kind == addiff.AdChange.AVAILABILITY and change.new:
+      print("%s is now available" % (change.component_id))
+"""
+
+
+
+import time
+
+from .. import namespaces as GNS
+
+_NODE = "{%s}node" % (GNS.REQUEST.name)
+_SLIVER_TYPE = "{%s}sliver_type" % (GNS.REQUEST.name)
+_DISK_IMAGE = "{%s}disk_image" % (GNS.REQUEST.name)
+
+class AdChange(object):
+  """A single difference between two advertisements.
+
+  Attributes:
+    kind (str): One of the kind constants below
+    component_id (str): Component ID of the node, or the name of the image for image
+      catalog changes
+    old: Previous value (`None` for additions)
+    new: Current value (`None` for removals)
+
+  Kinds:
+    NODE_ADDED, NODE_REMOVED: `old`/`new` is the :py:class:`geni.rspec.pgad.AdNode`
+    AVAILABILITY: `old` and `new` are the `available` flags of the node
+    HARDWARE: `old` and `new` are the `hardware_types` of the node (type name to slots)
+    IMAGE_ADDED, IMAGE_REMOVED: `old`/`new` is the :py:class:`geni.rspec.pgad.Image`
+  """
+
+  NODE_ADDED = "node-added"
+  NODE_REMOVED = "node-removed"
+  AVAILABILITY = "availability"
+  HARDWARE = "hardware"
+  IMAGE_ADDED = "image-added"
+  IMAGE_REMOVED = "image-removed"
+
+  __slots__ = ["kind", "component_id", "old", "new"]
+
+  def __init__ (self, kind, component_id, old = None, new = None):
+    self.kind = kind
+    self.component_id = component_id
+    self.old = old
+    self.new = new
+
+  def __repr__ (self):
+    return "<AdChange %s %s: %r -> %r>" % (self.kind, self.component_id, self.old, self.new)
+
+
+def _nodemap (ad):
+  nodes = {}
+  for node in ad.nodes:
+    nodes[node.component_id] = node
+  return nodes
+
+def _catalog (ad):
+  from .pgad import Image
+
+  # Every node usually lists the same images, so only build an Image for the first
+  # element with each name and URL
+  images = {}
+  for node in ad._root.iterchildren(_NODE):
+    for stype in node.iterchildren(_SLIVER_TYPE):
+      for elem in stype.iterchildren(_DISK_IMAGE):
+        url = elem.get("url")
+        key = (elem.get("name") or url, url)
+        if key not in images:
+          images[key] = Image._fromdom(elem)
+  return images
+
+def diff (old, new, images = True):
+  """Returns the differences between two advertisements from the same aggregate.
+
+  Nodes are matched by component ID, so this takes time linear in the size of the
+  advertisements.  Only the fields being compared are decoded for nodes that exist in both.
+
+  Args:
+    old (geni.rspec.pgad.Advertisement): Earlier advertisement
+    new (geni.rspec.pgad.Advertisement): Later advertisement
+    images (bool): Also compare the image catalogs
+
+  Returns:
+    list: :py:class:`AdChange` objects; removed nodes first, then added and changed nodes in
+    the order of `new`, then image catalog changes.
+  """
+
+  oldnodes = _nodemap(old)
+  newnodes = _nodemap(new)
+
+  changes = [AdChange(AdChange.NODE_REMOVED, cid, old = node)
+             for (cid, node) in oldnodes.items() if cid not in newnodes]
+
+  for (cid, node) in newnodes.items():
+    prev = oldnodes.get(cid)
+    if prev is None:
+      changes.append(AdChange(AdChange.NODE_ADDED, cid, new = node))
+      continue
+    if prev.available != node.available:
+      changes.append(AdChange(AdChange.AVAILABILITY, cid, prev.available, node.available))
+    if prev.hardware_types != node.hardware_types:
+      changes.append(AdChange(AdChange.HARDWARE, cid, prev.hardware_types, node.hardware_types))
+
+  if images:
+    oldimages = _catalog(old)
+    newimages = _catalog(new)
+    changes.extend([AdChange(AdChange.IMAGE_REMOVED, key[0], old = image)
+                    for (key, image) in oldimages.items() if key not in newimages])
+    changes.extend([AdChange(AdChange.IMAGE_ADDED, key[0], new = image)
+                    for (key, image) in newimages.items() if key not in oldimages])
+
+  return changes
+
+def iterChanges (poll, interval = 300, images = True, sleep = time.sleep):
+  """Poll an aggregate forever and yield the changes in each new advertisement.
+
+  The first advertisement is only used as the starting point.  Stop iterating to stop
+  polling.
+
+  Args:
+    poll (callable): Called with no arguments to fetch the current advertisement, such as
+      `lambda: am.listresources(context, cached = False)`
+    interval (int, float): Seconds to wait between polls
+    images (bool): Also report image catalog changes
+    sleep (callable): Function used to wait between polls
+
+  Returns:
+    An iterator of :py:class:`AdChange` objects.
+  """
+
+  current = poll()
+  while True:
+    sleep(interval)
+    latest = poll()
+    for change in diff(current, latest, images):
+      yield change
+    current = latest
@@ -0,0 +1,210 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Storage for serialized request RSpecs, keyed by request fingerprint.
+
+A fingerprint (see `pg.Request.fingerprint`) is a hex SHA-256 digest of a canonical form of
+the document that doesn't depend on attribute order, namespace prefixes or whitespace, so
+equivalent requests share one entry.  `RequestCache.serialize` looks the fingerprint up before
+serializing, so tools that regenerate the same request over and over only serialize it the
+first time, and several users pointing a `DirectoryCache` at the same directory will share
+the stored documents.
+
+`RequestCache` defines the interface, and can be subclassed to store documents somewhere
+other than the local filesystem.
+"""
+
+
+
+import abc
+import errno
+import hashlib
+import os
+import re
+import tempfile
+
+from lxml import etree as ET
+import six
+
+def _newFileMode ():
+  # The umask can only be read by setting it, so this is only done once, at import
+  umask = os.umask(0o022)
+  os.umask(umask)
+  return 0o666 & ~umask
+
+_NEW_FILE_MODE = _newFileMode()
+
+def _replaceFile (path, *chunks):
+  """Writes `chunks` (bytes) to a temporary file next to `path` and renames it into place,
+  so readers never see a partial file.  mkstemp() creates files readable only by their
+  owner, so the file is given the usual permissions for new files instead."""
+
+  (handle, tmppath) = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(path)), prefix = ".tmp-")
+  try:
+    with os.fdopen(handle, "wb") as f:
+      f.writelines(chunks)
+    os.chmod(tmppath, _NEW_FILE_MODE)
+    os.replace(tmppath, path)
+  except Exception:
+    os.unlink(tmppath)
+    raise
+
+def fingerprintElement (root):
+  """Returns the hex SHA-256 fingerprint of the document rooted at `root`.
+
+  The canonical form hashed here uses the namespace URI (never the prefix) of every element
+  and attribute name, sorts attributes by name, and strips leading and trailing whitespace
+  from text, dropping it entirely if nothing is left.  Comments and processing instructions
+  are ignored."""
+
+  out = []
+  app = out.append
+  # \x00-\x03 can't appear in XML 1.0 documents, so they can safely delimit tokens
+  for (event, elem) in ET.iterwalk(root, events = ("start", "end", "comment", "pi")):
+    if event == "start":
+      tag = elem.tag
+      if tag[0] != "{":
+        # An element without a namespace that is written where a default namespace is
+        # in scope is read back in that namespace, so hash it the way it will be read.
+        default = elem.nsmap.get(None)
+        if default:
+          tag = "{%s}%s" % (default, tag)
+      app("\x03")
+      app(tag)
+      attrs = elem.items()
+      if attrs:
+        attrs.sort()
+        for item in attrs:
+          app("\x00%s\x00%s" % item)
+      text = elem.text
+      if text:
+        text = text.strip()
+        if text:
+          app("\x01")
+          app(text)
+      continue
+
+    if event == "end":
+      app("\x02")
+    # Comments and processing instructions only contribute the text that follows them
+    if elem is not root:
+      text = elem.tail
+      if text:
+        text = text.strip()
+        if text:
+          app("\x01")
+          app(text)
+
+  return hashlib.sha256(u"".join(out).encode("utf-8")).hexdigest()
+
+def fingerprintXML (data):
+  """Returns the fingerprint of a serialized XML document, which is the same as the
+  fingerprint of the request it was generated from."""
+
+  if isinstance(data, six.text_type):
+    data = data.encode("utf-8")
+  return fingerprintElement(ET.fromstring(data))
+
+
+class RequestCache(object, metaclass=abc.ABCMeta):
+  """Base class for request caches.  Subclasses must implement `get` and `put`."""
+
+  KEYRE = re.compile(r"^[0-9a-f]{64}$")
+
+  class InvalidKeyError(Exception):
+    def __init__ (self, key):
+      super(RequestCache.InvalidKeyError, self).__init__()
+      self.key = key
+    def __str__ (self):
+      return "Invalid request cache key (%s)" % (self.key)
+
+  @abc.abstractmethod
+  def get (self, key):
+    """Returns the document stored under `key` as bytes, or `None`."""
+    return
+
+  @abc.abstractmethod
+  def put (self, key, data):
+    """Stores `data` (bytes, or text to be encoded as UTF-8) under `key`."""
+    return
+
+  def __contains__ (self, key):
+    return self.get(key) is not None
+
+  def serialize (self, request, pretty_print = False):
+    """Returns the document for `request`, keyed by its fingerprint.  If an equivalent
+    document is already stored it is returned as is, otherwise the request is serialized
+    and stored.
+
+    Args:
+      request (geni.rspec.pg.Request): The request to serialize.
+      pretty_print (bool): Whether a newly serialized document should be indented.
+
+    Returns:
+      tuple: `(key, data, hit)`, where `data` is the document as bytes and `hit` is `True`
+      if it was already in the cache (in which case it may differ from a fresh
+      serialization in whitespace, attribute order or namespace prefixes).
+    """
+    root = request._buildDOM()
+    key = fingerprintElement(root)
+    data = self.get(key)
+    if data is not None:
+      return (key, data, True)
+    data = ET.tostring(root, pretty_print = pretty_print)
+    self.put(key, data)
+    return (key, data, False)
+
+  def _check (self, key):
+    if not isinstance(key, six.string_types) or not RequestCache.KEYRE.match(key):
+      raise RequestCache.InvalidKeyError(key)
+
+
+class DirectoryCache(RequestCache):
+  """Stores documents as files in a directory, which may be shared between users.
+
+  Files are written to a temporary name and renamed into place, so concurrent writers and
+  readers never see partial documents.  They are created with the usual permissions for
+  new files (`0666` less the process umask when this module was imported), so a directory that
+  is shared between users stays readable by all of them.
+
+  Args:
+    path (str): The cache directory, which is created if it doesn't exist.
+  """
+
+  def __init__ (self, path):
+    super(DirectoryCache, self).__init__()
+    self.path = os.path.expanduser(os.path.normpath(path))
+    if not os.path.exists(self.path):
+      os.makedirs(self.path)
+
+  def _filepath (self, key):
+    self._check(key)
+    return os.path.join(self.path, key[:2], "%s.xml" % (key))
+
+  def get (self, key):
+    try:
+      with open(self._filepath(key), "rb") as f:
+        return f.read()
+    except (IOError, OSError) as e:
+      if e.errno == errno.ENOENT:
+        return None
+      raise
+
+  def __contains__ (self, key):
+    return os.path.exists(self._filepath(key))
+
+  def put (self, key, data):
+    if isinstance(data, six.text_type):
+      data = data.encode("utf-8")
+
+    path = self._filepath(key)
+    try:
+      os.makedirs(os.path.dirname(path))
+    except OSError as e:
+      if e.errno != errno.EEXIST:
+        raise
+    _replaceFile(path, data)
@@ -252,6 +252,7 @@ class setProperties(object):
     
     """
     __ONCEONLY__ = True
+    __NAMESPACES__ = [Namespaces.EMULAB]
     
     def __init__(self, bandwidth=None, latency=None, plr=None):
         self._bandwidth = bandwidth
@@ -672,12 +673,16 @@ class ExperimentFirewall(Node):
 Request.EXTENSIONS.append(("ExperimentFirewall", ExperimentFirewall))
 
 class L1Link(Link):
+  __slots__ = ()
+
   def __init__ (self, name = None):
     super(L1Link, self).__init__(name, "layer1")
 
 Request.EXTENSIONS.append(("L1Link", L1Link))
 
 class Switch(Node):
+  __slots__ = ()
+
   def __init__ (self, name, component_id = None):
     super(Switch, self).__init__(name, NodeType.RAW,
                                  component_id = component_id, exclusive = True)
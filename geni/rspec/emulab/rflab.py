@@ -320,12 +320,8 @@ class rflink( object ):
                     self.name = self.node1.client_id + "-" + \
                         self.node2.client_id + "-" + str( suffix )
                     suffix += 1
-                    
-                    for r in request.resources:
-                        if hasattr( r, "client_id" ) and \
-                           r.client_id == self.name:
-                            break
-                    else:
+
+                    if request.get( self.name ) is None:
                         break
 
             self.link = request.Link( self.name )
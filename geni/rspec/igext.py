@@ -55,6 +55,8 @@ class XenVM(Node):
     disk (int): Amount of disk space in gigabytes
     xen_ptype (str): Physical node type on which to instantiate the VM. Types are AM-specific.
   """
+  __slots__ = ("cores", "ram", "disk", "xen_ptype")
+
   def __init__ (self, client_id, component_id = None, exclusive = False):
     super(XenVM, self).__init__(client_id, "emulab-xen", component_id = component_id, exclusive = exclusive)
     self.cores = None
@@ -105,6 +107,10 @@ class DockerContainer(Node):
     docker_env (str): either a newline-separated list of variable assignments, or one or more variable assignments on a single line.  If the former, we do not support escaped newlines, unlike the Docker ENV instruction.
     docker_privileged (bool): if True, this container should be privileged; defaults to False (unprivileged).
   """
+  __slots__ = ("cores", "ram", "docker_ptype", "docker_extimage", "docker_dockerfile",
+               "docker_tbaugmentation", "docker_tbaugmentation_update", "docker_ssh_style",
+               "docker_exec_shell", "docker_entrypoint", "docker_cmd", "docker_env", "docker_privileged")
+
   def __init__ (self, client_id, component_id = None, exclusive = False):
     super(DockerContainer, self).__init__(client_id, "emulab-docker", component_id = component_id, exclusive = exclusive)
     self.cores = None
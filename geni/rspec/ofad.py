@@ -83,10 +83,9 @@ class Advertisement(object):
     if path:
       self._root = ET.parse(open(path))
     elif xml:
-      if six.PY3:
-        self._root = ET.fromstring(bytes(xml, "utf-8"))
-      else:
-        self._root = ET.fromstring(xml)
+      if isinstance(xml, six.text_type):
+        xml = xml.encode("utf-8")
+      self._root = ET.fromstring(xml)
 
   @property
   def text (self):
@@ -6,15 +6,22 @@
 
 
 
+import copy
 import itertools
+import operator
+import os
+import re
 import sys
+import types
 import functools
 import importlib
+import ipaddress
 
 from lxml import etree as ET
 import six
 
 import geni.rspec
+import geni.rspec.cache
 import geni.namespaces as GNS
 import geni.urn
 
@@ -27,50 +34,195 @@ class DuplicateExtensionError(Exception):
   def __str__ (self):
     return "Extension (%s) can only be added to a parent object once" % self.klass.__name__
 
+# This exception gets thrown if a node, link or interface is added to a request
+# that already contains an object with the same client_id
+class DuplicateClientIDError(Exception):
+  def __init__ (self, client_id):
+    super(DuplicateClientIDError, self).__init__()
+    self.client_id = client_id
+  def __str__ (self):
+    return "Request already contains an object with client_id (%s)" % (self.client_id)
+
+class _Extensions(list):
+  """The `EXTENSIONS` list of a class that can have extensions attached to it.
+
+  Registering a `(name, class)` pair binds a method called `name` on the owning class
+  (and so on all of its subclasses), which creates an instance of the extension class,
+  attaches it to the object it was called on, and returns it.  The method is shared by
+  all instances, so constructing objects doesn't get more expensive as more extensions
+  are registered.  The owning class must be decorated with `_extensible`.
+  """
+
+  def __init__ (self, *args):
+    super(_Extensions, self).__init__(*args)
+    self._owner = None
+
+  def _setOwner (self, owner):
+    self._owner = owner
+    for (extname, klass) in self:
+      self._bind(extname, klass)
+
+  def _bind (self, name, klass):
+    @functools.wraps(klass.__init__)
+    def wrap (parent, *args, **kw):
+      return _addext(parent, klass, args, kw)
+    wrap.__name__ = name
+    if six.PY3:
+      wrap.__qualname__ = "%s.%s" % (self._owner.__name__, name)
+    setattr(self._owner, name, wrap)
+
+  def append (self, item):
+    super(_Extensions, self).append(item)
+    if self._owner is not None:
+      self._bind(*item)
+
+  def extend (self, items):
+    for item in items:
+      self.append(item)
+
+  def __iadd__ (self, items):
+    self.extend(items)
+    return self
+
+
+def _extensible (klass):
+  """Class decorator for classes with an `_Extensions` list as their `EXTENSIONS`."""
+  klass.EXTENSIONS._setOwner(klass)
+  return klass
+
+
+def _addext (parent, klass, args, kw):
+  if getattr(klass, "__ONCEONLY__", False):
+    if any([isinstance(x,klass) for x in parent._ext_children]):
+      raise DuplicateExtensionError(klass)
+  instance = klass(*args, **kw)
+  if getattr(klass, "__WANTPARENT__", False):
+    instance._parent = parent
+  for ns in getattr(klass, "__NAMESPACES__", []):
+    parent.addNamespace(ns)
+    # Resources only pass their namespaces on to a request when they are added to it,
+    # so one that is already in a request registers them there as well
+    request = _requestOf(parent)
+    if request is not None:
+      request.addNamespace(ns)
+  if isinstance(parent, Request):
+    parent._adopt(instance)
+  if not parent._ext_children:
+    parent._ext_children = []
+  parent._ext_children.append(instance)
+  return instance
+
+def _requestOf (obj):
+  if isinstance(obj, Node):
+    return obj.parent_request
+  if isinstance(obj, Link):
+    return obj._request
+  return None
+
+
 ################################################
 # Base Request - Must be at top for EXTENSIONS #
 ################################################
 
+@_extensible
 class Request(geni.rspec.RSpec):
-  EXTENSIONS = []
+  EXTENSIONS = _Extensions()
 
   def __init__ (self):
     super(Request, self).__init__("request")
     self._resources = []
     self.tour = None
     self._raw_elements = []
+    self._fragments = None
+    self._clientids = {}
+    self._stale = False
 
     self.addNamespace(GNS.REQUEST, None)
     self.addNamespace(Namespaces.CLIENT)
 
     self._ext_children = []
-    for name,ext in Request.EXTENSIONS:
-      self._wrapext(name,ext)
-
-  def _wrapext (self, name, klass):
-    @functools.wraps(klass.__init__)
-    def wrap(*args, **kw):
-      if getattr(klass, "__ONCEONLY__", False):
-        if any([isinstance(x,klass) for x in self._ext_children]):
-          raise DuplicateExtensionError(klass)
-      instance = klass(*args, **kw)
-      if getattr(klass, "__WANTPARENT__", False):
-        instance._parent = self
-      for ns in getattr(klass, "__NAMESPACES__", []):
-        self.addNamespace(ns)
-      self._ext_children.append(instance)
-      return instance
-    setattr(self, name, wrap)
 
   def addResource (self, rsrc):
+    self._adopt(rsrc)
     for ns in rsrc.namespaces:
       self.addNamespace(ns)
     self._resources.append(rsrc)
 
   @property
   def resources(self):
+    if not self._ext_children:
+      return list(self._resources)
+    if not self._resources:
+      return list(self._ext_children)
     return self._resources + self._ext_children
 
+  def get (self, client_id, default = None):
+    """Find the node, link or interface in this request with the given `client_id`.
+
+    Objects are indexed when they are added to the request.  Renaming one (by setting
+    its `client_id`) only marks the index as out of date, and it is rebuilt by the next
+    lookup, so lookups are constant time unless something has been renamed since the
+    last one.
+
+    Args:
+      client_id (str): The `client_id` to look up.
+      default: The value to return if no object has that `client_id`.
+
+    Returns:
+      The matching `Node`, `Link` or `Interface`, or `default`.
+    """
+    obj = self._index().get(client_id)
+    if obj is None:
+      return default
+    return obj
+
+  def _index (self):
+    if self._stale:
+      self._reindex()
+    return self._clientids
+
+  def _register (self, objs):
+    # Every name is checked before any of them is indexed, so that a failed add leaves
+    # nothing behind
+    index = self._index()
+    names = set()
+    for obj in objs:
+      cid = obj.client_id
+      if cid is None:
+        continue
+      cur = index.get(cid)
+      if cid in names or (cur is not None and cur is not obj):
+        raise DuplicateClientIDError(cid)
+      names.add(cid)
+    for obj in objs:
+      if obj.client_id is not None:
+        index[obj.client_id] = obj
+
+  def _adopt (self, rsrc):
+    # Index a resource that is being added to this request, along with the interfaces
+    # it already has.  Resources keep a reference to the request so that renames, and
+    # interfaces added to nodes later, are indexed as well.
+    if isinstance(rsrc, Node):
+      self._register([rsrc] + rsrc.interfaces)
+      if rsrc.parent_request is None:
+        rsrc.parent_request = self
+    elif isinstance(rsrc, Link):
+      self._register([rsrc])
+      rsrc._request = self
+
+  def _reindex (self):
+    index = {}
+    for rsrc in itertools.chain(self._resources, self._ext_children):
+      if isinstance(rsrc, Node):
+        index.setdefault(rsrc.client_id, rsrc)
+        for intf in rsrc.interfaces:
+          index.setdefault(intf.client_id, intf)
+      elif isinstance(rsrc, Link):
+        index.setdefault(rsrc.client_id, rsrc)
+    index.pop(None, None)
+    self._clientids = index
+    self._stale = False
+
   def addTour (self, tour):
     self.addNamespace(Namespaces.EMULAB)
     self.addNamespace(Namespaces.JACKS)
@@ -82,6 +234,126 @@ class Request(geni.rspec.RSpec):
   def addRawElement (self, elem):
     self._raw_elements.append(elem)
 
+  def addNodes (self, template, count, names = "node%d", start = 0):
+    """Create `count` nodes from a `NodeTemplate` and add them to this request.
+
+    Args:
+      template (NodeTemplate): The template to create the nodes from.
+      count (int): The number of nodes to create.
+      names (str): Format string for the `client_id` of each node, applied to its index.
+      start (int): The index of the first node.
+
+    Returns:
+      list: The new nodes, in index order.
+    """
+    nodes = [template.create(names % (idx)) for idx in range(start, start + count)]
+    for node in nodes:
+      self.addResource(node)
+    return nodes
+
+  def connectNodes (self, nodes, pattern = "lan", names = "link%d", network = None):
+    """Connect a list of nodes with links in a regular pattern, adding an interface to each
+    node for every link it is a member of.
+
+    Args:
+      nodes (list): The nodes to connect.
+      pattern (str): One of `lan` (a single LAN containing every node), `chain` (a link
+        between each consecutive pair of nodes), `ring` (a chain that also links the last node
+        back to the first), `star` (a link from the first node to each of the others) or `mesh`
+        (a link between every pair of nodes).
+      names (str): Format string for the `client_id` of each link, applied to its index.
+      network (Optional[str]): An IPv4 network such as `"10.10.0.0/16"`.  If given, addresses
+        are assigned with `assignAddresses`.
+
+    Returns:
+      list: The new links (none if there are fewer than two nodes).
+    """
+    nodes = list(nodes)
+    if pattern == "lan":
+      pairs = None
+    elif pattern == "chain":
+      pairs = [(nodes[idx], nodes[idx + 1]) for idx in range(len(nodes) - 1)]
+    elif pattern == "ring":
+      pairs = [(nodes[idx - 1], nodes[idx]) for idx in range(1, len(nodes))]
+      if len(nodes) > 2:
+        pairs.append((nodes[-1], nodes[0]))
+    elif pattern == "star":
+      pairs = [(nodes[0], node) for node in nodes[1:]]
+    elif pattern == "mesh":
+      pairs = list(itertools.combinations(nodes, 2))
+    else:
+      raise Request.UnknownPatternError(pattern)
+
+    if len(nodes) < 2:
+      links = []
+    elif pairs is None:
+      lan = LAN(names % (0))
+      for node in nodes:
+        lan.addInterface(node.addInterface())
+      links = [lan]
+    else:
+      links = []
+      for (idx, (nodeA, nodeB)) in enumerate(pairs):
+        link = Link(names % (idx))
+        link.addInterface(nodeA.addInterface())
+        link.addInterface(nodeB.addInterface())
+        links.append(link)
+
+    for link in links:
+      self.addResource(link)
+    if network is not None:
+      self.assignAddresses(links, network)
+    return links
+
+  def assignAddresses (self, links, network):
+    """Give every interface on each of `links` an IPv4 address.
+
+    Each link gets its own subnet of `network`, all of the same size, large enough for the
+    link with the most interfaces.
+
+    Args:
+      links (list): The links whose interfaces should be addressed.
+      network (str): An IPv4 network such as `"10.10.0.0/16"`.
+
+    Raises:
+      Request.NetworkTooSmallError: If `network` can't hold a subnet for every link.
+    """
+    net = ipaddress.IPv4Network(six.text_type(network))
+    if not links:
+      return
+    members = max([len(link.interfaces) for link in links])
+    # Leave room for the network and broadcast addresses
+    prefix = 32 - (members + 1).bit_length()
+    if prefix < net.prefixlen or (2 ** (prefix - net.prefixlen)) < len(links):
+      raise Request.NetworkTooSmallError(network, len(links), members)
+
+    netmask = str(ipaddress.IPv4Network(u"0.0.0.0/%d" % (prefix)).netmask)
+    base = int(net.network_address)
+    size = 2 ** (32 - prefix)
+    for (idx, link) in enumerate(links):
+      addr = base + idx * size
+      for intf in link.interfaces:
+        addr += 1
+        intf.addAddress(IPv4Address("%d.%d.%d.%d" % (addr >> 24, (addr >> 16) & 0xff,
+                                                     (addr >> 8) & 0xff, addr & 0xff), netmask))
+
+  class UnknownPatternError(Exception):
+    def __init__ (self, pattern):
+      super(Request.UnknownPatternError, self).__init__()
+      self.pattern = pattern
+    def __str__ (self):
+      return "Unknown connection pattern (%s)" % (self.pattern)
+
+  class NetworkTooSmallError(Exception):
+    def __init__ (self, network, links, members):
+      super(Request.NetworkTooSmallError, self).__init__()
+      self.network = network
+      self.links = links
+      self.members = members
+    def __str__ (self):
+      return "Network (%s) is too small for %d links of up to %d interfaces" % (
+        self.network, self.links, self.members)
+
   def writeXML (self, path):
     """Write the current request contents as an XML file that represents an rspec
     in the GENIv3 format."""
@@ -91,16 +363,131 @@ class Request(geni.rspec.RSpec):
     else:
       f = open(path, "w+")
 
-    buf = self.toXMLString(True,True)
-    f.write(buf.decode('utf-8') if isinstance(buf, bytes) else buf)
+    self.streamXML(f, True, True)
 
     if path is not None:
       f.close()
 
-  def toXMLString (self, pretty_print = False, ucode = False):
+  def streamXML (self, out, pretty_print = False, ucode = False, processes = None):
+    """Write the current request contents to `out` one top-level resource at a time.
+
+    Each resource is written as soon as it has been built and its subtree is discarded
+    before the next one is processed, so peak memory is bounded by the largest single
+    resource instead of the whole request.  The output is identical to the return value
+    of :py:meth:`toXMLString` called with the same arguments.
+
+    Args:
+      out: A file-like object (anything with a `write` method), a socket (anything with
+        a `sendall` method), or an integer file descriptor.
+      pretty_print (bool): Indent the output.
+      ucode (bool): Produce `str` chunks instead of `bytes`.  Use this for text-mode files;
+        chunks are encoded as UTF-8 before being sent to sockets and file descriptors.
+      processes (Optional[int]): Serialize in this many worker processes, as described
+        for :py:meth:`toXMLString`.  Each worker's output is held in memory until it is
+        written.
+    """
+
+    write = _chunkwriter(out, ucode)
+    if self._canParallelize(processes):
+      chunks = self._parallelXML(pretty_print, ucode, processes)
+    else:
+      chunks = self._iterXML(pretty_print, ucode)
+    for chunk in chunks:
+      write(chunk)
+
+  def toXMLString (self, pretty_print = False, ucode = False, processes = None, cache = False):
     """Return the current request contents as an XML string that represents an rspec
-    in the GENIv3 format."""
+    in the GENIv3 format.
+
+    Requests that are rendered over and over (after changing a few nodes each time) can
+    pass `cache = True`.  The serialized form of each top-level resource is then kept,
+    along with a snapshot of its state, and later calls with `cache = True` (and the
+    same `pretty_print` and `ucode`) only write the resources that have changed.  The
+    first such call costs about twice as much as an uncached one, and the kept
+    fragments hold memory until :py:meth:`clearCache` is called.
+
+    Very large requests can instead be serialized in parallel by passing `processes`.
+    The top-level resources are split into contiguous ranges which are written by
+    forked worker processes, and the results are joined under the root element.  The
+    output is identical to the serial path.  Worker processes see a snapshot of the
+    request taken when the pool is started, so `_write` methods must not rely on side
+    effects in the calling process.  On platforms without `fork`, or for requests too
+    small to be worth splitting, the serial path is used.
+    """
+
+    if any(elem.tail for elem in self._raw_elements):
+      # Text between top-level elements changes how libxml2 indents the whole document
+      return self._fullXMLString(pretty_print, ucode)
+
+    if self._canParallelize(processes):
+      return ("" if ucode else b"").join(self._parallelXML(pretty_print, ucode, processes))
+
+    if not cache:
+      return self._fullXMLString(pretty_print, ucode)
+
+    if self._fragments is None:
+      self._fragments = {}
+
+    # Fragments depend on the namespaces declared on the root element
+    nskey = frozenset(self.NSMAP.items())
+    (oldkey, cache) = self._fragments.get((pretty_print, ucode), (None, {}))
+    if oldkey != nskey:
+      cache = {}
+    updated = {}
+
+    chunks = list(self._iterXML(pretty_print, ucode, (cache, updated)))
+    self._fragments[(pretty_print, ucode)] = (nskey, updated)
+
+    return ("" if ucode else b"").join(chunks)
 
+  def clearCache (self):
+    """Release the fragments kept by `toXMLString(cache = True)`."""
+    self._fragments = None
+
+  @classmethod
+  def fromXML (cls, path = None, xml = None):
+    """Load a request rspec back into a `Request`.
+
+    Nodes, links, interfaces, services, the tour and the extensions that
+    `geni.rspec.igext` and `geni.rspec.emulab` know how to write are turned back into
+    objects, and can be looked up with `get` and edited.  Anything else (parameter data,
+    elements from other extensions, a tour that isn't the first element) is kept as a
+    `RawResource` in its original position.  Writing
+    the loaded request out again (with the same `pretty_print` setting) reproduces the
+    original document byte for byte, as long as it was generated by geni-lib.
+
+    Only one argument can be supplied (if both are provided `path` will be used)
+
+    Args:
+      path (str): Path to an XML file on disk containing a request
+      xml (str, bytes): In-memory XML document containing a request
+
+    Returns:
+      Request: the loaded request
+    """
+    import geni.rspec.pgrequest
+    return geni.rspec.pgrequest.load(path, xml)
+
+  def fingerprint (self):
+    """Return a stable fingerprint of this request, as a hex SHA-256 digest.
+
+    Requests that produce equivalent documents have the same fingerprint, regardless of
+    the order in which attributes were set, the prefixes chosen for namespaces, or
+    pretty-printing.  It can be used as a key for :py:mod:`geni.rspec.cache`.
+    """
+    return geni.rspec.cache.fingerprintElement(self._buildDOM())
+
+  def _fullXMLString (self, pretty_print, ucode):
+    rspec = self._buildDOM()
+
+    if ucode:
+      buf = ET.tostring(rspec, pretty_print = pretty_print, encoding="unicode")
+    else:
+      buf = ET.tostring(rspec, pretty_print = pretty_print)
+
+    return buf
+
+  def _buildDOM (self):
     rspec = self.getDOM()
 
     if self.tour:
@@ -115,42 +502,366 @@ class Request(geni.rspec.RSpec):
     for elem in self._raw_elements:
       rspec.append(elem)
 
-    if ucode:
-      buf = ET.tostring(rspec, pretty_print = pretty_print, encoding="unicode")
-    else:
-      buf = ET.tostring(rspec, pretty_print = pretty_print)
-
-    return buf
+    return rspec
+
+  def _iterXML (self, pretty_print, ucode, cache = None):
+    # Every top-level object is written into the same root element (so lxml keeps
+    # numbering any auto-generated namespace prefixes exactly as it would for the full
+    # tree), serialized along with the root, and then removed again.  Slicing the root
+    # start and end tags off that serialization leaves exactly the bytes the object
+    # contributes to the whole document.
+    #
+    # If `cache` is given it is a pair of dicts (previous, current), mapping id(obj) to
+    # (obj, _statekey(obj), fragment).  Unchanged objects are taken from the previous
+    # dict, and everything used in this pass is recorded in the current one.
+    rspec = self.getDOM()
+    kw = {"encoding" : "unicode"} if ucode else {}
+    autoprefix = _AUTOPREFIX if ucode else _AUTOPREFIX_B
+
+    ET.SubElement(rspec, "x")
+    buf = ET.tostring(rspec, pretty_print = pretty_print, **kw)
+    (start, end) = _rootbounds(buf, pretty_print)
+    (head, foot) = (buf[:start], buf[end:])
+    # Slice deletion doesn't create proxies for the removed children, which lets lxml
+    # free them outright instead of moving them (and reconciling their namespaces, which
+    # advances the prefix counter) into a new document.
+    del rspec[:]
+
+    def render ():
+      buf = ET.tostring(rspec, pretty_print = pretty_print, **kw)
+      del rspec[:]
+      (start, end) = _rootbounds(buf, pretty_print)
+      return buf[start:end]
+
+    def fragments ():
+      for obj in itertools.chain([self.tour] if self.tour else [], self._resources, self._ext_children):
+        if cache is None:
+          obj._write(rspec)
+          if len(rspec):
+            yield render()
+          continue
+
+        state = _statekey(obj)
+        entry = cache[0].get(id(obj))
+        if entry is None or entry[0] is not obj or entry[1] != state:
+          obj._write(rspec)
+          frag = render() if len(rspec) else head[:0]
+          entry = (obj, state, frag)
+          # Auto-generated prefixes are numbered across the whole document, so these
+          # fragments are only valid at their current position.
+          if autoprefix.search(frag):
+            yield frag
+            continue
+        cache[1][id(obj)] = entry
+        yield entry[2]
+
+      # Raw elements are already held in memory by the caller, so they go out as one
+      # chunk and are left in the tree, as _fullXMLString() does.
+      if self._raw_elements:
+        for elem in self._raw_elements:
+          rspec.append(elem)
+        yield render()
+
+    for chunk in _framed(head, foot, fragments(), rspec, pretty_print, kw):
+      yield chunk
+
+  def _topLevelObjects (self):
+    return list(itertools.chain([self.tour] if self.tour else [], self._resources, self._ext_children))
+
+  def _canParallelize (self, processes):
+    if not processes or processes < 2:
+      return False
+    if any(elem.tail for elem in self._raw_elements):
+      return False
+    if (len(self._resources) + len(self._ext_children)) < processes * _PARALLEL_MIN_PER_PROCESS:
+      return False
+    return _forkcontext() is not None
+
+  def _parallelXML (self, pretty_print, ucode, processes):
+    # Auto-generated namespace prefixes are numbered in document order, so a range
+    # rendered on its own only numbers them correctly if it comes before any range that
+    # generates one.  Workers report how many prefixes their range used, and ranges that
+    # need to start counting from a later number are rendered again after the worker
+    # has used up that many prefixes on throwaway elements.
+    objs = self._topLevelObjects()
+    nchunks = min(len(objs), processes * _PARALLEL_CHUNKS_PER_PROCESS)
+    bounds = [(len(objs) * idx // nchunks, len(objs) * (idx + 1) // nchunks) for idx in range(nchunks)]
+
+    pool = _forkcontext().Pool(processes, _parallelinit, (self, objs, pretty_print, ucode))
+    try:
+      results = pool.map(_parallelrender, [(start, stop, 0) for (start, stop) in bounds])
+
+      redo = []
+      offset = 0
+      for (idx, (frag, count)) in enumerate(results):
+        if count and offset:
+          redo.append((idx, offset))
+        offset += count
+      if redo:
+        again = pool.map(_parallelrender, [bounds[idx] + (burn,) for (idx, burn) in redo])
+        for ((idx, _), result) in zip(redo, again):
+          results[idx] = result
+    finally:
+      pool.terminate()
+      pool.join()
 
+    rspec = self.getDOM()
+    kw = {"encoding" : "unicode"} if ucode else {}
+
+    ET.SubElement(rspec, "x")
+    buf = ET.tostring(rspec, pretty_print = pretty_print, **kw)
+    (start, end) = _rootbounds(buf, pretty_print)
+    (head, foot) = (buf[:start], buf[end:])
+    del rspec[:]
+
+    def fragments ():
+      for (frag, _) in results:
+        yield frag
+      if self._raw_elements:
+        _burnprefixes(rspec, offset)
+        for elem in self._raw_elements:
+          rspec.append(elem)
+        buf = ET.tostring(rspec, pretty_print = pretty_print, **kw)
+        del rspec[:]
+        (start, end) = _rootbounds(buf, pretty_print)
+        yield buf[start:end]
+
+    return _framed(head, foot, fragments(), rspec, pretty_print, kw)
+
+
+# Requests with fewer top-level resources per worker than this are written serially
+_PARALLEL_MIN_PER_PROCESS = 64
+# Ranges per worker, so that workers which finish early can pick up more of the work
+_PARALLEL_CHUNKS_PER_PROCESS = 4
+# Set in each worker process by _parallelinit
+_PARALLEL_STATE = None
+
+def _forkcontext ():
+  import multiprocessing
+
+  try:
+    return multiprocessing.get_context("fork")
+  except AttributeError:
+    return multiprocessing if os.name == "posix" else None
+  except ValueError:
+    return None
+
+def _parallelinit (request, objs, pretty_print, ucode):
+  global _PARALLEL_STATE  # pylint: disable=global-statement
+  _PARALLEL_STATE = (request, objs, pretty_print, ucode)
+
+def _parallelrender (task):
+  """Writes one range of top-level objects in a worker process.  Returns the serialized
+  range, and the number of auto-generated namespace prefixes it used."""
+
+  (start, stop, burn) = task
+  (request, objs, pretty_print, ucode) = _PARALLEL_STATE
+  kw = {"encoding" : "unicode"} if ucode else {}
+
+  # Probing the counter uses up a prefix, so the starting value is read from a separate
+  # document that is built the same way.
+  first = _nextprefix(request.getDOM()) + burn
+  rspec = request.getDOM()
+  _burnprefixes(rspec, burn)
+  for obj in objs[start:stop]:
+    obj._write(rspec)
+
+  if len(rspec):
+    buf = ET.tostring(rspec, pretty_print = pretty_print, **kw)
+    (bstart, bend) = _rootbounds(buf, pretty_print)
+    frag = buf[bstart:bend]
+  else:
+    frag = "" if ucode else b""
+  del rspec[:]
+  return (frag, _nextprefix(rspec) - first)
+
+_PREFIX_PROBE = "urn:publicid:IDN+geni-lib+prefix-probe"
+
+def _burnprefixes (rspec, count):
+  """Advances the document's auto-generated prefix counter of `rspec` by `count`."""
+  # The element proxies are dropped immediately so that deleting the elements doesn't
+  # move them into a new document (which would use up more prefixes).
+  for idx in range(count):
+    ET.SubElement(rspec, "{%s%d}b" % (_PREFIX_PROBE, idx))
+  if count:
+    del rspec[-count:]
+
+def _nextprefix (rspec):
+  """Returns the number of the next auto-generated prefix in the document of `rspec`.
+  This uses up that number."""
+  prefix = ET.SubElement(rspec, "{%s}p" % (_PREFIX_PROBE)).prefix
+  del rspec[-1:]
+  return int(prefix[2:])
+
+def _framed (head, foot, fragments, rspec, pretty_print, kw):
+  started = False
+  for frag in fragments:
+    if not frag:
+      continue
+    if not started:
+      started = True
+      yield head
+    yield frag
+
+  if started:
+    yield foot
+  else:
+    # Nothing was written, so the root is an empty element
+    yield ET.tostring(rspec, pretty_print = pretty_print, **kw)
+
+
+_AUTOPREFIX = re.compile(r'xmlns:ns[0-9]+=')
+_AUTOPREFIX_B = re.compile(br'xmlns:ns[0-9]+=')
+
+def _rootbounds (buf, pretty_print):
+  """Returns the (start, end) offsets of the content between the root element start and
+  end tags of a serialized document.  libxml2 escapes '>' in attribute values, so the
+  first one always closes the root start tag."""
+
+  if isinstance(buf, bytes):
+    (gt, lt) = (b">", b"</")
+  else:
+    (gt, lt) = (">", "</")
+
+  start = buf.index(gt) + 1
+  if pretty_print:
+    start += 1
+  return (start, buf.rindex(lt))
+
+
+def _chunkwriter (out, ucode):
+  if hasattr(out, "write"):
+    return out.write
+
+  if hasattr(out, "sendall"):
+    send = out.sendall
+  else:
+    def send (data):
+      view = memoryview(data)
+      while view:
+        view = view[os.write(out, view):]
+
+  if ucode:
+    return lambda chunk: send(chunk.encode("utf-8"))
+  return send
+
+
+_ATOMS = frozenset(list(six.string_types) + list(six.integer_types) +
+                   [six.text_type, six.binary_type, float, bool, type(None), type,
+                    types.FunctionType, types.MethodType, types.BuiltinFunctionType])
+
+def _statekey (obj):
+  """Returns a snapshot of everything reachable from the top-level object `obj` that can
+  change how it is written, which compares equal to a later snapshot as long as nothing
+  has been modified."""
+
+  # Attribute values are compared by identity (or value, for atoms), and the contents of
+  # anything mutable are snapshotted separately
+  memo = {}
+  values = _attrvalues(obj)
+  return (values, [_substatekey(v, memo) for v in values if type(v) not in _ATOMS])
+
+@functools.lru_cache(maxsize = None)
+def _slotgetter (klass):
+  names = []
+  for base in klass.__mro__:
+    slots = base.__dict__.get("__slots__", ())
+    if isinstance(slots, six.string_types):
+      slots = (slots,)
+    names.extend([x for x in slots if x not in ("__dict__", "__weakref__")])
+  if not names:
+    return (lambda obj: (), names)
+  if len(names) == 1:
+    # attrgetter() only returns a tuple for more than one name
+    getone = operator.attrgetter(names[0])
+    return (lambda obj: (getone(obj),), names)
+  return (operator.attrgetter(*names), names)
+
+def _attrvalues (obj):
+  (getter, names) = _slotgetter(type(obj))
+  try:
+    values = getter(obj)
+  except AttributeError:
+    values = tuple([getattr(obj, x, None) for x in names])
+  try:
+    return values + tuple(vars(obj).values())
+  except TypeError:
+    return values
+
+def _substatekey (val, memo):
+  vtype = type(val)
+  if vtype is list or vtype is tuple:
+    values = tuple(val)
+  elif vtype is dict:
+    values = tuple(val.items())
+  elif vtype is set or vtype is frozenset:
+    return frozenset(val)
+  elif isinstance(val, ET._Element):
+    return ET.tostring(val)
+  elif isinstance(val, (Node, geni.rspec.RSpec)):
+    # Back references (interfaces to their node, extensions to their parent) only
+    # contribute the attributes that other objects copy into their own output
+    return (getattr(val, "client_id", None), getattr(val, "component_manager_id", None))
+  else:
+    try:
+      return memo[id(val)]
+    except KeyError:
+      pass
+    values = _attrvalues(val)
+    memo[id(val)] = None   # Reference cycles
+    key = (values, [_substatekey(v, memo) for v in values if type(v) not in _ATOMS])
+    memo[id(val)] = key
+    return key
+
+  return (values, [_substatekey(v, memo) for v in values if type(v) not in _ATOMS])
 
 
 class Resource(object):
+  # Resources are slotted to keep large requests small; __dict__ is kept so that
+  # subclasses and callers can still set arbitrary attributes.  Lists that are usually
+  # empty start out as an empty tuple, and are only allocated when something is added.
+  __slots__ = ("namespaces", "_ext_children", "__dict__", "__weakref__")
+
   def __init__ (self):
-    self.namespaces = []
-    self._ext_children = []
+    self.namespaces = ()
+    self._ext_children = ()
 
   def addNamespace (self, ns):
+    if not self.namespaces:
+      self.namespaces = []
     self.namespaces.append(ns)
 
-  def _wrapext (self, name, klass):
-    @functools.wraps(klass.__init__)
-    def wrap(*args, **kw):
-      if getattr(klass, "__ONCEONLY__", False):
-        if any([isinstance(x,klass) for x in self._ext_children]):
-          raise DuplicateExtensionError(klass)
-      for ns in getattr(klass, "__NAMESPACES__", []):
-        self.addNamespace(ns)
-      instance = klass(*args, **kw)
-      self._ext_children.append(instance)
-      return instance
-    setattr(self, name, wrap)
-
   def _write (self, element):
     for obj in self._ext_children:
       obj._write(element)
     return element
 
 
+class RawResource(Resource):
+  """A top-level element that is written out exactly as given.
+
+  `Request.fromXML` uses this for elements it has no class for.
+
+  Args:
+    element (lxml.etree._Element): The element to write
+  """
+  __slots__ = ("element", "_autoprefixes")
+
+  def __init__ (self, element):
+    super(RawResource, self).__init__()
+    self.element = element
+    # Number of auto-generated prefixes lxml used when the element was first written
+    self._autoprefixes = len(_AUTOPREFIX_B.findall(ET.tostring(element, with_tail = False)))
+
+  def _write (self, root):
+    elem = copy.deepcopy(self.element)
+    root.append(elem)
+    # Anything written after this element should get the same prefixes it had in the
+    # original document
+    _burnprefixes(root, self._autoprefixes)
+    return elem
+
+
 class NodeType(object):
   XEN = "emulab-xen"
   DOCKER = "emulab-docker"
@@ -220,8 +931,12 @@ class IPv4Address(Address):
     return ip
 
 
+@_extensible
 class Interface(object):
-  EXTENSIONS = []
+  EXTENSIONS = _Extensions()
+
+  __slots__ = ("_client_id", "node", "addresses", "component_id", "bandwidth", "latency", "plr",
+               "_ext_children", "__dict__", "__weakref__")
 
   class InvalidAddressTypeError(Exception):
     def __init__ (self, addr):
@@ -231,33 +946,32 @@ class Interface(object):
       return "Type (%s) is invalid for interface addresses." % (type(self.addr))
 
   def __init__ (self, name, node, address = None):
-    self.client_id = name
+    self._client_id = name
     self.node = node
     self.addresses = []
     self.component_id = None
     self.bandwidth = None
     self.latency = None
     self.plr = None
-    self._ext_children = []
+    self._ext_children = ()
     if address:
       self.addAddress(address)
-    for name,ext in Interface.EXTENSIONS:
-      self._wrapext(name,ext)
 
-  def _wrapext (self, name, klass):
-    @functools.wraps(klass.__init__)
-    def wrap(*args, **kw):
-      if getattr(klass, "__ONCEONLY__", False):
-        if any([isinstance(x,klass) for x in self._ext_children]):
-          raise DuplicateExtensionError(klass)
-      instance = klass(*args, **kw)
-      if getattr(klass, "__WANTPARENT__", False):
-        instance._parent = self
-      for ns in getattr(klass, "__NAMESPACES__", []):
-        self.addNamespace(ns)
-      self._ext_children.append(instance)
-      return instance
-    setattr(self, name, wrap)
+  @property
+  def client_id (self):
+    return self._client_id
+
+  @client_id.setter
+  def client_id (self, name):
+    old = self._client_id
+    self._client_id = name
+    node = self.node
+    if node is not None:
+      if node._ifnames:
+        node._ifnames.discard(old)
+        node._ifnames.add(name)
+      if node.parent_request is not None:
+        node.parent_request._stale = True
 
   @property
   def name (self):
@@ -284,19 +998,25 @@ class Interface(object):
     return intf
 
 
+@_extensible
 class Link(Resource):
-  EXTENSIONS = []
+  EXTENSIONS = _Extensions()
   LNKID = 0
   DEFAULT_BW = -1
   DEFAULT_LAT = 0
   DEFAULT_PLR = 0.0
 
+  __slots__ = ("_client_id", "_request", "interfaces", "type", "protocol", "bandwidth", "latency", "plr",
+               "compact_shaping", "_mac_learning", "_vlan_tagging", "_trivial_ok", "_link_multiplexing", "_best_effort",
+               "_raw_elements", "_component_managers")
+
   def __init__ (self, name = None, ltype = "", members = None):
     super(Link, self).__init__()
+    self._request = None
     if name is None:
-      self.client_id = Link.newLinkID()
+      self._client_id = Link.newLinkID()
     else:
-      self.client_id = name
+      self._client_id = name
 
     self.interfaces = []
 
@@ -313,43 +1033,41 @@ class Link(Resource):
     self._trivial_ok = None
     self._link_multiplexing = False
     self._best_effort = False
-    self._ext_children = []
-    self._raw_elements = []
-    self._component_managers = []
+    self._raw_elements = ()
+    self._component_managers = ()
     self.protocol = None
 
     # If you try to set bandwidth higher than a gigabit, PG probably won't like you
     self.bandwidth = Link.DEFAULT_BW
     self.latency = Link.DEFAULT_LAT
     self.plr = Link.DEFAULT_PLR
-
-    for name,ext in Link.EXTENSIONS:
-      self._wrapext(name,ext)
-
-  def _wrapext (self, name, klass):
-    @functools.wraps(klass.__init__)
-    def wrap(*args, **kw):
-      if getattr(klass, "__ONCEONLY__", False):
-        if any([isinstance(x,klass) for x in self._ext_children]):
-          raise DuplicateExtensionError(klass)
-      instance = klass(*args, **kw)
-      if getattr(klass, "__WANTPARENT__", False):
-        instance._parent = self
-      for ns in getattr(klass, "__NAMESPACES__", []):
-        self.addNamespace(ns)
-      self._ext_children.append(instance)
-      return instance
-    setattr(self, name, wrap)
+    # Write shaping as one property per interface (as a LAN does) instead of one for
+    # every ordered pair of interfaces, so that links with many members stay small
+    self.compact_shaping = False
 
   def addRawElement (self, elem):
+    if not self._raw_elements:
+      self._raw_elements = []
     self._raw_elements.append(elem)
 
+  @property
+  def client_id (self):
+    return self._client_id
+
+  @client_id.setter
+  def client_id (self, name):
+    self._client_id = name
+    if self._request is not None:
+      self._request._stale = True
+
   @classmethod
   def newLinkID (cls):
     Link.LNKID += 1
     return "link-%d" % (Link.LNKID)
 
   def addChild (self, obj):
+    if not self._ext_children:
+      self._ext_children = []
     self._ext_children.append(obj)
 
   def addInterface (self, intf):
@@ -361,10 +1079,12 @@ class Link(Resource):
     return interface
 
   def addComponentManager (self, component_manager):
+    if not self._component_managers:
+      self._component_managers = []
     self._component_managers.append(component_manager)
 
   def disableMACLearning (self):
-    self.namespaces.append(Namespaces.VTOP)
+    self.addNamespace(Namespaces.VTOP)
     self._mac_learning = False
 
   def enableVlanTagging (self):
@@ -380,7 +1100,7 @@ class Link(Resource):
 
   @vlan_tagging.setter
   def vlan_tagging (self, val):
-    self.namespaces.append(Namespaces.EMULAB)
+    self.addNamespace(Namespaces.EMULAB)
     self._vlan_tagging = val
 
   @property
@@ -389,7 +1109,7 @@ class Link(Resource):
 
   @best_effort.setter
   def best_effort (self, val):
-    self.namespaces.append(Namespaces.EMULAB)
+    self.addNamespace(Namespaces.EMULAB)
     self._best_effort = val
 
   @property
@@ -398,7 +1118,7 @@ class Link(Resource):
 
   @link_multiplexing.setter
   def link_multiplexing (self, val):
-    self.namespaces.append(Namespaces.EMULAB)
+    self.addNamespace(Namespaces.EMULAB)
     self._link_multiplexing = val
 
   @property
@@ -407,7 +1127,7 @@ class Link(Resource):
 
   @trivial_ok.setter
   def trivial_ok (self, val):
-    self.namespaces.append(Namespaces.EMULAB)
+    self.addNamespace(Namespaces.EMULAB)
     self._trivial_ok = val
 
   def _write (self, root):
@@ -453,19 +1173,22 @@ class Link(Resource):
       else:
         trivial.attrib["enabled"] = "false"
 
-    # LAN shaping properties are handled by the LAN class below.
+    # LAN shaping properties are handled by the LAN class below.  Other links write a
+    # property for every ordered pair of interfaces, which grows with the square of the
+    # number of members, unless compact_shaping is set.
     if self.type != "lan":
-      for (intfA,intfB) in itertools.permutations(self.interfaces,2):
-        bw = intfA.bandwidth if intfA.bandwidth else self.bandwidth
-        lat = intfA.latency if intfA.latency else self.latency
-        plr = intfA.plr if intfA.plr else self.plr
-        self._write_link_prop(lnk, intfB.client_id, intfA.client_id, bw, lat, plr)
+      if self.compact_shaping:
+        self._write_interface_props(lnk)
+      else:
+        self._write_pair_props(lnk)
 
     for obj in self._ext_children:
       obj._write(lnk)
 
+    # Copies, so that the caller's elements never become part of (and aren't moved out
+    # of) the document being written
     for elem in self._raw_elements:
-      lnk.append(elem)
+      lnk.append(copy.deepcopy(elem))
 
     for manager in self._component_managers:
       cm = ET.SubElement(lnk, "{%s}component_manager" % (GNS.REQUEST.name))
@@ -473,6 +1196,29 @@ class Link(Resource):
 
     return lnk
 
+  def _shaping (self, intf):
+    bw = intf.bandwidth if intf.bandwidth else self.bandwidth
+    lat = intf.latency if intf.latency else self.latency
+    plr = intf.plr if intf.plr else self.plr
+    return (bw, lat, plr)
+
+  def _write_pair_props (self, lnk):
+    # One property per ordered pair of interfaces, but the shaping only depends on the
+    # first interface of the pair, so interfaces with default shaping (which would not
+    # produce any properties) are skipped without visiting their pairs.
+    for (idxA, intfA) in enumerate(self.interfaces):
+      (bw, lat, plr) = self._shaping(intfA)
+      if bw == Link.DEFAULT_BW and lat == Link.DEFAULT_LAT and plr == Link.DEFAULT_PLR:
+        continue
+      for (idxB, intfB) in enumerate(self.interfaces):
+        if idxA != idxB:
+          self._write_link_prop(lnk, intfB.client_id, intfA.client_id, bw, lat, plr)
+
+  def _write_interface_props (self, lnk):
+    for intf in self.interfaces:
+      (bw, lat, plr) = self._shaping(intf)
+      self._write_link_prop(lnk, intf.client_id, self.client_id, bw, lat, plr)
+
   def _write_link_prop(self, lnk, src, dst, bw, lat, plr):
     if bw != Link.DEFAULT_BW or lat != Link.DEFAULT_LAT or \
        plr != Link.DEFAULT_PLR:
@@ -490,30 +1236,30 @@ Request.EXTENSIONS.append(("Link", Link))
 
 
 class LAN(Link):
+  __slots__ = ()
+
   def __init__ (self, name = None):
     super(LAN, self).__init__(name, "lan")
 
   def _write (self, root):
     lnk = super(LAN, self)._write(root)
-
-    for intf in self.interfaces:
-      bw = intf.bandwidth if intf.bandwidth else self.bandwidth
-      lat = intf.latency if intf.latency else self.latency
-      plr = intf.plr if intf.plr else self.plr
-      super(LAN, self)._write_link_prop(lnk, intf.client_id, self.client_id, bw, lat, plr)
-
+    self._write_interface_props(lnk)
     return lnk
 
 Request.EXTENSIONS.append(("LAN", LAN))
 
 
 class L3GRE(Link):
+  __slots__ = ()
+
   def __init__ (self, name = None):
     super(L3GRE, self).__init__(name, "gre-tunnel")
 
 Request.EXTENSIONS.append(("L3GRE", L3GRE))
 
 class L2GRE(Link):
+  __slots__ = ()
+
   def __init__ (self, name = None):
     super(L2GRE, self).__init__(name, "egre-tunnel")
 
@@ -531,6 +1277,8 @@ class StitchedLink(Link):
     def __str__ (self):
       return "Stitched Links may not be connected to more than two interfaces"
 
+  __slots__ = ()
+
   def __init__ (self, name = None):
     super(StitchedLink, self).__init__(name, "")
     self.bandwidth = 20000
@@ -549,6 +1297,7 @@ class StitchedLink(Link):
 
 Request.EXTENSIONS.append(("StitchedLink", StitchedLink))
 
+@_extensible
 class Node(Resource):
   """A basic Node class.  Typically you want to instantiate one of its subclasses, such as `RawPC`, `XenVM`, or `DockerContainer`.
 
@@ -564,12 +1313,16 @@ class Node(Resource):
     exclusive (Optional[bool]): Request this container on an isolated host used only by your sliver.  Defaults to unspecified, allowing the site processing the request rspec to assign resources as it prefers.
     disk_image (Optional[str]): The disk image that should be loaded and run on this node.  Should be an image URN.
   """
-  EXTENSIONS = []
+  EXTENSIONS = _Extensions()
   __WANTPARENT__ = True;
 
+  __slots__ = ("_client_id", "exclusive", "disk_image", "type", "hardware_type", "interfaces",
+               "services", "routable_control_ip", "component_id", "component_manager_id",
+               "parent_request", "_raw_elements", "_ifindex", "_ifnames")
+
   def __init__ (self, name, ntype, component_id = None, exclusive = None):
     super(Node, self).__init__()
-    self.client_id = name
+    self._client_id = name
     self.exclusive = exclusive
     self.disk_image = None
     self.type = ntype
@@ -579,31 +1332,15 @@ class Node(Resource):
     self.routable_control_ip = False
     self.component_id = component_id
     self.component_manager_id = None
-    self._ext_children = []
-    for name,ext in Node.EXTENSIONS:
-      self._wrapext(name,ext)
-
-    self._raw_elements = []
+    self.parent_request = None
+    self._raw_elements = ()
+    self._ifindex = 0
+    self._ifnames = ()
 
   class DuplicateInterfaceName(Exception):
     def __str__ (self):
       return "Duplicate interface names"
 
-  def _wrapext (self, name, klass):
-    @functools.wraps(klass.__init__)
-    def wrap(*args, **kw):
-      if getattr(klass, "__ONCEONLY__", False):
-        if any([isinstance(x,klass) for x in self._ext_children]):
-          raise DuplicateExtensionError(klass)
-      instance = klass(*args, **kw)
-      if getattr(klass, "__WANTPARENT__", False):
-        instance._parent = self
-      for ns in getattr(klass, "__NAMESPACES__", []):
-        self.addNamespace(ns)
-      self._ext_children.append(instance)
-      return instance
-    setattr(self, name, wrap)
-
   @property
   def _parent(self):
     return self.parent_request
@@ -613,6 +1350,16 @@ class Node(Resource):
     self.parent_request = request
     pass
         
+  @property
+  def client_id (self):
+    return self._client_id
+
+  @client_id.setter
+  def client_id (self, name):
+    self._client_id = name
+    if self.parent_request is not None:
+      self.parent_request._stale = True
+
   @property
   def name (self):
     return self.client_id
@@ -667,32 +1414,54 @@ class Node(Resource):
     for obj in self._ext_children:
       obj._write(nd)
 
+    # Copies, so that the caller's elements never become part of (and aren't moved out
+    # of) the document being written
     for elem in self._raw_elements:
-      nd.append(elem)
+      nd.append(copy.deepcopy(elem))
 
     return nd
 
   def addInterface (self, name = None, address = None):
-    existingNames = [x.name for x in self.interfaces]
+    request = self.parent_request
     if name is not None:
       if name.find(":") > 0:
         intfName = name
       else:
         intfName = "%s:%s" % (self.client_id, name)
         pass
+      if self._interfaceNameTaken(intfName):
+        raise Node.DuplicateInterfaceName()
+      intf = Interface(intfName, self, address)
+      if request is not None:
+        request._register([intf])
     else:
-      for i in range(0, 100):
-        intfName = "%s:if%i" % (self.client_id, i)
-        if intfName not in existingNames:
+      # Generated names come from a per-node counter, skipping any that are already in
+      # use by this node or by anything else in the request.
+      index = request._index() if request is not None else {}
+      while True:
+        intfName = "%s:if%i" % (self.client_id, self._ifindex)
+        self._ifindex += 1
+        if intfName not in index and not self._interfaceNameTaken(intfName):
           break
+      intf = Interface(intfName, self, address)
+      if request is not None:
+        index[intfName] = intf
 
-    if intfName in existingNames:
-      raise Node.DuplicateInterfaceName()
-
-    intf = Interface(intfName, self, address)
     self.interfaces.append(intf)
+    if not self._ifnames:
+      self._ifnames = set()
+    self._ifnames.add(intfName)
     return intf
 
+  def _interfaceNameTaken (self, name):
+    # Names are kept in a set as interfaces are added and renamed.  Interfaces can also
+    # be added to or removed from the list directly, so the set is rebuilt whenever it no
+    # longer has an entry for every interface.
+    names = self._ifnames
+    if len(names) != len(self.interfaces):
+      names = self._ifnames = set([intf.client_id for intf in self.interfaces])
+    return name in names
+
   def addService (self, svc, atfront = False):
     if atfront:
       self.services.insert(0, svc)
@@ -700,21 +1469,58 @@ class Node(Resource):
       self.services.append(svc)
 
   def addRawElement (self, elem):
+    if not self._raw_elements:
+      self._raw_elements = []
     self._raw_elements.append(elem)
 
 Request.EXTENSIONS.append(("Node", Node))
 
 class RawPC(Node):
+  __slots__ = ()
+
   def __init__ (self, name, component_id = None):
     super(RawPC, self).__init__(name, NodeType.RAW, component_id = component_id, exclusive = True)
 
 Request.EXTENSIONS.append(("RawPC", RawPC))
 
 class VZContainer(Node):
+  __slots__ = ()
+
   def __init__ (self, name, exclusive = False):
     super(VZContainer, self).__init__(name, "emulab-openvz", exclusive)
 
 
+class NodeTemplate(object):
+  """A description of a set of identically configured nodes, for use with `Request.addNodes`.
+
+  Args:
+    klass (type): The `Node` subclass to create, such as `RawPC` or `igext.XenVM`.
+    services (Optional[list]): Services to add to every node.  The service objects are shared
+      by all of the nodes created from this template, so they should be treated as read-only.
+    **attrs: Attributes to set on every node, such as `disk_image`, `hardware_type` or `ram`.
+
+  Example:
+    tmpl = NodeTemplate(IG.XenVM, disk_image = IMAGE, ram = 2048,
+                        services = [Execute(shell = "sh", command = "/local/repository/setup.sh")])
+    nodes = request.addNodes(tmpl, 1000)
+  """
+
+  def __init__ (self, klass, services = None, **attrs):
+    self.klass = klass
+    self.services = tuple(services) if services else ()
+    self.attrs = tuple(attrs.items())
+
+  def create (self, name):
+    """Create a single node from this template, without adding it to a request."""
+    node = self.klass(name)
+    for (key, val) in self.attrs:
+      setattr(node, key, val)
+    if self.services:
+      node.services = list(self.services)
+    return node
+
+
+
 
 class Namespaces(object):
   CLIENT = GNS.Namespace("client", "http://www.protogeni.net/resources/rspec/ext/client/1")
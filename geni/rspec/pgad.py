@@ -6,6 +6,8 @@
 
 
 
+import io
+
 from lxml import etree as ET
 import six
 
@@ -13,7 +15,8 @@ from .. import namespaces as GNS
 from .pg import Namespaces as PGNS
 from . import pg
 from . import stitching
-from ..model.util import XPathXRange
+from ..model.util import XPathXRange, xrangeproperty
+from ..model.spatial import EARTH_RADIUS_KM
 
 _XPNS = {'g' : GNS.REQUEST.name, 's' : GNS.SVLAN.name,
          'e' : PGNS.EMULAB.name, 't' : stitching.STITCHNS.name}
@@ -96,13 +99,42 @@ class AdInterface(pg.Interface):
     return intf
 
 
+class _lazyfield(object):
+  """Attribute that is decoded from the XML element the first time it is read.  `decode`
+  returns a dict of field values, as several fields may come from the same elements;
+  fields that have already been read or assigned (as `__init__` does) are kept."""
+
+  def __init__ (self, name, decode):
+    self._name = name
+    self._decode = decode
+
+  def __get__ (self, obj, objtype = None):
+    if obj is None:
+      return self
+    values = obj.__dict__
+    for (name, value) in self._decode(obj).items():
+      values.setdefault(name, value)
+    return values[self._name]
+
+
+_XP_AVAILABLE = ET.XPath('g:available', namespaces = _XPNS)
+_XP_SLIVER_TYPE = ET.XPath('g:sliver_type', namespaces = _XPNS)
+_XP_DISK_IMAGE = ET.XPath('g:disk_image', namespaces = _XPNS)
+_XP_HARDWARE_TYPE = ET.XPath('g:hardware_type', namespaces = _XPNS)
+_XP_NODE_TYPE = ET.XPath('e:node_type', namespaces = _XPNS)
+_XP_FD = ET.XPath('e:fd', namespaces = _XPNS)
+_XP_INTERFACE = ET.XPath('g:interface', namespaces = _XPNS)
+_XP_LOCATION = ET.XPath('g:location', namespaces = _XPNS)
+
+
 class AdNode(object):
   """Wrapper object for a Node in a GENIv3 advertisement.
 
   .. note::
     In general this object is created on-demand through `Advertisement` objects,
     but you can load this object from a Node XML element by using the `_fromdom`
-    classmethod.
+    classmethod.  Nodes loaded from XML only decode the child elements needed for an
+    attribute (such as `images` or `interfaces`) the first time it is read.
 
     Attributes:
       component_id (str): Component ID URN
@@ -139,55 +171,69 @@ class AdNode(object):
 
   @classmethod
   def _fromdom (cls, elem):
-    node = AdNode()
+    # Only the attributes of the node element are read here, everything else is decoded
+    # from the element by _lazyfield the first time it is used.
+    node = cls.__new__(cls)
     node._elem = elem
     node.component_id = elem.get("component_id")
     node.name = elem.get("component_name")
     node.component_manager_id = elem.get("component_manager_id")
-    if elem.get("exclusive") == "false":
-      node.exclusive = False
+    node.exclusive = elem.get("exclusive") != "false"
+    return node
 
-    avelem = elem.xpath('g:available', namespaces = _XPNS)
-    if avelem and avelem[0].get("now") == "true":
-      node.available = True
+  def _decodeAvailable (self):
+    avelem = _XP_AVAILABLE(self._elem)
+    return {"available" : bool(avelem) and avelem[0].get("now") == "true"}
 
-    stypes = elem.xpath('g:sliver_type', namespaces = _XPNS)
-    for stype in stypes:
+  def _decodeSliverTypes (self):
+    sliver_types = set()
+    images = {}
+    for stype in _XP_SLIVER_TYPE(self._elem):
       sliver_name = stype.get("name")
-      node.sliver_types.add(sliver_name)
-      node.images[sliver_name] = []
-      ims = stype.xpath('g:disk_image', namespaces = _XPNS)
-      for im in ims:
-        node.images[sliver_name].append(Image._fromdom(im))
-
-    htypes = elem.xpath('g:hardware_type', namespaces = _XPNS)
-    for htype in htypes:
-      nts = htype.xpath('e:node_type', namespaces = _XPNS)
+      sliver_types.add(sliver_name)
+      images[sliver_name] = [Image._fromdom(im) for im in _XP_DISK_IMAGE(stype)]
+    return {"sliver_types" : sliver_types, "images" : images}
+
+  def _decodeHardwareTypes (self):
+    hardware_types = {}
+    for htype in _XP_HARDWARE_TYPE(self._elem):
+      nts = _XP_NODE_TYPE(htype)
       if nts:
-        node.hardware_types[htype.get("name")] = nts[0].get("type_slots")
+        hardware_types[htype.get("name")] = nts[0].get("type_slots")
+    return {"hardware_types" : hardware_types}
 
-    fds = elem.xpath('e:fd', namespaces = _XPNS)
-    for fd in fds:
+  def _decodeFeatures (self):
+    fields = {"shared" : False, "cpu" : None, "ram" : None}
+    for fd in _XP_FD(self._elem):
       name = fd.get("name")
       if name == 'pcshared':
-        node.shared = True
+        fields["shared"] = True
       elif name == 'cpu':
-        node.cpu = int(fd.get("weight"))
+        fields["cpu"] = int(fd.get("weight"))
       elif name == 'ram':
-        node.ram = int(fd.get("weight"))
+        fields["ram"] = int(fd.get("weight"))
+    return fields
 
-    for intf in elem.xpath('g:interface', namespaces = _XPNS):
-      node.interfaces.append(AdInterface._fromdom(intf))
+  def _decodeInterfaces (self):
+    return {"interfaces" : [AdInterface._fromdom(intf) for intf in _XP_INTERFACE(self._elem)]}
 
-    locelem = elem.xpath('g:location', namespaces = _XPNS)
-    if locelem:
-      node.location = Location._fromdom(locelem[0])
-
-    return node
+  def _decodeLocation (self):
+    locelem = _XP_LOCATION(self._elem)
+    return {"location" : Location._fromdom(locelem[0]) if locelem else None}
 
   @property
   def text (self):
-    return ET.tostring(self._root, pretty_print=True, encoding="unicode")
+    return ET.tostring(self._elem, pretty_print=True, encoding="unicode")
+
+  available = _lazyfield("available", _decodeAvailable)
+  sliver_types = _lazyfield("sliver_types", _decodeSliverTypes)
+  images = _lazyfield("images", _decodeSliverTypes)
+  hardware_types = _lazyfield("hardware_types", _decodeHardwareTypes)
+  shared = _lazyfield("shared", _decodeFeatures)
+  cpu = _lazyfield("cpu", _decodeFeatures)
+  ram = _lazyfield("ram", _decodeFeatures)
+  interfaces = _lazyfield("interfaces", _decodeInterfaces)
+  location = _lazyfield("location", _decodeLocation)
 
 
 class AdLink(object):
@@ -215,7 +261,7 @@ class AdLink(object):
 
   @property
   def text (self):
-    return ET.tostring(self._root, pretty_print=True, encoding="unicode")
+    return ET.tostring(self._elem, pretty_print=True, encoding="unicode")
 
 
 class AdSharedVLAN(object):
@@ -242,6 +288,294 @@ class RoutableAddresses(object):
     return self.configured
 
 
+class NodeTable(object):
+  """Columnar view of the nodes in an advertisement, for filtering thousands of nodes with
+  NumPy expressions instead of Python loops.  Requires NumPy.
+
+  Row `i` describes `Advertisement.nodes[i]`.  For example, to find available raw PCs
+  with at least 64GB of RAM:
+
+  ::
+
+    t = ad.node_table
+    mask = t.data["available"] & t.data["exclusive"] & t.hasSliverType("raw-pc")
+    mask &= t.data["ram"] >= 65536
+    nodes = t.nodes(mask)
+
+  Attributes:
+    data (numpy.ndarray): Structured array with one row per node and the fields
+      `available`, `exclusive` and `shared` (bool), `cpu` and `ram` (int, -1 if not
+      advertised), `latitude` and `longitude` (float, NaN if not advertised) and
+      `interfaces` (number of interfaces).
+    component_ids (numpy.ndarray): Component ID of each node (object array)
+    hardware_types (list): Hardware type names; the code of a type is its index
+    sliver_types (list): Sliver type names; the code of a type is its index
+    hardware (numpy.ndarray): Boolean matrix of shape (nodes, hardware types), True where
+      the node has the hardware type
+    hardware_slots (numpy.ndarray): Float matrix of the same shape with the advertised
+      `type_slots` (NaN if the node doesn't have the type, inf for "unlimited")
+    sliver (numpy.ndarray): Boolean matrix of shape (nodes, sliver types)
+  """
+
+  def __init__ (self, ad):
+    import numpy as np
+
+    elems = ad.nodes._data
+    count = len(elems)
+    self._ad = ad
+
+    self.data = np.zeros(count, dtype = [("available", bool), ("exclusive", bool), ("shared", bool),
+                                         ("cpu", np.int32), ("ram", np.int64), ("latitude", np.float64),
+                                         ("longitude", np.float64), ("interfaces", np.int32)])
+    self.component_ids = np.empty(count, dtype = object)
+
+    (available, exclusive, shared, cpu, ram, lat, lon, intfs) = cols = [[] for _ in range(8)]
+    hwcodes = {}
+    stcodes = {}
+    hwrows = []
+    strows = []
+
+    for (idx, elem) in enumerate(elems):
+      self.component_ids[idx] = elem.get("component_id")
+      exclusive.append(elem.get("exclusive") != "false")
+      node = _NodeChildren(elem)
+      for (name, _) in node.sliver_types:
+        strows.append((idx, stcodes.setdefault(name, len(stcodes))))
+      for (name, slots) in node.hardware_types:
+        hwrows.append((idx, hwcodes.setdefault(name, len(hwcodes)), slots))
+      (ncpu, nram, nlat, nlon) = (node.cpu, node.ram, np.nan, np.nan)
+      if ncpu is None:
+        ncpu = -1
+      if nram is None:
+        nram = -1
+      if node.location is not None:
+        nlat = float(node.location.get("latitude"))
+        nlon = float(node.location.get("longitude"))
+      for (col, val) in zip((available, shared, cpu, ram, lat, lon, intfs),
+                            (bool(node.available), node.shared, ncpu, nram, nlat, nlon,
+                             len(node.interfaces))):
+        col.append(val)
+
+    for (name, col) in zip(("available", "exclusive", "shared", "cpu", "ram", "latitude", "longitude",
+                            "interfaces"), cols):
+      self.data[name] = col
+
+    self.hardware_types = sorted(hwcodes, key = hwcodes.get)
+    self.sliver_types = sorted(stcodes, key = stcodes.get)
+
+    self.hardware = np.zeros((count, len(hwcodes)), dtype = bool)
+    self.hardware_slots = np.full((count, len(hwcodes)), np.nan)
+    # Later entries win, as they do in AdNode.hardware_types
+    for (idx, code, slots) in hwrows:
+      self.hardware[idx, code] = True
+      self.hardware_slots[idx, code] = _slots(slots)
+
+    self.sliver = np.zeros((count, len(stcodes)), dtype = bool)
+    for (idx, code) in strows:
+      self.sliver[idx, code] = True
+
+  def __len__ (self):
+    return len(self.data)
+
+  def hasHardwareType (self, name):
+    """Boolean column, True for nodes that have the named hardware type."""
+    import numpy as np
+
+    try:
+      return self.hardware[:, self.hardware_types.index(name)]
+    except ValueError:
+      return np.zeros(len(self.data), dtype = bool)
+
+  def hasSliverType (self, name):
+    """Boolean column, True for nodes that support the named sliver type."""
+    import numpy as np
+
+    try:
+      return self.sliver[:, self.sliver_types.index(name)]
+    except ValueError:
+      return np.zeros(len(self.data), dtype = bool)
+
+  def slots (self, name):
+    """Float column of the `type_slots` advertised for the named hardware type (NaN for
+    nodes without it)."""
+    import numpy as np
+
+    try:
+      return self.hardware_slots[:, self.hardware_types.index(name)]
+    except ValueError:
+      return np.full(len(self.data), np.nan)
+
+  def distance (self, latitude, longitude):
+    """Float column of great-circle distances in kilometres from the given point (NaN for
+    nodes without a location)."""
+    import numpy as np
+
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(self.data["latitude"])
+    dlat = lat2 - lat1
+    dlon = np.radians(self.data["longitude"] - longitude)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+  def nodes (self, mask = None):
+    """Returns the :py:class:`AdNode` objects for the rows selected by `mask` (a boolean
+    column or an array of row numbers), or for all rows."""
+    import numpy as np
+
+    nodes = self._ad.nodes
+    if mask is None:
+      return list(nodes)
+    mask = np.asarray(mask)
+    rows = np.flatnonzero(mask) if mask.dtype == bool else mask
+    return [nodes[int(idx)] for idx in rows]
+
+
+class NodeIndex(object):
+  """Inverted indexes over the nodes in an advertisement, mapping each hardware type,
+  sliver type, image, component manager and availability/exclusive/shared flag to the
+  rows (positions in `Advertisement.nodes`) of the nodes that have it.
+
+  Normally used through :py:meth:`Advertisement.find`."""
+
+  def __init__ (self, ad):
+    self._ad = ad
+    self.count = 0
+    self.hardware_types = {}
+    self.sliver_types = {}
+    self.images = {}
+    self.sliver_images = {}
+    self.component_managers = {}
+    self.available = {True : set(), False : set()}
+    self.exclusive = {True : set(), False : set()}
+    self.shared = {True : set(), False : set()}
+
+    for (idx, elem) in enumerate(ad.nodes._data):
+      self.count += 1
+      self.component_managers.setdefault(elem.get("component_manager_id"), set()).add(idx)
+      self.exclusive[elem.get("exclusive") != "false"].add(idx)
+      node = _NodeChildren(elem)
+      for (stype, images) in node.sliver_types:
+        self.sliver_types.setdefault(stype, set()).add(idx)
+        for (name, _) in images:
+          self.images.setdefault(name, set()).add(idx)
+          self.sliver_images.setdefault((stype, name), set()).add(idx)
+      for (name, _) in node.hardware_types:
+        self.hardware_types.setdefault(name, set()).add(idx)
+      self.available[bool(node.available)].add(idx)
+      self.shared[node.shared].add(idx)
+
+  def rows (self, hardware_type = None, sliver_type = None, image = None, component_manager_id = None,
+            available = None, exclusive = None, shared = None):
+    """Returns the sorted rows of the nodes matching all of the given criteria (see
+    :py:meth:`Advertisement.find`)."""
+    if isinstance(image, Image):
+      image = image.name
+
+    sets = []
+    if hardware_type is not None:
+      sets.append(self.hardware_types.get(hardware_type, ()))
+    if image is not None and sliver_type is not None:
+      sets.append(self.sliver_images.get((sliver_type, image), ()))
+    elif image is not None:
+      sets.append(self.images.get(image, ()))
+    elif sliver_type is not None:
+      sets.append(self.sliver_types.get(sliver_type, ()))
+    if component_manager_id is not None:
+      sets.append(self.component_managers.get(component_manager_id, ()))
+    for (index, value) in ((self.available, available), (self.exclusive, exclusive), (self.shared, shared)):
+      if value is not None:
+        sets.append(index[bool(value)])
+
+    if not sets:
+      return list(range(self.count))
+    sets.sort(key = len)
+    rows = set(sets[0])
+    for other in sets[1:]:
+      if not rows:
+        break
+      rows.intersection_update(other)
+    return sorted(rows)
+
+
+_SLIVER_TYPE = "{%s}sliver_type" % (GNS.REQUEST.name)
+_DISK_IMAGE = "{%s}disk_image" % (GNS.REQUEST.name)
+_HARDWARE_TYPE = "{%s}hardware_type" % (GNS.REQUEST.name)
+_INTERFACE = "{%s}interface" % (GNS.REQUEST.name)
+_AVAILABLE = "{%s}available" % (GNS.REQUEST.name)
+_LOCATION = "{%s}location" % (GNS.REQUEST.name)
+_NODE_TYPE = "{%s}node_type" % (PGNS.EMULAB.name)
+_FD = "{%s}fd" % (PGNS.EMULAB.name)
+
+def _slots (value):
+  if value == "unlimited":
+    return float("inf")
+  try:
+    return float(value)
+  except (TypeError, ValueError):
+    return float("nan")
+
+
+class _NodeChildren(object):
+  """The children of a node element, read in a single pass without building an
+  :py:class:`AdNode`.  Summaries over many nodes (:py:class:`NodeTable`,
+  :py:class:`NodeIndex`, the image catalog and the topology graph) are built from this,
+  and follow the same rules as the `AdNode` fields of the same names.
+
+  Attributes:
+    hardware_types (list): `(name, type_slots)` for each hardware type with a node type
+    sliver_types (list): `(name, images)` for each sliver type, where `images` is a list of
+      `(image_name, disk_image element)`
+    interfaces (list): Interface elements
+    available (bool): Availability now, or `None` if not advertised
+    shared (bool): The node is shared
+    cpu (int): CPU weight, or `None`
+    ram (int): RAM weight, or `None`
+    location: Location element, or `None`
+  """
+
+  __slots__ = ["hardware_types", "sliver_types", "interfaces", "available", "shared", "cpu", "ram",
+               "location"]
+
+  def __init__ (self, elem):
+    self.hardware_types = []
+    self.sliver_types = []
+    self.interfaces = []
+    self.available = None
+    self.shared = False
+    self.cpu = None
+    self.ram = None
+    self.location = None
+
+    for child in elem:
+      tag = child.tag
+      if tag == _SLIVER_TYPE:
+        images = []
+        for im in child.iterchildren(_DISK_IMAGE):
+          name = im.get("name")
+          images.append((im.get("url") if name is None else name, im))
+        self.sliver_types.append((child.get("name"), images))
+      elif tag == _HARDWARE_TYPE:
+        for nt in child.iterchildren(_NODE_TYPE):
+          self.hardware_types.append((child.get("name"), nt.get("type_slots")))
+          break
+      elif tag == _INTERFACE:
+        self.interfaces.append(child)
+      elif tag == _AVAILABLE:
+        if self.available is None:
+          self.available = child.get("now") == "true"
+      elif tag == _FD:
+        name = child.get("name")
+        if name == "pcshared":
+          self.shared = True
+        elif name == "cpu":
+          self.cpu = int(child.get("weight"))
+        elif name == "ram":
+          self.ram = int(child.get("weight"))
+      elif tag == _LOCATION:
+        if self.location is None:
+          self.location = child
+
+
 class Advertisement(object):
   """Wrapper object for a GENIv3 XML advertisement.
 
@@ -249,19 +583,21 @@ class Advertisement(object):
 
   Args:
     path (str, unicode): Path to XML file on disk containing an advertisement
-    xml (str, unicode): In-memory XML byte stream containing an advertisement
+    xml (str, unicode, bytes): In-memory XML document containing an advertisement
   """
 
   def __init__ (self, path = None, xml = None):
     if path:
       self._root = ET.parse(open(path, "rb"))
     elif xml:
-      if six.PY3:
-        self._root = ET.fromstring(bytes(xml, "utf-8"))
-      else:
-        self._root = ET.fromstring(xml)
+      if isinstance(xml, six.text_type):
+        xml = xml.encode("utf-8")
+      self._root = ET.fromstring(xml)
     self._routable_addresses = None
     self._images = set()
+    self._node_table = None
+    self._node_index = None
+    self._topology = None
 
   def _parse_routable (self):
     try:
@@ -280,17 +616,62 @@ class Advertisement(object):
       self._parse_routable()
     return self._routable_addresses
 
-  @property
+  @xrangeproperty
   def nodes (self):
     """An indexable iterator over the AdNode objects in this advertisement."""
     return XPathXRange(self._root.findall("{%s}node" % (GNS.REQUEST.name)), AdNode)
 
   @property
+  def node_table (self):
+    """A :py:class:`NodeTable` with the nodes of this advertisement, built on first use.
+    Requires NumPy."""
+    if self._node_table is None:
+      self._node_table = NodeTable(self)
+    return self._node_table
+
+  def find (self, hardware_type = None, sliver_type = None, image = None, component_manager_id = None,
+            available = None, exclusive = None, shared = None):
+    """Find the nodes in this advertisement that match all of the given criteria.  Criteria
+    left as `None` are ignored.
+
+    The first call builds a :py:class:`NodeIndex` over every node in the advertisement, so
+    later queries only touch the nodes they return.
+
+    Args:
+      hardware_type (str): Hardware type name (only types with a `node_type`, as in
+        `AdNode.hardware_types`)
+      sliver_type (str): Supported sliver type
+      image (str, :py:class:`Image`): Supported image name.  If `sliver_type` is also given
+        the image must be listed for that sliver type.
+      component_manager_id (str): Component manager URN
+      available (bool): Current availability
+      exclusive (bool): Whether the node can be reserved as a raw PC
+      shared (bool): Whether the node is currently in use as a shared host
+
+    Returns:
+      list: :py:class:`AdNode` objects, in advertisement order
+    """
+    if self._node_index is None:
+      self._node_index = NodeIndex(self)
+    nodes = self.nodes
+    return [nodes[idx] for idx in self._node_index.rows(hardware_type, sliver_type, image,
+                                                        component_manager_id, available, exclusive, shared)]
+
+  @property
+  def topology (self):
+    """A :py:class:`geni.model.topology.Topology` graph of the nodes and links in this
+    advertisement, built on first use."""
+    if self._topology is None:
+      from ..model.topology import Topology
+      self._topology = Topology(self)
+    return self._topology
+
+  @xrangeproperty
   def links (self):
     """An indexable iterator over the AdLink objects in this advertisement."""
     return XPathXRange(self._root.findall("{%s}link" % (GNS.REQUEST.name)), AdLink)
 
-  @property
+  @xrangeproperty
   def shared_vlans (self):
     """An indexable iterator of the shared vlan names found in this advertisement."""
     return XPathXRange(self._root.xpath('/g:rspec/s:rspec_shared_vlan/s:available', namespaces=_XPNS), AdSharedVLAN)
@@ -326,3 +707,94 @@ class Advertisement(object):
     f = open(path, "w+")
     f.write(ET.tostring(self._root, pretty_print=True))
     f.close()
+
+
+_NODE = "{%s}node" % (GNS.REQUEST.name)
+_LINK = "{%s}link" % (GNS.REQUEST.name)
+_SHARED_VLAN = "{%s}rspec_shared_vlan" % (GNS.SVLAN.name)
+_SHARED_VLAN_AVAILABLE = "{%s}available" % (GNS.SVLAN.name)
+
+def iterAdvertisement (path = None, xml = None, nodes = True, links = True, shared_vlans = True):
+  """Iterate over the nodes, links and shared vlans in a GENIv3 advertisement without
+  loading the whole document.
+
+  Objects are yielded in document order as soon as their element has been parsed, and
+  every top-level element is discarded once it has been handled, so memory use doesn't
+  grow with the size of the advertisement.  Stop iterating as soon as you have found what
+  you need and the rest of the document is never read.
+
+  Each yielded object keeps its own element (detached from the document), so it still
+  decodes its fields lazily and has a `text`, and objects that are kept hold on to the
+  XML for just their own node or link.
+
+  Only one of `path` or `xml` can be supplied (if both are provided `path` will be used)
+
+  Args:
+    path (str, unicode): Path to XML file on disk containing an advertisement
+    xml (str, unicode, bytes): In-memory XML document containing an advertisement
+    nodes (bool): Yield :py:class:`AdNode` objects
+    links (bool): Yield :py:class:`AdLink` objects
+    shared_vlans (bool): Yield :py:class:`AdSharedVLAN` objects
+
+  Returns:
+    An iterator of :py:class:`AdNode`, :py:class:`AdLink` and :py:class:`AdSharedVLAN`
+    objects.
+  """
+
+  wanted = set()
+  if nodes:
+    wanted.add(_NODE)
+  if links:
+    wanted.add(_LINK)
+  if shared_vlans:
+    wanted.add(_SHARED_VLAN)
+
+  for elem in _iterElements(path, xml, wanted):
+    tag = elem.tag
+    if tag == _NODE:
+      yield AdNode._fromdom(elem)
+    elif tag == _LINK:
+      yield AdLink._fromdom(elem)
+    else:
+      for avail in elem.iterchildren(_SHARED_VLAN_AVAILABLE):
+        yield AdSharedVLAN._fromdom(avail)
+
+def _iterElements (path, xml, wanted):
+  """Yields the top-level elements of a document whose tags are in `wanted`, as soon as
+  each has been parsed.  Each is removed from the document when the next one is
+  requested, and is freed then unless the caller still refers to it."""
+
+  if path:
+    source = open(path, "rb")
+  else:
+    if isinstance(xml, six.text_type):
+      xml = xml.encode("utf-8")
+    source = io.BytesIO(xml)
+
+  depth = 0
+  try:
+    for (event, elem) in ET.iterparse(source, events = ("start", "end")):
+      if event == "start":
+        depth += 1
+        continue
+
+      depth -= 1
+      if depth != 1:
+        continue
+
+      # Free everything before this element.  Earlier siblings have no proxies left, so
+      # deleting them frees them outright.
+      parent = elem.getparent()
+      while elem.getprevious() is not None:
+        del parent[0]
+
+      if elem.tag in wanted:
+        yield elem
+        # Unlinking the element (rather than clearing it) leaves its subtree intact for
+        # any object that still refers to it; lxml frees it when the last one goes.
+        parent.remove(elem)
+      else:
+        elem.clear()
+  finally:
+    if path:
+      source.close()
@@ -14,7 +14,7 @@ import six
 from .pg import Link
 from .. import namespaces as GNS
 from .pg import Namespaces as PGNS
-from ..model.util import XPathXRange
+from ..model.util import XPathXRange, xrangeproperty
 
 _XPNS = {'g' : GNS.REQUEST.name, 's' : GNS.SVLAN.name, 'e' : PGNS.EMULAB.name,
          'i' : PGNS.INFO.name, 'p' : PGNS.PARAMS.name, 'u' : GNS.USER.name}
@@ -205,10 +205,9 @@ class Manifest(object):
     if path:
       self._xml = open(path, "r").read()
     elif xml:
-      if six.PY3:
-        self._xml = bytes(xml, "utf-8")
-      else:
-        self._xml = xml
+      if isinstance(xml, six.text_type):
+        xml = xml.encode("utf-8")
+      self._xml = xml
     self._root = ET.fromstring(self._xml)
     self._pid = os.getpid()
 
@@ -235,13 +234,13 @@ class Manifest(object):
   def expiresstr (self):
     return self._root.get("expires")
 
-  @property
+  @xrangeproperty
   def links (self):
     llist = self.root.findall("{%s}link" % (GNS.REQUEST))
     llist.extend(self.root.findall("{%s}link" % (Manifest.REQUESTV2)))
     return XPathXRange(llist, ManifestLink)
 
-  @property
+  @xrangeproperty
   def nodes (self):
     nlist = self.root.findall("{%s}node" % (GNS.REQUEST))
     nlist.extend(self.root.findall("{%s}node" % (Manifest.REQUESTV2)))
@@ -0,0 +1,579 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# Loads request RSpecs back into pg.Request objects (see pg.Request.fromXML), mapping
+# each element to the pg, igext and emuext objects that write it, and keeping anything
+# that can't be reproduced exactly as a pg.RawResource
+
+
+
+import copy
+import io
+import re
+
+from lxml import etree as ET
+import six
+
+import geni.namespaces as GNS
+from . import pg
+from . import igext as IG
+from .emulab import emuext as EE
+from .pg import Namespaces as PGNS
+
+class InvalidRequestError(Exception):
+  def __init__ (self, tag, rtype):
+    super(InvalidRequestError, self).__init__()
+    self.tag = tag
+    self.rtype = rtype
+  def __str__ (self):
+    return "Document is not a request rspec (root element %s, type %s)" % (self.tag, self.rtype)
+
+
+class _Unmapped(Exception):
+  """Raised while mapping an element that the object model can't reproduce."""
+
+
+def _q (ns, name):
+  return "{%s}%s" % (ns.name, name)
+
+_NODE = _q(GNS.REQUEST, "node")
+_LINK = _q(GNS.REQUEST, "link")
+_SLIVER_TYPE = _q(GNS.REQUEST, "sliver_type")
+_DISK_IMAGE = _q(GNS.REQUEST, "disk_image")
+_HARDWARE_TYPE = _q(GNS.REQUEST, "hardware_type")
+_INTERFACE = _q(GNS.REQUEST, "interface")
+_IP = _q(GNS.REQUEST, "ip")
+_SERVICES = _q(GNS.REQUEST, "services")
+_INSTALL = _q(GNS.REQUEST, "install")
+_EXECUTE = _q(GNS.REQUEST, "execute")
+_INTERFACE_REF = _q(GNS.REQUEST, "interface_ref")
+_LINK_TYPE = _q(GNS.REQUEST, "link_type")
+_PROPERTY = _q(GNS.REQUEST, "property")
+_EXCEPTION = _q(GNS.REQUEST, "exception")
+_COMPONENT_MANAGER = _q(GNS.REQUEST, "component_manager")
+_ROUTABLE_CONTROL_IP = _q(PGNS.EMULAB, "routable_control_ip")
+_XEN = _q(PGNS.EMULAB, "xen")
+_XEN_PTYPE = _q(PGNS.EMULAB, "xen_ptype")
+_DOCKER = _q(PGNS.EMULAB, "docker")
+_DOCKER_PTYPE = _q(PGNS.EMULAB, "docker_ptype")
+_LINK_ATTRIBUTE = _q(PGNS.VTOP, "link_attribute")
+_VLAN_TAGGING = _q(PGNS.EMULAB, "vlan_tagging")
+_BEST_EFFORT = _q(PGNS.EMULAB, "best_effort")
+_LINK_MULTIPLEXING = _q(PGNS.EMULAB, "link_multiplexing")
+_TRIVIAL_OK = _q(PGNS.EMULAB, "trivial_ok")
+_TOUR = _q(PGNS.TOUR, "rspec_tour")
+_TOUR_DESCRIPTION = _q(PGNS.TOUR, "description")
+_TOUR_INSTRUCTIONS = _q(PGNS.TOUR, "instructions")
+_TOUR_STEPS = _q(PGNS.TOUR, "steps")
+_TOUR_STEP = _q(PGNS.TOUR, "step")
+
+_NODECLASSES = {
+  pg.NodeType.RAW : pg.RawPC,
+  "emulab-xen" : IG.XenVM,
+  "emulab-docker" : IG.DockerContainer,
+  "emulab-openvz" : pg.VZContainer,
+}
+
+_LINKCLASSES = {
+  "lan" : pg.LAN,
+  "gre-tunnel" : pg.L3GRE,
+  "egre-tunnel" : pg.L2GRE,
+}
+
+_NUMBER = re.compile(r"^-?[0-9]+(\.[0-9]+)?$")
+
+def _value (text):
+  """Converts numeric attribute values back to numbers, as long as the number is written
+  out the same way again."""
+  if text is None or not _NUMBER.match(text):
+    return text
+  val = float(text) if "." in text else int(text)
+  return val if str(val) == text else text
+
+def _bool (text, true = "true", false = "false"):
+  if text == true:
+    return True
+  if text == false:
+    return False
+  raise _Unmapped()
+
+def _checkattrs (elem, *names):
+  """Raise _Unmapped if `elem` has attributes other than `names`."""
+  for key in elem.keys():
+    if key not in names:
+      raise _Unmapped()
+
+def _only (elem, *names):
+  """Raise _Unmapped if `elem` has attributes other than `names` or any children."""
+  if len(elem):
+    raise _Unmapped()
+  _checkattrs(elem, *names)
+
+
+# Extensions that can be recreated from their element.  Each entry maps a tag to a
+# function returning the extension object, and is only used for tags that were written
+# as a direct child of the matching parent.
+
+def _blockstore (elem):
+  _only(elem, "name", "mountpoint", "class", "size", "placement", "readonly", "rwclone",
+        "dataset")
+  bs = IG.Blockstore(elem.get("name"), elem.get("mountpoint"))
+  bs.where = elem.get("class")
+  if elem.get("size") is not None:
+    bs.size = elem.get("size")
+  bs.placement = elem.get("placement")
+  bs.readonly = elem.get("readonly") == "true"
+  bs.rwclone = elem.get("rwclone") == "true"
+  bs.dataset = elem.get("dataset")
+  return bs
+
+def _firewall (elem):
+  _checkattrs(elem, "style")
+  fw = IG.Firewall(elem.get("style"))
+  for exc in elem:
+    # Exceptions are written without a namespace, so they are read back in the default one
+    if exc.tag != _EXCEPTION:
+      raise _Unmapped()
+    _only(exc, "port", "direction", "ip")
+    fw.addException(_value(exc.get("port")), exc.get("direction"), exc.get("ip"))
+  return fw
+
+def _desire (elem):
+  _only(elem, "name", "weight")
+  return IG.Desire(elem.get("name"), _value(elem.get("weight")))
+
+def _linkproperties (elem):
+  _only(elem, "capacity", "latency", "packet_loss")
+  return EE.setProperties(bandwidth = _value(elem.get("capacity")),
+                          latency = _value(elem.get("latency")),
+                          plr = _value(elem.get("packet_loss")))
+
+def _sharedvlan (elem):
+  if elem.get("placeholder") == "true":
+    _only(elem, "placeholder")
+    return EE.enableSharedVlan()
+  _only(elem, "name")
+  return EE.connectSharedVlan(elem.get("name"))
+
+def _flag (klass, attr = "enabled", value = "true"):
+  def build (elem):
+    _only(elem, attr)
+    if elem.get(attr) != value:
+      raise _Unmapped()
+    return klass()
+  return build
+
+def _attr (klass, *attrs):
+  """Builds `klass` from the values of `attrs`, which its writer sets as given."""
+  def build (elem):
+    _only(elem, *attrs)
+    return klass(*[elem.get(attr) for attr in attrs])
+  return build
+
+def _numattr (klass, *attrs):
+  """Like `_attr`, for writers that convert values with str()."""
+  def build (elem):
+    _only(elem, *attrs)
+    return klass(*[_value(elem.get(attr)) for attr in attrs])
+  return build
+
+_SITE = (_q(PGNS.JACKS, "site"), _attr(IG.Site, "id"))
+
+_NODE_EXTENSIONS = dict([
+  _SITE,
+  (_q(PGNS.EMULAB, "fd"), _desire),
+  (_q(PGNS.EMULAB, "blockstore"), _blockstore),
+  (_q(PGNS.EMULAB, "use_type_default_image"), _flag(EE.setUseTypeDefaultImage)),
+  (_q(PGNS.EMULAB, "failure_action"), _attr(EE.setFailureAction, "action")),
+  (_q(PGNS.EMULAB, "node_attribute"), _attr(EE.Attribute, "key", "value")),
+])
+
+_VM_EXTENSIONS = dict(_NODE_EXTENSIONS)
+_VM_EXTENSIONS[_q(PGNS.EMULAB, "firewall")] = _firewall
+
+_LINK_EXTENSIONS = dict([
+  _SITE,
+  (_q(PGNS.EMULAB, "force_shaping"), _flag(EE.setForceShaping)),
+  (_q(PGNS.EMULAB, "force_nobwshaping"), _flag(EE.setNoBandwidthShaping)),
+  (_q(PGNS.EMULAB, "interswitch"), _flag(EE.setNoInterSwitchLinks, "allow", "false")),
+  (_q(PGNS.EMULAB, "jumboframes"), _flag(EE.setJumboFrames)),
+  (_q(GNS.SVLAN, "create_shared_vlan"), _attr(EE.createSharedVlan, "name")),
+  (_q(GNS.SVLAN, "link_shared_vlan"), _sharedvlan),
+  (_q(PGNS.EMULAB, "properties"), _linkproperties),
+])
+
+_REQUEST_EXTENSIONS = dict([
+  (_q(PGNS.EMULAB, "collocate_factor"), _numattr(EE.setCollocateFactor, "count")),
+  (_q(PGNS.EMULAB, "packing_strategy"), _attr(EE.setPackingStrategy, "strategy")),
+  (_q(PGNS.EMULAB, "routing_style"), _attr(EE.setRoutingStyle, "style")),
+  (_q(PGNS.EMULAB, "delay_image"), _attr(EE.setDelayImage, "urn")),
+])
+
+def _tour (elem):
+  _checkattrs(elem)
+  tour = IG.Tour()
+  for child in elem:
+    tag = child.tag
+    if tag in (_TOUR_DESCRIPTION, _TOUR_INSTRUCTIONS):
+      _only(child, "type")
+      if child.get("type") is None:
+        raise _Unmapped()
+      if tag == _TOUR_DESCRIPTION:
+        tour.Description(child.get("type"), child.text)
+      else:
+        tour.Instructions(child.get("type"), child.text)
+    elif tag == _TOUR_STEPS:
+      _checkattrs(child)
+      for step in child:
+        _checkattrs(step, "point_type", "point_id")
+        desc = list(step)
+        if (step.tag != _TOUR_STEP or step.get("point_type") is None or step.get("point_id") is None
+            or len(desc) != 1 or desc[0].tag != _TOUR_DESCRIPTION):
+          raise _Unmapped()
+        _only(desc[0], "type")
+        if desc[0].get("type") is None:
+          raise _Unmapped()
+        tour.addStep(IG.Tour.Step(step.get("point_id"), desc[0].text, step.get("point_type"),
+                                  desc[0].get("type")))
+    else:
+      raise _Unmapped()
+  return tour
+
+def _addchild (parent, obj):
+  if not parent._ext_children:
+    parent._ext_children = []
+  parent._ext_children.append(obj)
+
+
+class _Loader(object):
+  def __init__ (self, root):
+    if root.tag != _q(GNS.REQUEST, "rspec") or root.get("type") != "request":
+      raise InvalidRequestError(root.tag, root.get("type"))
+
+    req = pg.Request()
+    for (prefix, uri) in root.nsmap.items():
+      if prefix is not None:
+        req.addNamespace(GNS.Namespace(prefix, uri))
+    loc = root.get("{%s}schemaLocation" % (GNS.XSNS.name))
+    req._loclist = loc.split() if loc else []
+
+    self.request = req
+    # Each top-level object is written into a copy of the root as it is loaded, to check
+    # that it comes out exactly like the element it was loaded from.  Auto-generated
+    # namespace prefixes are numbered across the document, so the copy's prefix counter
+    # is kept in step with the number of prefixes declared so far.
+    self.nsmap = root.nsmap
+    self.prefixes = 0
+    self.scratch = ET.Element(root.tag, nsmap = self.nsmap)
+    # Links can refer to interfaces on nodes that come later in the document
+    self.unresolved = []
+    self._first = True
+
+  def add (self, elem):
+    source = ET.tostring(elem, with_tail = False)
+    count = len(pg._AUTOPREFIX_B.findall(source))
+
+    obj = None
+    try:
+      if elem.tag == _NODE:
+        obj = self._node(elem)
+      elif elem.tag == _LINK:
+        obj = self._link(elem)
+      elif elem.tag == _TOUR and self._first:
+        # The tour is always written before everything else, so it can only be mapped
+        # back when it came first
+        obj = _tour(elem)
+      elif elem.tag in _REQUEST_EXTENSIONS:
+        obj = _REQUEST_EXTENSIONS[elem.tag](elem)
+    except _Unmapped:
+      obj = None
+
+    if obj is not None:
+      obj._write(self.scratch)
+      if len(self.scratch) == 1:
+        written = ET.tostring(self.scratch[0], with_tail = False)
+      else:
+        written = None
+      del self.scratch[:]
+
+      if written != source or not self._register(obj):
+        obj = None
+        # The rejected object may have used a different number of prefixes
+        self.scratch = ET.Element(self.scratch.tag, nsmap = self.nsmap)
+        pg._burnprefixes(self.scratch, self.prefixes + count)
+    else:
+      pg._burnprefixes(self.scratch, count)
+
+    self.prefixes += count
+    self._first = False
+    if obj is None:
+      obj = pg.RawResource(copy.deepcopy(elem))
+    elif isinstance(obj, IG.Tour):
+      self.request.tour = obj
+      return
+    elif isinstance(obj, pg.Link):
+      self._trackRefs(obj)
+
+    self.request._ext_children.append(obj)
+
+  def finish (self):
+    for (link, idx) in self.unresolved:
+      placeholder = link.interfaces[idx]
+      intf = self.request._clientids.get(placeholder.client_id)
+      if isinstance(intf, pg.Interface):
+        for attr in ("bandwidth", "latency", "plr"):
+          if getattr(placeholder, attr) is not None:
+            setattr(intf, attr, getattr(placeholder, attr))
+        link.interfaces[idx] = intf
+    return self.request
+
+  def _register (self, obj):
+    # Adding checks every name against the request's index before indexing any of them
+    try:
+      self.request._adopt(obj)
+    except pg.DuplicateClientIDError:
+      return False
+    return True
+
+  def _trackRefs (self, link):
+    for (idx, intf) in enumerate(link.interfaces):
+      if intf.node is None:
+        self.unresolved.append((link, idx))
+
+  def _node (self, elem):
+    # pylint: disable=too-many-branches
+    _checkattrs(elem, "client_id", "exclusive", "component_id", "component_manager_id")
+    sliver = elem.find(_SLIVER_TYPE)
+    if sliver is None:
+      raise _Unmapped()
+    _checkattrs(sliver, "name")
+
+    stype = sliver.get("name")
+    klass = _NODECLASSES.get(stype)
+    if klass is None:
+      node = pg.Node(elem.get("client_id"), stype)
+    else:
+      node = klass(elem.get("client_id"))
+    exclusive = elem.get("exclusive")
+    node.exclusive = None if exclusive is None else _bool(exclusive)
+    node.component_id = elem.get("component_id")
+    node.component_manager_id = elem.get("component_manager_id")
+
+    if isinstance(node, (IG.XenVM, IG.DockerContainer)):
+      extensions = _VM_EXTENSIONS
+    else:
+      extensions = _NODE_EXTENSIONS
+
+    raw = False
+    for child in elem:
+      tag = child.tag
+      if raw:
+        node.addRawElement(copy.deepcopy(child))
+      elif tag == _SLIVER_TYPE:
+        self._sliver(node, child)
+      elif tag == _HARDWARE_TYPE:
+        _only(child, "name")
+        node.hardware_type = child.get("name")
+      elif tag == _INTERFACE:
+        self._interface(node, child)
+      elif tag == _SERVICES:
+        _checkattrs(child)
+        for svc in child:
+          if svc.tag == _INSTALL:
+            _only(svc, "url", "install_path")
+            node.addService(pg.Install(svc.get("url"), svc.get("install_path")))
+          elif svc.tag == _EXECUTE:
+            _only(svc, "shell", "command")
+            node.addService(pg.Execute(svc.get("shell"), svc.get("command")))
+          else:
+            raise _Unmapped()
+      elif tag == _ROUTABLE_CONTROL_IP:
+        _only(child)
+        node.routable_control_ip = True
+      elif tag in extensions:
+        _addchild(node, extensions[tag](child))
+      else:
+        # Raw elements are written after all extensions, so everything from here on
+        # has to be raw to keep the same order.
+        raw = True
+        node.addRawElement(copy.deepcopy(child))
+    return node
+
+  def _sliver (self, node, sliver):
+    for child in sliver:
+      tag = child.tag
+      if tag == _DISK_IMAGE:
+        _only(child, "name")
+        node.disk_image = child.get("name")
+      elif tag == _XEN and isinstance(node, IG.XenVM):
+        _only(child, "cores", "ram", "disk")
+        node.cores = _value(child.get("cores"))
+        node.ram = _value(child.get("ram"))
+        node.disk = _value(child.get("disk"))
+      elif tag == _XEN_PTYPE and isinstance(node, IG.XenVM):
+        _only(child, "name")
+        node.xen_ptype = child.get("name")
+      elif tag == _DOCKER and isinstance(node, IG.DockerContainer):
+        _only(child, "cores", "ram", "extimage", "dockerfile", "tbaugmentation",
+              "tbaugmentation_update", "ssh_style", "exec_shell", "entrypoint", "cmd", "env",
+              "privileged")
+        node.cores = _value(child.get("cores"))
+        node.ram = _value(child.get("ram"))
+        node.docker_extimage = child.get("extimage")
+        node.docker_dockerfile = child.get("dockerfile")
+        node.docker_tbaugmentation = child.get("tbaugmentation")
+        node.docker_tbaugmentation_update = _bool(child.get("tbaugmentation_update"), "1", "0")
+        node.docker_ssh_style = child.get("ssh_style")
+        node.docker_exec_shell = child.get("exec_shell")
+        node.docker_entrypoint = child.get("entrypoint")
+        node.docker_cmd = child.get("cmd")
+        node.docker_env = child.get("env")
+        node.docker_privileged = _bool(child.get("privileged"), "True", "False")
+      elif tag == _DOCKER_PTYPE and isinstance(node, IG.DockerContainer):
+        _only(child, "name")
+        node.docker_ptype = child.get("name")
+      else:
+        raise _Unmapped()
+
+  def _interface (self, node, elem):
+    _checkattrs(elem, "client_id", "component_id")
+    if elem.get("client_id") is None:
+      raise _Unmapped()
+    # Added directly, as addInterface() would qualify names that lack the node name.
+    # Duplicates are caught when the node is registered.
+    intf = pg.Interface(elem.get("client_id"), node)
+    node.interfaces.append(intf)
+    intf.component_id = elem.get("component_id")
+    for child in elem:
+      if child.tag != _IP or child.get("type") != "ipv4":
+        raise _Unmapped()
+      _only(child, "address", "netmask", "type")
+      intf.addAddress(pg.IPv4Address(child.get("address"), child.get("netmask")))
+
+  def _link (self, elem):
+    # pylint: disable=too-many-branches
+    _checkattrs(elem, "client_id", "protocol", "vlantag")
+    ltype = elem.find(_LINK_TYPE)
+    ltype = "" if ltype is None else ltype.get("name")
+    klass = _LINKCLASSES.get(ltype)
+    if klass is None:
+      link = pg.Link(elem.get("client_id"), ltype)
+    else:
+      link = klass(elem.get("client_id"))
+    link.protocol = elem.get("protocol")
+    if elem.get("vlantag") is not None:
+      _addchild(link, EE.setVlanTag(_value(elem.get("vlantag"))))
+
+    props = []
+    for child in elem:
+      tag = child.tag
+      if tag == _INTERFACE_REF:
+        _only(child, "client_id")
+        intf = self.request._clientids.get(child.get("client_id"))
+        if not isinstance(intf, pg.Interface):
+          intf = pg.Interface(child.get("client_id"), None)
+        link.addInterface(intf)
+      elif tag == _LINK_TYPE:
+        _only(child, "name")
+      elif tag == _LINK_ATTRIBUTE:
+        _only(child, "key", "value")
+        if child.get("key") != "nomac_learning":
+          raise _Unmapped()
+        link._mac_learning = False
+      elif tag == _VLAN_TAGGING:
+        _only(child, "enabled")
+        link._vlan_tagging = _bool(child.get("enabled"))
+      elif tag == _BEST_EFFORT:
+        _only(child, "enabled")
+        link._best_effort = True
+      elif tag == _LINK_MULTIPLEXING:
+        _only(child, "enabled")
+        link._link_multiplexing = True
+      elif tag == _TRIVIAL_OK:
+        _only(child, "enabled")
+        link._trivial_ok = _bool(child.get("enabled"))
+      elif tag == _PROPERTY:
+        _only(child, "source_id", "dest_id", "capacity", "latency", "packet_loss")
+        props.append(child)
+      elif tag == _COMPONENT_MANAGER:
+        _only(child, "name")
+        link.addComponentManager(child.get("name"))
+      elif tag in _LINK_EXTENSIONS and not link._raw_elements:
+        _addchild(link, _LINK_EXTENSIONS[tag](child))
+      else:
+        link.addRawElement(copy.deepcopy(child))
+
+    if props:
+      self._shaping(link, props)
+    return link
+
+  def _shaping (self, link, props):
+    # Pairwise properties carry the shaping of their destination interface; LAN-style
+    # properties (with the link as the destination) carry that of their source, and are
+    # only written by non-LAN links with compact_shaping set.
+    lanstyle = all([prop.get("dest_id") == link.client_id for prop in props])
+    if link.type != "lan" and lanstyle:
+      link.compact_shaping = True
+
+    shaping = {}
+    for prop in props:
+      key = prop.get("source_id") if lanstyle else prop.get("dest_id")
+      shaping[key] = (_value(prop.get("capacity")), _value(prop.get("latency")),
+                      _value(prop.get("packet_loss")))
+
+    intfs = dict([(intf.client_id, intf) for intf in link.interfaces])
+    if set(shaping) - set(intfs):
+      raise _Unmapped()
+
+    values = set(shaping.values())
+    if len(values) == 1 and len(shaping) == len(intfs):
+      (link.bandwidth, link.latency, link.plr) = _defaults(values.pop())
+    else:
+      for (cid, (bw, lat, plr)) in shaping.items():
+        intf = intfs[cid]
+        (intf.bandwidth, intf.latency, intf.plr) = (bw, lat, plr)
+
+
+def _defaults (shaping):
+  (bw, lat, plr) = shaping
+  return (pg.Link.DEFAULT_BW if bw is None else bw,
+          pg.Link.DEFAULT_LAT if lat is None else lat,
+          pg.Link.DEFAULT_PLR if plr is None else plr)
+
+
+def load (path = None, xml = None):
+  """Loads a request rspec.  See `pg.Request.fromXML`."""
+
+  if path:
+    source = open(path, "rb")
+  else:
+    if isinstance(xml, six.text_type):
+      xml = xml.encode("utf-8")
+    source = io.BytesIO(xml)
+
+  loader = None
+  depth = 0
+  try:
+    for (event, elem) in ET.iterparse(source, events = ("start", "end"), remove_blank_text = True):
+      if event == "start":
+        depth += 1
+        if depth == 1:
+          loader = _Loader(elem)
+        continue
+
+      depth -= 1
+      if depth == 1 and isinstance(elem.tag, six.string_types):
+        loader.add(elem)
+        # Drop everything that has been loaded so far, to keep memory use flat
+        elem.clear()
+        parent = elem.getparent()
+        while elem.getprevious() is not None:
+          del parent[0]
+  finally:
+    if path:
+      source.close()
+
+  return loader.finish()
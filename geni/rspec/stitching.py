@@ -12,7 +12,7 @@ from lxml import etree as ET
 
 from . import pg
 from .. import namespaces
-from ..model.util import XPathXRange
+from ..model.util import XPathXRange, xrangeproperty
 
 STITCHNS = namespaces.Namespace("stitch", "http://hpn.east.isi.edu/rspec/ext/stitch/0.1/")
 
@@ -163,7 +163,7 @@ class AggInfo(object):
     t = self._root.xpath("t:negotiatedservices", namespaces=_XPNS)[0].text
     return coerceBool(t)
 
-  @property
+  @xrangeproperty
   def nodes (self):
     n = self._root.xpath("t:node", namespaces=_XPNS)
     return XPathXRange(n, AggNode)
@@ -174,7 +174,7 @@ class AggNode(object):
     self.id = None
     self._root = None
 
-  @property
+  @xrangeproperty
   def ports (self):
     p = self._root.xpath("t:port", namespaces=_XPNS)
     return XPathXRange(p, AggPort)
@@ -193,7 +193,7 @@ class AggPort(object):
     self.capacity = 0
     self._root = None
 
-  @property
+  @xrangeproperty
   def links (self):
     l = self._root.xpath("t:link", namespaces=_XPNS)
     return XPathXRange(l, AggLink)
@@ -15,7 +15,7 @@ from lxml import etree as ET
 
 import geni.rspec
 import geni.namespaces as GNS
-from geni.rspec.pg import Resource
+from geni.rspec.pg import Resource, _Extensions, _extensible
 
 
 class Namespaces(object):
@@ -570,8 +570,9 @@ class Datapath(Resource):
 Request.EXTENSIONS.append(("Datapath", Datapath))
 
 
+@_extensible
 class Container(Resource):
-  EXTENSIONS = []
+  EXTENSIONS = _Extensions()
 
   def __init__ (self, image, name):
     super(Container, self).__init__()
@@ -581,9 +582,6 @@ class Container(Resource):
     self.ram = None
     self.routes = []
 
-    for name,ext in Container.EXTENSIONS:
-      self._wrapext(name, ext)
-
   def attachPort (self, port):
     if port.name is None:
       port.client_id = "%s:%d" % (self.name, len(self.ports))
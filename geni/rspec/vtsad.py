@@ -10,7 +10,7 @@ from lxml import etree as ET
 import six
 
 import geni.namespaces as GNS
-from geni.model.util import XPathXRange
+from geni.model.util import XPathXRange, xrangeproperty
 
 
 VTSNS = GNS.Namespace("vts", "http://geni.bssoftworks.com/rspec/ext/vts/ad/1")
@@ -83,16 +83,15 @@ class Advertisement(object):
     if path:
       self._root = ET.parse(open(path, "rb"))
     elif xml:
-      if six.PY3:
-        self._root = ET.fromstring(bytes(xml, "utf-8"))
-      else:
-        self._root = ET.fromstring(xml)
+      if isinstance(xml, six.text_type):
+        xml = xml.encode("utf-8")
+      self._root = ET.fromstring(xml)
 
-  @property
+  @xrangeproperty
   def circuit_planes (self):
     return XPathXRange(self._root.xpath("v:circuit-planes/v:circuit-plane", namespaces = _XPNS), CircuitPlane)
 
-  @property
+  @xrangeproperty
   def images (self):
     return XPathXRange(self._root.xpath("v:images/v:image", namespaces = _XPNS), Image)
 
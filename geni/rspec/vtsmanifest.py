@@ -321,10 +321,9 @@ class Manifest(object):
       self._root = ET.parse(open(path, "rb"))
       self._xml = ET.tostring(self._root)
     elif xml:
-      if six.PY3:
-        self._xml = bytes(xml, "utf-8")
-      else:
-        self._xml = xml
+      if isinstance(xml, six.text_type):
+        xml = xml.encode("utf-8")
+      self._xml = xml
       self._root = ET.fromstring(self._xml)
     self._pid = os.getpid()
     self._info = {}
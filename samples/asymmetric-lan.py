@@ -30,7 +30,7 @@ for nid,sparms in list(nodeset.items()):
     rspec.addResource(node)
     iface = node.addInterface("if1")
     for parm,val in list(sparms.items()):
-        iface.__dict__[parm] = val
+        setattr(iface, parm, val)
     lan.addInterface(iface)
 
 pc.printRequestRSpec(rspec)
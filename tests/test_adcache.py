@@ -0,0 +1,21 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import stat
+
+import geni.aggregate.adcache as AC
+import geni.rspec.cache as RC
+
+def test_put_get_mode (tmp_path, monkeypatch):
+  monkeypatch.setattr(RC, "_NEW_FILE_MODE", 0o640)
+  cache = AC.AdvertisementCache(str(tmp_path), 60)
+  urn = "urn:publicid:IDN+example.net+authority+cm"
+  cache.put(urn, True, {"code" : {"geni_code" : 0}, "value" : u"<rspec/>"})
+
+  assert cache.get(urn, True) == {"code" : {"geni_code" : 0}, "value" : b"<rspec/>"}
+  assert cache.get(urn, False) is None
+  assert stat.S_IMODE(os.stat(cache._filepath(urn, True)).st_mode) == 0o640
@@ -0,0 +1,85 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import asyncio
+import threading
+
+import pytest
+
+aio = pytest.importorskip("geni.minigcf.aio")
+
+class _FakeClient(aio.Client):
+  def __init__ (self):
+    super(_FakeClient, self).__init__()
+    self.calls = []
+
+  async def call (self, url, req_data, cert, root_bundle, rspec = False, compressed = False):
+    self.calls.append((url, req_data))
+    return {"code" : {"geni_code" : 0}, "value" : len(self.calls), "output" : ""}
+
+def _poll (url):
+  # The same call, made until the answer changes
+  seen = []
+  while len(seen) < 3:
+    seen.append(aio.AM2.getversion(url, False, "cert", "key")["value"])
+  return seen
+
+def test_repeated_calls ():
+  client = _FakeClient()
+  assert asyncio.run(client.run(_poll, "https://am.example.net/")) == [1, 2, 3]
+  assert len(client.calls) == 3
+  assert len(set(client.calls)) == 1
+
+def _cachingCaller (url, state):
+  # Skips its first call once it has the answer, as AM methods that cache do
+  if "version" not in state:
+    state["version"] = aio.AM2.getversion(url, False, "cert", "key")["value"]
+  status = aio.AM2.sliverstatus(url, False, "cert", "key", [], "urn:slice")["value"]
+  return (state["version"], status)
+
+def test_skipped_call ():
+  client = _FakeClient()
+  assert asyncio.run(client.run(_cachingCaller, "https://am.example.net/", {})) == (1, 2)
+  assert len(client.calls) == 2
+
+def test_runs_once_off_loop ():
+  runs = []
+  def func (url):
+    runs.append(threading.get_ident())
+    return aio.AM2.getversion(url, False, "cert", "key")["value"]
+
+  async def main ():
+    client = _FakeClient()
+    result = await asyncio.gather(client.run(func, "https://a.example.net/"),
+                                  client.run(func, "https://b.example.net/"))
+    return (result, client.calls)
+
+  (result, calls) = asyncio.run(main())
+  assert sorted(result) == [1, 2]
+  assert len(calls) == 2
+  assert len(runs) == 2
+  assert threading.get_ident() not in runs
+
+def test_errors_reach_caller ():
+  class Failing(_FakeClient):
+    async def call (self, *args, **kwargs):
+      raise aio.HTTPError("https://am.example.net/", 500, "Internal Server Error")
+
+  def func (url):
+    try:
+      aio.AM2.getversion(url, False, "cert", "key")
+    except aio.HTTPError as e:
+      return e.status
+
+  assert asyncio.run(Failing().run(func, "https://am.example.net/")) == 500
+
+def test_api_names ():
+  assert "getversion" in dir(aio.amapi2)
+  assert "Resolve" in dir(aio.pgch1)
+  with pytest.raises(AttributeError):
+    aio.chapi2.DATE_FMT
+  with pytest.raises(AttributeError):
+    aio.amapi2._rpcpost
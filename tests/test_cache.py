@@ -0,0 +1,51 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import stat
+
+import pytest
+
+import geni.rspec.cache as RC
+import geni.rspec.pg as PG
+
+def _request ():
+  r = PG.Request()
+  for i in range(3):
+    r.RawPC("n%d" % (i))
+  return r
+
+def test_abstract ():
+  with pytest.raises(TypeError):
+    RC.RequestCache()
+
+def test_serialize (tmp_path):
+  cache = RC.DirectoryCache(str(tmp_path))
+  (key, data, hit) = cache.serialize(_request())
+  assert not hit
+  assert cache.get(key) == data
+  assert key == _request().fingerprint()
+  assert cache.serialize(_request()) == (key, data, True)
+  assert cache.serialize(_request(), pretty_print = True) == (key, data, True)
+
+  other = _request()
+  other.RawPC("n3")
+  assert cache.serialize(other)[0] != key
+
+def test_serialize_hit_skips_serializing (tmp_path, monkeypatch):
+  cache = RC.DirectoryCache(str(tmp_path))
+  cache.serialize(_request())
+  def fail (*args, **kwargs):
+    raise AssertionError("serialized")
+  monkeypatch.setattr(RC.ET, "tostring", fail)
+  assert cache.serialize(_request())[2]
+
+def test_file_mode (tmp_path, monkeypatch):
+  monkeypatch.setattr(RC, "_NEW_FILE_MODE", 0o644)
+  cache = RC.DirectoryCache(str(tmp_path))
+  key = "0" * 64
+  cache.put(key, b"<rspec/>")
+  assert stat.S_IMODE(os.stat(cache._filepath(key)).st_mode) == 0o644
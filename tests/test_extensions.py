@@ -0,0 +1,48 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+import geni.rspec.pg as PG
+import geni.rspec.vts as VTS
+
+def test_vts_container_extensions ():
+  r = VTS.Request()
+  c = r.Container(VTS.Image("uh.docker"), "c1")
+  m = c.HgMount("repo", "https://example.com/repo", "/mnt/repo")
+  assert isinstance(m, VTS.HgMount)
+  assert m in c._ext_children
+
+  xml = r.toXMLString(ucode = True)
+  assert 'type="hg"' in xml
+  assert 'name="repo"' in xml
+
+def test_container_direct ():
+  c = VTS.Container(VTS.Image("uh.docker"), "c1")
+  c.DropboxMount("box", "/mnt/box")
+  assert len(c._ext_children) == 1
+
+def test_extension_bound_on_class ():
+  assert "Mount" not in vars(VTS.Container(VTS.Image("x"), "c"))
+  assert callable(VTS.Container.Mount)
+
+def test_once_only ():
+  class Once(object):
+    __ONCEONLY__ = True
+    def _write (self, element):
+      return element
+
+  item = ("_TestOnce", Once)
+  PG.Node.EXTENSIONS.append(item)
+  try:
+    node = PG.RawPC("n1")
+    node._TestOnce()
+    with pytest.raises(PG.DuplicateExtensionError):
+      node._TestOnce()
+  finally:
+    PG.Node.EXTENSIONS.remove(item)
+    delattr(PG.Node, "_TestOnce")
+  assert not hasattr(PG.RawPC("n2"), "_TestOnce")
@@ -0,0 +1,26 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from geni.minigcf import amapi2
+from geni.minigcf import rpcdecode
+
+_RESPONSE = (b"<?xml version='1.0'?><methodResponse><params><param><value><struct>"
+             b"<member><name>code</name><value><struct><member><name>geni_code</name>"
+             b"<value><int>0</int></value></member></struct></value></member>"
+             b"<member><name>value</name><value><string>&lt;rspec/&gt;</string></value></member>"
+             b"</struct></value></param></params></methodResponse>")
+
+def _listresources (monkeypatch, **kwargs):
+  def rpcpost (url, req_data, cert, root_bundle, rspec = False, compressed = False):
+    return rpcdecode.loads(_RESPONSE, rspec, compressed)
+  monkeypatch.setattr(amapi2, "_rpcpost", rpcpost)
+  return amapi2.listresources("https://am.example.net/", False, "cert", "key", [], **kwargs)
+
+def test_listresources_text (monkeypatch):
+  assert _listresources(monkeypatch)["value"] == "<rspec/>"
+
+def test_listresources_bytes (monkeypatch):
+  assert _listresources(monkeypatch, rspec = True)["value"] == b"<rspec/>"
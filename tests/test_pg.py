@@ -0,0 +1,173 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+import geni.rspec.pg as PG
+
+def test_setattr_shaping ():
+  r = PG.Request()
+  lan = PG.LAN("lan")
+  r.addResource(lan)
+  for (name, bw) in [("n1", 100000), ("n2", 50000)]:
+    node = PG.RawPC(name)
+    r.addResource(node)
+    iface = node.addInterface("if1")
+    setattr(iface, "bandwidth", bw)
+    lan.addInterface(iface)
+
+  xml = r.toXMLString(ucode = True)
+  assert 'source_id="n1:if1" dest_id="lan" capacity="100000"' in xml
+  assert 'source_id="n2:if1" dest_id="lan" capacity="50000"' in xml
+
+def test_extra_attributes ():
+  node = PG.RawPC("n1")
+  node.my_note = "hello"
+  assert vars(node) == {"my_note" : "hello"}
+
+def test_get_after_rename ():
+  r = PG.Request()
+  node = r.RawPC("old")
+  intf = node.addInterface()
+  assert r.get("old") is node
+
+  node.client_id = "new"
+  intf.client_id = "new:eth0"
+  assert r.get("new") is node
+  assert r.get("new:eth0") is intf
+  assert r.get("old") is None
+  assert r.get("old:if0", "missing") == "missing"
+
+def test_generated_interface_names ():
+  for r in (PG.Request(), None):
+    node = PG.RawPC("n1")
+    if r is not None:
+      r.addResource(node)
+    node.addInterface("if2")
+    first = node.addInterface()
+    second = node.addInterface()
+    node.interfaces.remove(first)
+    node.interfaces.remove(second)
+    third = node.addInterface()
+    fourth = node.addInterface()
+
+    names = [x.name for x in node.interfaces]
+    assert len(set(names)) == len(names) == 3
+    assert first.name == "n1:if0"
+    assert second.name == "n1:if1"
+    assert "n1:if2" not in (third.name, fourth.name)
+
+def test_lookup_miss_keeps_index (monkeypatch):
+  r = PG.Request()
+  r.RawPC("n1").addInterface()
+  link = r.Link("l1")
+  def fail ():
+    raise AssertionError("reindexed")
+  monkeypatch.setattr(r, "_reindex", fail)
+  assert r.get("nothing") is None
+  assert r.get("n1:if0") is not None
+  monkeypatch.undo()
+
+  link.client_id = "l2"
+  assert r.get("l2") is link
+  assert r.get("l1") is None
+
+def test_failed_add_registers_nothing ():
+  r = PG.Request()
+  r.RawPC("a")
+  node = PG.RawPC("b")
+  node.interfaces.append(PG.Interface("a", node))
+  with pytest.raises(PG.DuplicateClientIDError):
+    r.addResource(node)
+  assert r.get("b") is None
+  assert node not in r.resources
+  assert r.get("a") is not node.interfaces[0]
+  r.addResource(PG.RawPC("b"))
+
+def test_interface_name_set ():
+  node = PG.RawPC("n1")
+  intf = node.addInterface("eth0")
+  with pytest.raises(PG.Node.DuplicateInterfaceName):
+    node.addInterface("eth0")
+  intf.client_id = "n1:eth9"
+  node.addInterface("eth0")
+  with pytest.raises(PG.Node.DuplicateInterfaceName):
+    node.addInterface("eth9")
+  node.interfaces.append(PG.Interface("n1:if0", node))
+  assert node.addInterface().name == "n1:if1"
+
+def _shapedLink (count):
+  import geni.rspec.emulab  # pylint: disable=unused-import
+  link = PG.Link("big", members = [PG.RawPC("n%d" % (i)) for i in range(count)])
+  link.setProperties(bandwidth = 1000)
+  return link
+
+def test_setproperties_namespace ():
+  r = PG.Request()
+  r.addResource(_shapedLink(3))
+  xml = r.toXMLString(ucode = True)
+  assert '<emulab:properties capacity="1000"/>' in xml
+  assert "ns0" not in xml
+
+  r = PG.Request()
+  link = r.Link("l1", members = [r.RawPC("a"), r.RawPC("b")])
+  link.setProperties(latency = 5)
+  xml = r.toXMLString(ucode = True)
+  assert '<emulab:properties latency="5"/>' in xml
+  assert "ns0" not in xml
+
+def test_setproperties_keeps_pair_shaping ():
+  link = _shapedLink(3)
+  link.interfaces[0].latency = 5
+  r = PG.Request()
+  r.addResource(link)
+  xml = r.toXMLString(ucode = True)
+  assert xml.count("<property ") == 2
+  assert 'source_id="n1:if0" dest_id="n0:if0" latency="5"' in xml
+
+def test_compact_shaping ():
+  link = _shapedLink(4)
+  link.compact_shaping = True
+  link.interfaces[0].latency = 5
+  link.latency = 1
+  r = PG.Request()
+  r.addResource(link)
+  xml = r.toXMLString(ucode = True)
+  assert xml.count("<property ") == 4
+  assert 'source_id="n0:if0" dest_id="big" latency="5"' in xml
+
+  loaded = PG.Request.fromXML(xml = xml)
+  assert loaded.get("big").compact_shaping
+  assert loaded.toXMLString(ucode = True) == xml
+
+def test_fragment_cache_opt_in ():
+  r = PG.Request()
+  nodes = [r.RawPC("n%d" % (i)) for i in range(5)]
+  r.toXMLString()
+  r.toXMLString()
+  assert r._fragments is None
+
+  first = r.toXMLString(cache = True)
+  assert r._fragments
+  nodes[2].disk_image = "urn:publicid:IDN+emulab.net+image+emulab-ops:UBUNTU22-64-STD"
+  edited = r.toXMLString(cache = True)
+  assert edited != first
+  assert edited == r.toXMLString()
+
+  r.clearCache()
+  assert r._fragments is None
+
+def test_connect_few_nodes ():
+  for pattern in ("lan", "chain", "ring", "star", "mesh"):
+    for count in (0, 1):
+      r = PG.Request()
+      nodes = [r.RawPC("n%d" % (idx)) for idx in range(count)]
+      assert r.connectNodes(nodes, pattern, network = "10.0.0.0/24") == []
+      assert not r.resources[count:]
+
+  r = PG.Request()
+  links = r.connectNodes((r.RawPC("n%d" % (idx)) for idx in range(3)), "star")
+  assert [len(link.interfaces) for link in links] == [2, 2]
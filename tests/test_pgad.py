@@ -0,0 +1,66 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import stat
+
+import geni.rspec.pgad as PGAD
+
+_AD = b"""<rspec xmlns="http://www.geni.net/resources/rspec/3"
+       xmlns:emulab="http://www.protogeni.net/resources/rspec/ext/emulab/1" type="advertisement">
+  <node component_id="urn:publicid:IDN+example.net+node+pc1" component_name="pc1"
+        component_manager_id="urn:publicid:IDN+example.net+authority+cm" exclusive="true">
+    <hardware_type name="d430"><emulab:node_type type_slots="1"/></hardware_type>
+    <sliver_type name="raw-pc"><disk_image name="urn:publicid:IDN+example.net+image+p:IMG"/></sliver_type>
+    <available now="true"/>
+    <interface component_id="urn:publicid:IDN+example.net+interface+pc1:eth0"/>
+  </node>
+  <node component_id="urn:publicid:IDN+example.net+node+pc2" component_name="pc2"
+        component_manager_id="urn:publicid:IDN+example.net+authority+cm" exclusive="true">
+    <hardware_type name="m510"><emulab:node_type type_slots="1"/></hardware_type>
+    <available now="false"/>
+  </node>
+</rspec>"""
+
+def test_iter_nodes_stay_lazy ():
+  nodes = list(PGAD.iterAdvertisement(xml = _AD))
+  assert [node.name for node in nodes] == ["pc1", "pc2"]
+  assert "hardware_types" not in vars(nodes[0])
+
+  assert nodes[0].hardware_types == {"d430" : "1"}
+  assert nodes[0].available and not nodes[1].available
+  assert [im.name for im in nodes[0].images["raw-pc"]] == ["urn:publicid:IDN+example.net+image+p:IMG"]
+  assert len(nodes[0].interfaces) == 1
+  assert 'component_name="pc2"' in nodes[1].text
+  assert "pc1" not in nodes[1].text
+
+def test_node_summaries ():
+  ad = PGAD.Advertisement(xml = _AD)
+  assert ad.find(hardware_type = "d430", image = "urn:publicid:IDN+example.net+image+p:IMG",
+                 available = True)[0].name == "pc1"
+  assert [n.name for n in ad.find(available = False)] == ["pc2"]
+
+  table = ad.node_table
+  assert list(table.data["interfaces"]) == [1, 0]
+  assert list(table.hasHardwareType("m510")) == [False, True]
+  assert list(table.data["cpu"]) == [-1, -1]
+
+  assert ad.topology.advertised == 2
+
+def test_catalog_save (tmp_path, monkeypatch):
+  import geni.rspec.cache as RC
+  from geni.model.catalog import ImageCatalog
+
+  monkeypatch.setattr(RC, "_NEW_FILE_MODE", 0o640)
+  catalog = ImageCatalog(str(tmp_path / "catalog.json"))
+  assert catalog.ingest("example", xml = _AD) == 1
+  entry = catalog["urn:publicid:IDN+example.net+image+p:IMG"]
+  assert entry.hardware_types == set(["d430"])
+  assert entry.sliver_types == set(["raw-pc"])
+
+  catalog.save()
+  assert stat.S_IMODE(os.stat(catalog.path).st_mode) == 0o640
+  assert len(ImageCatalog(catalog.path)) == 1
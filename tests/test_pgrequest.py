@@ -0,0 +1,43 @@
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import geni.rspec.igext as IG
+import geni.rspec.pg as PG
+
+def test_tour_round_trip ():
+  r = PG.Request()
+  node = r.RawPC("n1")
+  tour = IG.Tour()
+  tour.Description(IG.Tour.MARKDOWN, "A *small* profile")
+  tour.Instructions(IG.Tour.TEXT, "Log in to n1")
+  tour.addStep(IG.Tour.Step(node, "The node"))
+  r.addTour(tour)
+
+  for pretty in (False, True):
+    xml = r.toXMLString(pretty_print = pretty)
+    loaded = PG.Request.fromXML(xml = xml)
+    assert loaded.hasTour()
+    assert loaded.tour.description == "A *small* profile"
+    assert [step.id for step in loaded.tour.steps] == ["n1"]
+    assert not [obj for obj in loaded.resources if isinstance(obj, PG.RawResource)]
+    assert loaded.toXMLString(pretty_print = pretty) == xml
+
+def test_load_does_not_reindex (monkeypatch):
+  r = PG.Request()
+  prev = None
+  for idx in range(50):
+    node = r.RawPC("n%d" % (idx))
+    if prev is not None:
+      r.Link("l%d" % (idx), members = [prev, node])
+    prev = node
+  xml = r.toXMLString()
+
+  def fail (self):
+    raise AssertionError("reindexed")
+  monkeypatch.setattr(PG.Request, "_reindex", fail)
+  loaded = PG.Request.fromXML(xml = xml)
+  assert loaded.toXMLString() == xml
+  assert loaded.get("l1").interfaces[1] is loaded.get("n1").interfaces[0]
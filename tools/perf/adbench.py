@@ -0,0 +1,503 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Benchmarks for parsing and querying large advertisements.
+
+Run from the root of the source tree, for example:
+
+  python tools/perf/adbench.py scan --nodes 5000 --images 50
+  python tools/perf/adbench.py index --nodes 2000
+  python tools/perf/adbench.py table --nodes 20000
+  python tools/perf/adbench.py find --nodes 10000
+  python tools/perf/adbench.py fields --nodes 10000
+  python tools/perf/adbench.py cache --nodes 5000
+  python tools/perf/adbench.py diff --nodes 10000
+  python tools/perf/adbench.py geo --points 100000
+  python tools/perf/adbench.py graph --nodes 10000 --links 20000
+  python tools/perf/adbench.py catalog --sites 10 --nodes 1000
+
+Advertisements are generated with a shape similar to a large federation ad: every node
+supports a couple of sliver types, each with a long list of images.  Each mode is run in a
+fresh process so that peak memory use (max RSS) can be compared.
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+import geni.rspec.pgad as PGAD
+
+HEAD = (b'<rspec xmlns="http://www.geni.net/resources/rspec/3" '
+        b'xmlns:emulab="http://www.protogeni.net/resources/rspec/ext/emulab/1" '
+        b'xmlns:sharedvlan="http://www.geni.net/resources/rspec/ext/shared-vlan/1" type="advertisement">\n')
+
+def writeAd (out, nodes, images, links):
+  cm = "urn:publicid:IDN+bench.example.net+authority+cm"
+  out.write(HEAD)
+  for idx in range(nodes):
+    cid = "urn:publicid:IDN+bench.example.net+node+pc%d" % (idx)
+    parts = ['<node component_id="%s" component_manager_id="%s" component_name="pc%d" exclusive="true">'
+             % (cid, cm, idx)]
+    parts.append('<hardware_type name="d%d"><emulab:node_type type_slots="1"/></hardware_type>' % (idx % 7))
+    for stype in ("raw-pc", "emulab-xen"):
+      parts.append('<sliver_type name="%s">' % (stype))
+      for img in range(images):
+        parts.append('<disk_image name="urn:publicid:IDN+bench.example.net+image+proj:IMG%d" os="Linux" '
+                     'version="%d" description="Image number %d"/>' % (img, img % 3, img))
+      parts.append('</sliver_type>')
+    parts.append('<available now="%s"/>' % ("true" if idx % 3 else "false"))
+    for intf in range(4):
+      parts.append('<interface component_id="%s:eth%d" role="experimental"/>' % (cid, intf))
+    parts.append('<emulab:fd name="cpu" weight="2400"/><emulab:fd name="ram" weight="65536"/>')
+    parts.append('<location latitude="40.7" longitude="-111.8"/></node>\n')
+    out.write("".join(parts).encode("utf-8"))
+  for idx in range(links):
+    a = "urn:publicid:IDN+bench.example.net+node+pc%d:eth0" % (idx % nodes)
+    b = "urn:publicid:IDN+bench.example.net+node+pc%d:eth1" % ((idx + 1) % nodes)
+    out.write(('<link component_id="urn:publicid:IDN+bench.example.net+link+l%d"><link_type name="lan"/>'
+               '<interface_ref component_id="%s"/><interface_ref component_id="%s"/></link>\n'
+               % (idx, a, b)).encode("utf-8"))
+  out.write(b'<sharedvlan:rspec_shared_vlan><sharedvlan:available name="svlan1"/>'
+            b'<sharedvlan:available name="svlan2"/></sharedvlan:rspec_shared_vlan>\n</rspec>\n')
+
+def run (mode, path, target):
+  start = time.perf_counter()
+  if mode == "tree":
+    ad = PGAD.Advertisement(path)
+    count = sum([1 for node in ad.nodes])
+  elif mode == "tree-find":
+    ad = PGAD.Advertisement(path)
+    count = 0
+    for node in ad.nodes:
+      count += 1
+      if node.name == target:
+        break
+  elif mode == "stream":
+    count = sum([1 for node in PGAD.iterAdvertisement(path, links = False, shared_vlans = False)])
+  else:
+    count = 0
+    for node in PGAD.iterAdvertisement(path, links = False, shared_vlans = False):
+      count += 1
+      if node.name == target:
+        break
+  elapsed = time.perf_counter() - start
+  rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+  print("%-12s %6d nodes %8.3fs %8.1f MB max RSS" % (mode, count, elapsed, rss))
+
+def scan (opts):
+  (handle, path) = tempfile.mkstemp(suffix = ".xml")
+  try:
+    with os.fdopen(handle, "wb") as f:
+      writeAd(f, opts.nodes, opts.images, opts.links)
+    print("advertisement: %.1f MB, %d nodes, %d images per sliver type" % (
+      os.path.getsize(path) / 1e6, opts.nodes, opts.images))
+    target = "pc%d" % (opts.nodes // 10)
+    for mode in ("tree", "stream", "tree-find", "stream-find"):
+      subprocess.check_call([sys.executable, os.path.abspath(__file__), "run", mode, path, target])
+  finally:
+    os.unlink(path)
+
+def index (opts):
+  import io
+
+  out = io.BytesIO()
+  writeAd(out, opts.nodes, opts.images, opts.links)
+  ad = PGAD.Advertisement(xml = out.getvalue().decode("utf-8"))
+
+  def indexed ():
+    for idx in range(len(ad.nodes)):
+      ad.nodes[idx].name
+
+  def iterated ():
+    for node in ad.nodes:
+      node.name
+
+  for (label, func) in (("indexed", indexed), ("iterated", iterated), ("iterated again", iterated)):
+    start = time.perf_counter()
+    func()
+    print("%-15s %8.3fs" % (label, time.perf_counter() - start))
+
+def table (opts):
+  import io
+
+  out = io.BytesIO()
+  writeAd(out, opts.nodes, opts.images, opts.links)
+  ad = PGAD.Advertisement(xml = out.getvalue().decode("utf-8"))
+
+  def loop ():
+    return [node for node in ad.nodes
+            if node.available and node.exclusive and "raw-pc" in node.sliver_types
+            and (node.ram or 0) >= 65536 and "d3" in node.hardware_types]
+
+  def build ():
+    ad._node_table = None
+    return ad.node_table
+
+  def ids ():
+    t = ad.node_table
+    mask = t.data["available"] & t.data["exclusive"] & t.hasSliverType("raw-pc")
+    mask &= (t.data["ram"] >= 65536) & t.hasHardwareType("d3")
+    return list(t.component_ids[mask])
+
+  def nodes ():
+    t = ad.node_table
+    mask = t.data["available"] & t.data["exclusive"] & t.hasSliverType("raw-pc")
+    mask &= (t.data["ram"] >= 65536) & t.hasHardwareType("d3")
+    return t.nodes(mask)
+
+  for (label, func) in (("python loop", loop), ("build table", build), ("vectorized ids", ids),
+                        ("vectorized nodes", nodes)):
+    best = None
+    for _ in range(opts.repeat):
+      start = time.perf_counter()
+      result = func()
+      elapsed = time.perf_counter() - start
+      best = min(best or elapsed, elapsed)
+    count = len(result) if isinstance(result, list) else len(result.data)
+    print("%-18s %8.4fs  %6d rows (best of %d)" % (label, best, count, opts.repeat))
+
+def find (opts):
+  import io
+
+  out = io.BytesIO()
+  writeAd(out, opts.nodes, opts.images, opts.links)
+  ad = PGAD.Advertisement(xml = out.getvalue().decode("utf-8"))
+  image = "urn:publicid:IDN+bench.example.net+image+proj:IMG%d" % (opts.images - 1)
+
+  def scan ():
+    return [node for node in ad.nodes
+            if node.available and node.exclusive and "d3" in node.hardware_types
+            and image in [im.name for im in node.images.get("raw-pc", [])]]
+
+  def query ():
+    return ad.find(hardware_type = "d3", sliver_type = "raw-pc", image = image, available = True,
+                   exclusive = True)
+
+  start = time.perf_counter()
+  found = query()
+  print("%-20s %8.4fs  %5d nodes" % ("first find (index)", time.perf_counter() - start, len(found)))
+
+  for (label, func) in (("full scan", scan), ("find", query)):
+    best = None
+    for _ in range(opts.repeat):
+      start = time.perf_counter()
+      result = func()
+      elapsed = time.perf_counter() - start
+      best = min(best or elapsed, elapsed)
+    print("%-20s %8.4fs  %5d nodes (best of %d)" % (label, best, len(result), opts.repeat))
+
+def fields (opts):
+  import io
+
+  out = io.BytesIO()
+  writeAd(out, opts.nodes, opts.images, opts.links)
+  ad = PGAD.Advertisement(xml = out.getvalue().decode("utf-8"))
+  elems = ad.nodes._data
+
+  def attributes ():
+    for elem in elems:
+      node = PGAD.AdNode._fromdom(elem)
+      (node.component_id, node.available)
+
+  def features ():
+    for elem in elems:
+      node = PGAD.AdNode._fromdom(elem)
+      (node.available, node.hardware_types, node.ram)
+
+  def everything ():
+    for elem in elems:
+      node = PGAD.AdNode._fromdom(elem)
+      (node.available, node.hardware_types, node.images, node.shared, node.interfaces, node.location)
+
+  for (label, func) in (("component_id, available", attributes), ("+ hardware_types, ram", features),
+                        ("all fields", everything)):
+    best = min([timed(func) for _ in range(opts.repeat)])
+    print("%-25s %8.3fs (best of %d)" % (label, best, opts.repeat))
+
+def cache (opts):
+  import io
+  import shutil
+  from six.moves import xmlrpc_client as xmlrpclib
+  from geni.aggregate.adcache import AdvertisementCache
+
+  out = io.BytesIO()
+  writeAd(out, opts.nodes, opts.images, opts.links)
+  response = {"code" : {"geni_code" : 0, "am_type" : "protogeni"}, "output" : "",
+              "value" : out.getvalue().decode("utf-8")}
+  body = xmlrpclib.dumps((response,), methodresponse = True)
+  print("advertisement: %.1f MB, response body %.1f MB" % (len(response["value"]) / 1e6, len(body) / 1e6))
+
+  path = tempfile.mkdtemp()
+  try:
+    adcache = AdvertisementCache(path, 3600)
+    urn = "urn:publicid:IDN+bench.example.net+authority+cm"
+
+    def fetched ():
+      (data,) = xmlrpclib.loads(body)[0]
+      PGAD.Advertisement(xml = data["value"])
+
+    def store ():
+      adcache.put(urn, False, response)
+
+    def hit ():
+      PGAD.Advertisement(xml = adcache.get(urn, False)["value"])
+
+    for (label, func) in (("decode + parse", fetched), ("cache store", store), ("cache hit + parse", hit)):
+      best = min([timed(func) for _ in range(opts.repeat)])
+      print("%-18s %8.3fs (best of %d)" % (label, best, opts.repeat))
+  finally:
+    shutil.rmtree(path)
+
+def diff (opts):
+  import io
+  import geni.rspec.addiff as addiff
+
+  out = io.BytesIO()
+  writeAd(out, opts.nodes, opts.images, opts.links)
+  before = out.getvalue().decode("utf-8")
+  # Flip the availability of every 20th node and drop the last one
+  parts = before.split('<available now="')
+  for idx in range(1, len(parts), 20):
+    parts[idx] = ("false" + parts[idx][4:]) if parts[idx].startswith("true") else ("true" + parts[idx][5:])
+  after = '<available now="'.join(parts)
+  after = after[:after.rindex("<node ")] + after[after.index("</node>", after.rindex("<node ")) + 8:]
+
+  for images in (False, True):
+    times = []
+    for _ in range(opts.repeat):
+      (old, new) = (PGAD.Advertisement(xml = before), PGAD.Advertisement(xml = after))
+      start = time.perf_counter()
+      changes = addiff.diff(old, new, images = images)
+      times.append(time.perf_counter() - start)
+    print("diff%-14s %8.3fs  %5d changes (best of %d)" % (" + images" if images else "", min(times),
+                                                          len(changes), opts.repeat))
+
+def geo (opts):
+  import random
+  from geni.model.spatial import GeoIndex, distance as geodistance
+
+  rand = random.Random(1)
+  index = GeoIndex()
+  points = []
+  for idx in range(opts.points):
+    # Clustered around a few hundred sites, like nodes in a federation
+    site = rand.randrange(300)
+    lat = ((site * 7919) % 140) - 60 + rand.uniform(-0.5, 0.5)
+    lon = ((site * 104729) % 360) - 180 + rand.uniform(-0.5, 0.5)
+    points.append((lat, lon))
+    index.add(lat, lon, idx)
+  queries = [(rand.uniform(-60, 70), rand.uniform(-180, 180)) for _ in range(opts.queries)]
+
+  def scan ():
+    for (qlat, qlon) in queries:
+      dists = [geodistance(qlat, qlon, lat, lon) for (lat, lon) in points]
+      sorted(range(len(dists)), key = dists.__getitem__)[:10]
+      [d for d in dists if d <= 500]
+
+  def build ():
+    index._order = None
+    index._build()
+
+  def nearest ():
+    for (qlat, qlon) in queries:
+      index.nearest(qlat, qlon, 10)
+
+  def within ():
+    for (qlat, qlon) in queries:
+      index.within(qlat, qlon, 500)
+
+  print("%d points, %d queries" % (opts.points, opts.queries))
+  for (label, func) in (("full scan (both)", scan), ("build index", build), ("nearest 10", nearest),
+                        ("within 500 km", within)):
+    print("%-18s %8.3fs" % (label, timed(func)))
+
+def graph (opts):
+  import collections
+  import io
+  import random
+  import tracemalloc
+  from geni.model.topology import Topology
+
+  out = io.BytesIO()
+  writeAd(out, opts.nodes, 1, opts.links)
+  ad = PGAD.Advertisement(xml = out.getvalue().decode("utf-8"))
+  rand = random.Random(1)
+  pairs = [(rand.randrange(opts.nodes), rand.randrange(opts.nodes)) for _ in range(opts.paths)]
+
+  def strings ():
+    # What callers do today: split interface_refs into node names, as util._buildaddot does
+    adj = collections.defaultdict(list)
+    for link in ad.links:
+      names = [ref.split(":")[-2].split("+")[-1] for ref in link.interface_refs]
+      for (pos, name) in enumerate(names):
+        for other in names[pos + 1:]:
+          adj[name].append(other)
+          adj[other].append(name)
+    return adj
+
+  def bfs (adj, src, dst):
+    parent = {src : src}
+    queue = collections.deque([src])
+    while queue and dst not in parent:
+      vtx = queue.popleft()
+      for nbr in adj[vtx]:
+        if nbr not in parent:
+          parent[nbr] = vtx
+          queue.append(nbr)
+
+  def measure (func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    result = None
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (result, elapsed, size)
+
+  (adj, elapsed, size) = measure(strings)
+  print("%-22s %8.3fs %8.1f MB" % ("dict of lists: build", elapsed, size / 1e6))
+  print("%-22s %8.3fs" % ("  %d paths" % (opts.paths),
+                          timed(lambda: [bfs(adj, "pc%d" % (a), "pc%d" % (b)) for (a, b) in pairs])))
+
+  (topo, elapsed, size) = measure(lambda: Topology(ad))
+  print("%-22s %8.3fs %8.1f MB" % ("Topology: build", elapsed, size / 1e6))
+  print("%-22s %8.3fs" % ("  %d paths" % (opts.paths), timed(lambda: [topo.shortestPath(a, b) for (a, b) in pairs])))
+  print("%-22s %8.3fs" % ("  components", timed(topo.components)))
+
+def catalog (opts):
+  import shutil
+  from geni.model.catalog import ImageCatalog
+
+  tmpdir = tempfile.mkdtemp()
+  try:
+    paths = []
+    for site in range(opts.sites):
+      path = os.path.join(tmpdir, "site%d.xml" % (site))
+      with open(path, "wb") as f:
+        writeAd(f, opts.nodes, opts.images, 0)
+      paths.append(path)
+    print("%d sites, %.1f MB of advertisements" % (opts.sites, sum([os.path.getsize(p) for p in paths]) / 1e6))
+
+    def images ():
+      found = {}
+      for (site, path) in enumerate(paths):
+        for image in PGAD.Advertisement(path).images:
+          found.setdefault(image.name, set()).add(site)
+      return found
+
+    cat = ImageCatalog()
+    def ingest ():
+      for (site, path) in enumerate(paths):
+        cat.ingest("site%d" % (site), path = path)
+
+    catpath = os.path.join(tmpdir, "images.json")
+    loaded = []
+    for (label, func) in (("Advertisement.images", images), ("ingest", ingest),
+                          ("save", lambda: cat.save(catpath)),
+                          ("load", lambda: loaded.append(ImageCatalog(catpath))),
+                          ("find", lambda: loaded[0].find(hardware_type = "d3", sliver_type = "raw-pc"))):
+      print("%-22s %8.3fs" % (label, timed(func)))
+    print("%d images, catalog file %.1f KB" % (len(loaded[0]), os.path.getsize(catpath) / 1e3))
+  finally:
+    shutil.rmtree(tmpdir)
+
+def timed (func):
+  start = time.perf_counter()
+  func()
+  return time.perf_counter() - start
+
+def parseArgs ():
+  parser = argparse.ArgumentParser()
+  sub = parser.add_subparsers(dest = "bench")
+  sub.required = True
+
+  sparser = sub.add_parser("scan", help = "Iterate over the nodes of a large advertisement")
+  sparser.add_argument("--nodes", type = int, default = 5000)
+  sparser.add_argument("--images", type = int, default = 50)
+  sparser.add_argument("--links", type = int, default = 2000)
+  sparser.set_defaults(func = scan)
+
+  iparser = sub.add_parser("index", help = "Index and iterate over the nodes of an advertisement")
+  iparser.add_argument("--nodes", type = int, default = 1000)
+  iparser.add_argument("--images", type = int, default = 10)
+  iparser.add_argument("--links", type = int, default = 0)
+  iparser.set_defaults(func = index)
+
+  tparser = sub.add_parser("table", help = "Filter nodes in Python and with the columnar node table")
+  tparser.add_argument("--nodes", type = int, default = 20000)
+  tparser.add_argument("--images", type = int, default = 2)
+  tparser.add_argument("--links", type = int, default = 0)
+  tparser.add_argument("--repeat", type = int, default = 3)
+  tparser.set_defaults(func = table)
+
+  fparser = sub.add_parser("find", help = "Query nodes with a full scan and with Advertisement.find")
+  fparser.add_argument("--nodes", type = int, default = 10000)
+  fparser.add_argument("--images", type = int, default = 20)
+  fparser.add_argument("--links", type = int, default = 0)
+  fparser.add_argument("--repeat", type = int, default = 3)
+  fparser.set_defaults(func = find)
+
+  dparser = sub.add_parser("fields", help = "Decode some or all of the fields of every node")
+  dparser.add_argument("--nodes", type = int, default = 10000)
+  dparser.add_argument("--images", type = int, default = 20)
+  dparser.add_argument("--links", type = int, default = 0)
+  dparser.add_argument("--repeat", type = int, default = 3)
+  dparser.set_defaults(func = fields)
+
+  cparser = sub.add_parser("cache", help = "Load an advertisement from a response body and from the cache")
+  cparser.add_argument("--nodes", type = int, default = 5000)
+  cparser.add_argument("--images", type = int, default = 20)
+  cparser.add_argument("--links", type = int, default = 2000)
+  cparser.add_argument("--repeat", type = int, default = 3)
+  cparser.set_defaults(func = cache)
+
+  xparser = sub.add_parser("diff", help = "Compare two snapshots of an advertisement")
+  xparser.add_argument("--nodes", type = int, default = 10000)
+  xparser.add_argument("--images", type = int, default = 20)
+  xparser.add_argument("--links", type = int, default = 0)
+  xparser.add_argument("--repeat", type = int, default = 3)
+  xparser.set_defaults(func = diff)
+
+  gparser = sub.add_parser("geo", help = "Nearest and radius queries with and without a GeoIndex")
+  gparser.add_argument("--points", type = int, default = 100000)
+  gparser.add_argument("--queries", type = int, default = 20)
+  gparser.set_defaults(func = geo)
+
+  kparser = sub.add_parser("graph", help = "Build a topology graph and run path queries")
+  kparser.add_argument("--nodes", type = int, default = 10000)
+  kparser.add_argument("--links", type = int, default = 20000)
+  kparser.add_argument("--paths", type = int, default = 100)
+  kparser.set_defaults(func = graph)
+
+  aparser = sub.add_parser("catalog", help = "Build, save and load an image catalog for several sites")
+  aparser.add_argument("--sites", type = int, default = 10)
+  aparser.add_argument("--nodes", type = int, default = 1000)
+  aparser.add_argument("--images", type = int, default = 20)
+  aparser.set_defaults(func = catalog)
+
+  rparser = sub.add_parser("run", help = "Run a single mode (used by the other benchmarks)")
+  rparser.add_argument("mode", choices = ("tree", "tree-find", "stream", "stream-find"))
+  rparser.add_argument("path")
+  rparser.add_argument("target")
+  rparser.set_defaults(func = lambda opts: run(opts.mode, opts.path, opts.target))
+
+  return parser.parse_args()
+
+if __name__ == '__main__':
+  opts = parseArgs()
+  opts.func(opts)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Micro-benchmarks for building and serializing large request RSpecs.
+
+Run from the root of the source tree, for example:
+
+  python tools/perf/requestbench.py render --nodes 10000
+  python tools/perf/requestbench.py construct --interfaces 100000
+  python tools/perf/requestbench.py memory --nodes 50000 --links 100000
+  python tools/perf/requestbench.py links --members 2 10 100 500
+  python tools/perf/requestbench.py bulk --nodes 10000
+  python tools/perf/requestbench.py parallel --nodes 30000 --processes 2 4 8
+  python tools/perf/requestbench.py fingerprint --nodes 10000
+  python tools/perf/requestbench.py load --nodes 10000
+
+The emulab extensions are imported so that objects carry the full set of registered
+extensions, as they do in a typical profile.
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+import geni.rspec.pg as PG
+import geni.rspec.igext as IG
+import geni.rspec.emulab  # pylint: disable=unused-import
+
+IMAGE = "urn:publicid:IDN+emulab.net+image+emulab-ops:UBUNTU18-64-STD"
+
+def buildChain (count):
+  """Build a request of `count` VMs connected in a chain of point-to-point links."""
+
+  req = PG.Request()
+  prev = None
+  for idx in range(count):
+    node = IG.XenVM("node%d" % (idx))
+    node.disk_image = IMAGE
+    node.addService(PG.Execute(shell="sh", command="/local/repository/setup.sh"))
+    req.addResource(node)
+    if prev is not None:
+      link = req.Link("link%d" % (idx))
+      link.addInterface(prev.addInterface())
+      link.addInterface(node.addInterface())
+      link.bandwidth = 1000
+    prev = node
+  return req
+
+def timed (func, *args):
+  start = time.perf_counter()
+  func(*args)
+  return time.perf_counter() - start
+
+def render (opts):
+  req = buildChain(opts.nodes)
+  nodes = [x for x in req.resources if isinstance(x, PG.Node)]
+
+  print("nodes: %d, links: %d" % (len(nodes), len(req.resources) - len(nodes)))
+  def cached ():
+    req.toXMLString(cache = True)
+
+  print("uncached render:    %8.3fs" % (timed(req.toXMLString)))
+  print("first cached:       %8.3fs (fills the fragment cache)" % (timed(cached)))
+  print("unchanged:          %8.3fs" % (timed(cached)))
+
+  edits = []
+  for idx in range(opts.edits):
+    node = nodes[(idx * 7919) % len(nodes)]
+    node.ram = 1024 + idx
+    edits.append(timed(cached))
+  print("single-node edit:   %8.3fs (mean of %d)" % (sum(edits) / len(edits), len(edits)))
+
+  print("full (uncached):    %8.3fs" % (timed(req._fullXMLString, False, False)))
+
+def construct (opts):
+  print("registered extensions: request %d, node %d, link %d, interface %d" % (
+    len(PG.Request.EXTENSIONS), len(PG.Node.EXTENSIONS), len(PG.Link.EXTENSIONS),
+    len(PG.Interface.EXTENSIONS)))
+
+  nodecount = opts.interfaces // opts.per_node
+
+  def build ():
+    req = PG.Request()
+    for idx in range(nodecount):
+      node = req.RawPC("node%d" % (idx))
+      for _ in range(opts.per_node):
+        node.addInterface()
+
+  best = min([timed(build) for _ in range(opts.repeat)])
+  print("%d nodes, %d interfaces: %.3fs (best of %d)" % (nodecount, nodecount * opts.per_node,
+                                                         best, opts.repeat))
+
+def memory (opts):
+  tracemalloc.start()
+
+  req = PG.Request()
+  nodes = [req.RawPC("node%d" % (idx)) for idx in range(opts.nodes)]
+  after_nodes = tracemalloc.get_traced_memory()[0]
+
+  for idx in range(opts.links):
+    link = req.Link("link%d" % (idx))
+    link.addInterface(nodes[idx % opts.nodes].addInterface())
+    link.addInterface(nodes[(idx * 7 + 1) % opts.nodes].addInterface())
+  total = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+
+  print("%d nodes:                %7.1f MB (%d bytes/node)" % (opts.nodes, after_nodes / 1e6,
+                                                             after_nodes // opts.nodes))
+  print("%d links + interfaces:  %7.1f MB (%d bytes/link)" % (opts.links, (total - after_nodes) / 1e6,
+                                                             (total - after_nodes) // opts.links))
+  print("total:                      %7.1f MB" % (total / 1e6))
+
+def links (opts):
+  print("%7s %8s %12s %9s %12s %9s" % ("members", "shaping", "pairs", "time", "compact", "time"))
+
+  for count in opts.members:
+    row = []
+    for compact in (False, True):
+      req = PG.Request()
+      nodes = [req.RawPC("node%d" % (idx)) for idx in range(count)]
+      link = req.Link("link", members = nodes)
+      link.compact_shaping = compact
+      if opts.shaped:
+        link.bandwidth = 1000
+        link.latency = 10
+      start = time.perf_counter()
+      size = len(req.toXMLString())
+      row.extend([size, time.perf_counter() - start])
+    print("%7d %8s %10d B %8.3fs %10d B %8.3fs" % tuple([count, "yes" if opts.shaped else "no"] + row))
+
+def bulk (opts):
+  def loop ():
+    req = PG.Request()
+    nodes = []
+    for idx in range(opts.nodes):
+      node = req.XenVM("node%d" % (idx))
+      node.disk_image = IMAGE
+      node.ram = 2048
+      node.addService(PG.Execute(shell="sh", command="/local/repository/setup.sh"))
+      nodes.append(node)
+    for idx in range(1, opts.nodes):
+      link = req.Link("link%d" % (idx))
+      for (hostidx, node) in enumerate(nodes[idx - 1:idx + 1]):
+        intf = node.addInterface()
+        addr = (idx - 1) * 4 + hostidx + 1
+        intf.addAddress(PG.IPv4Address("10.%d.%d.%d" % (addr >> 16, (addr >> 8) & 0xff, addr & 0xff),
+                                       "255.255.255.252"))
+        link.addInterface(intf)
+    return req
+
+  def builder ():
+    req = PG.Request()
+    tmpl = PG.NodeTemplate(IG.XenVM, disk_image = IMAGE, ram = 2048,
+                           services = [PG.Execute(shell="sh", command="/local/repository/setup.sh")])
+    nodes = req.addNodes(tmpl, opts.nodes)
+    req.connectNodes(nodes, "chain", network = "10.0.0.0/8")
+    return req
+
+  for (label, func) in (("loop", loop), ("addNodes", builder)):
+    build = render = None
+    for _ in range(opts.repeat):
+      req = None
+      gc.collect()
+      start = time.perf_counter()
+      req = func()
+      built = time.perf_counter()
+      req.toXMLString()
+      done = time.perf_counter()
+      build = min(build or built - start, built - start)
+      render = min(render or done - built, done - built)
+    print("%-9s build %6.3fs  render %6.3fs (best of %d)" % (label, build, render, opts.repeat))
+
+def parallel (opts):
+  req = buildChain(opts.nodes)
+  print("%d cpus available" % (os.cpu_count() or 1))
+
+  start = time.perf_counter()
+  serial = req._fullXMLString(False, False)
+  print("serial:       %8.3fs" % (time.perf_counter() - start))
+
+  for count in opts.processes:
+    start = time.perf_counter()
+    out = req.toXMLString(processes = count)
+    elapsed = time.perf_counter() - start
+    print("%2d processes: %8.3fs%s" % (count, elapsed, "" if out == serial else "  OUTPUT DIFFERS"))
+
+def fingerprint (opts):
+  import tempfile
+  import geni.rspec.cache
+
+  req = buildChain(opts.nodes)
+  cache = geni.rspec.cache.DirectoryCache(tempfile.mkdtemp())
+
+  print("serialize:    %8.3fs" % (timed(req._fullXMLString, False, False)))
+  print("fingerprint:  %8.3fs" % (timed(req.fingerprint)))
+  print("cache miss:   %8.3fs" % (timed(cache.serialize, req)))
+  print("cache hit:    %8.3fs" % (timed(cache.serialize, req)))
+
+def load (opts):
+  req = buildChain(opts.nodes)
+  data = req.toXMLString()
+
+  def build ():
+    buildChain(opts.nodes).toXMLString()
+
+  loaded = []
+  def fromxml ():
+    loaded[:] = [PG.Request.fromXML(xml = data)]
+
+  print("build + render: %8.3fs" % (timed(build)))
+  print("fromXML:        %8.3fs" % (timed(fromxml)))
+  raw = len([x for x in loaded[0].resources if isinstance(x, PG.RawResource)])
+  print("%d objects (%d raw), output %s" % (len(loaded[0].resources), raw,
+                                           "identical" if loaded[0].toXMLString() == data else "DIFFERS"))
+
+def parseArgs ():
+  parser = argparse.ArgumentParser()
+  sub = parser.add_subparsers(dest = "bench")
+  sub.required = True
+
+  rparser = sub.add_parser("render", help = "Re-render a request after editing single nodes")
+  rparser.add_argument("--nodes", type = int, default = 10000)
+  rparser.add_argument("--edits", type = int, default = 5)
+  rparser.set_defaults(func = render)
+
+  cparser = sub.add_parser("construct", help = "Construct nodes and interfaces")
+  cparser.add_argument("--interfaces", type = int, default = 100000)
+  cparser.add_argument("--per-node", type = int, default = 4)
+  cparser.add_argument("--repeat", type = int, default = 3)
+  cparser.set_defaults(func = construct)
+
+  mparser = sub.add_parser("memory", help = "Measure memory used by a large request")
+  mparser.add_argument("--nodes", type = int, default = 50000)
+  mparser.add_argument("--links", type = int, default = 100000)
+  mparser.set_defaults(func = memory)
+
+  lparser = sub.add_parser("links", help = "Render a single link with many members")
+  lparser.add_argument("--members", type = int, nargs = "+", default = [2, 10, 50, 100, 250, 500])
+  lparser.add_argument("--unshaped", dest = "shaped", action = "store_false",
+                       help = "Leave bandwidth and latency at their defaults")
+  lparser.set_defaults(func = links)
+
+  bparser = sub.add_parser("bulk", help = "Build a chain of identical VMs with and without addNodes")
+  bparser.add_argument("--nodes", type = int, default = 10000)
+  bparser.add_argument("--repeat", type = int, default = 3)
+  bparser.set_defaults(func = bulk)
+
+  pparser = sub.add_parser("parallel", help = "Serialize a request in worker processes")
+  pparser.add_argument("--nodes", type = int, default = 30000)
+  pparser.add_argument("--processes", type = int, nargs = "+", default = [2, 4, 8])
+  pparser.set_defaults(func = parallel)
+
+  fparser = sub.add_parser("fingerprint", help = "Fingerprint a request and look it up in a cache")
+  fparser.add_argument("--nodes", type = int, default = 10000)
+  fparser.set_defaults(func = fingerprint)
+
+  oparser = sub.add_parser("load", help = "Load a serialized request back into objects")
+  oparser.add_argument("--nodes", type = int, default = 10000)
+  oparser.set_defaults(func = load)
+
+  return parser.parse_args()
+
+if __name__ == '__main__':
+  opts = parseArgs()
+  opts.func(opts)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026  Barnstormer Softworks, Ltd.
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Benchmarks for decoding large AM API responses.
+
+Run from the root of the source tree, for example:
+
+  python tools/perf/rpcbench.py decode --nodes 5000
+  python tools/perf/rpcbench.py compress --nodes 5000 --mbps 20
+  python tools/perf/rpcbench.py pool --calls 200
+  python tools/perf/rpcbench.py aio --hosts 40 --delay 0.25
+
+Responses are built around a synthetic advertisement (see adbench.py).  Each decoder is run
+in a fresh process, reading the body from a file, so that peak memory use (max RSS) can be
+compared.
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import base64
+import io
+import os
+import resource
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from six.moves import xmlrpc_client as xmlrpclib
+
+import adbench
+import geni.rspec.pgad as PGAD
+from geni.minigcf import rpcdecode
+
+def writeResponse (path, opts):
+  out = io.BytesIO()
+  adbench.writeAd(out, opts.nodes, opts.images, opts.links)
+  if opts.compressed:
+    # As an aggregate answers geni_compressed
+    value = base64.b64encode(zlib.compress(out.getvalue())).decode("ascii")
+  else:
+    value = out.getvalue().decode("utf-8")
+  response = {"code" : {"geni_code" : 0, "am_type" : "protogeni", "protogeni_error_url" : ""},
+              "output" : "", "value" : value}
+  with open(path, "wb") as f:
+    f.write(xmlrpclib.dumps((response,), methodresponse = True).encode("utf-8"))
+
+def decodeXmlrpclib (body):
+  # What _rpcpost and the parsers did before: decode to str, then encode again to parse
+  return xmlrpclib.loads(body, use_datetime = True)[0][0]
+
+def decodeLxml (f):
+  # What _rpcpost(..., rspec = True) does when it has to read the whole body (with
+  # LOG_RAW_RESPONSES set)
+  return rpcdecode.loads(f.read(), rspec = True)
+
+def decodeStream (f):
+  # What _rpcpost(..., rspec = True) does otherwise, reading the body as it arrives
+  return rpcdecode.loadStream(iter(lambda: f.read(rpcdecode.CHUNK_SIZE), b""), rspec = True)
+
+def decodeCompressed (f):
+  # _rpcpost(..., rspec = True, compressed = True), for a geni_compressed ListResources
+  return rpcdecode.loadStream(iter(lambda: f.read(rpcdecode.CHUNK_SIZE), b""), rspec = True,
+                              compressed = True)
+
+DECODERS = {"xmlrpclib" : lambda f: decodeXmlrpclib(f.read()), "lxml" : decodeLxml,
+            "stream" : decodeStream, "compressed" : decodeCompressed}
+
+def run (mode, path):
+  base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+  start = time.perf_counter()
+  with open(path, "rb") as f:
+    data = DECODERS[mode](f)
+  decoded = time.perf_counter()
+  drss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+  ad = PGAD.Advertisement(xml = data["value"])
+  done = time.perf_counter()
+
+  rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+  print("%-10s decode %6.3fs (peak %6.1f MB)  parse %6.3fs  total %6.3fs (peak %6.1f MB)" % (
+    mode, decoded - start, drss - base, done - decoded, done - start, rss - base))
+  return ad
+
+def write (path, opts, compressed = False):
+  # Generated in another process too: a child starts with its parent's max RSS
+  args = [sys.executable, os.path.abspath(__file__), "write", path, "--nodes", str(opts.nodes),
+          "--images", str(opts.images), "--links", str(opts.links)]
+  subprocess.check_call(args + (["--compressed"] if compressed else []))
+  return os.path.getsize(path)
+
+def decode (opts):
+  (handle, path) = tempfile.mkstemp(suffix = ".xml")
+  os.close(handle)
+  try:
+    print("response body: %.1f MB" % (write(path, opts) / 1e6))
+    for mode in ("xmlrpclib", "lxml", "stream"):
+      subprocess.check_call([sys.executable, os.path.abspath(__file__), "run", mode, path])
+  finally:
+    os.unlink(path)
+
+def compress (opts):
+  paths = []
+  try:
+    for (mode, compressed) in (("stream", False), ("compressed", True)):
+      (handle, path) = tempfile.mkstemp(suffix = ".xml")
+      os.close(handle)
+      paths.append(path)
+      size = write(path, opts, compressed)
+      print("%-10s body %6.2f MB, %6.2fs to receive at %g Mbit/s" % (
+        mode, size / 1e6, size * 8 / (opts.mbps * 1e6), opts.mbps))
+      subprocess.check_call([sys.executable, os.path.abspath(__file__), "run", mode, path])
+  finally:
+    for path in paths:
+      os.unlink(path)
+
+def makeCert (dirname):
+  # Self-signed certificate used by both the stand-in aggregate and the client
+  path = os.path.join(dirname, "cert.pem")
+  subprocess.check_call(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                         "-subj", "/CN=localhost", "-keyout", path, "-out", path],
+                        stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+  return path
+
+def serve (certpath, delay = 0):
+  """Start a local HTTPS XML-RPC stand-in aggregate that answers every call with a small
+  GetVersion response (after `delay` seconds), requiring a client certificate.  Returns
+  (url, server)."""
+  from six.moves.BaseHTTPServer import BaseHTTPRequestHandler
+  from six.moves.socketserver import ThreadingMixIn
+  from six.moves.BaseHTTPServer import HTTPServer
+
+  body = xmlrpclib.dumps(({"code" : {"geni_code" : 0}, "output" : "",
+                           "value" : {"geni_api" : 2, "geni_api_versions" : {"2" : "https://localhost/"}}},),
+                         methodresponse = True).encode("utf-8")
+
+  class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes, which Nagle's algorithm would hold up
+    disable_nagle_algorithm = True
+    def do_POST (self):
+      self.rfile.read(int(self.headers["Content-Length"]))
+      time.sleep(delay)
+      self.send_response(200)
+      self.send_header("Content-Type", "text/xml")
+      self.send_header("Content-Length", str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+    def log_message (self, *args):
+      pass
+
+  class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+  ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+  ctx.load_cert_chain(certpath)
+  ctx.load_verify_locations(certpath)
+  ctx.verify_mode = ssl.CERT_REQUIRED
+
+  server = Server(("127.0.0.1", 0), Handler)
+  server.socket = ctx.wrap_socket(server.socket, server_side = True)
+  thread = threading.Thread(target = server.serve_forever)
+  thread.daemon = True
+  thread.start()
+  return ("https://127.0.0.1:%d/" % (server.server_address[1]), server)
+
+def sessions (opts):
+  from geni.minigcf import amapi2, config, pool
+
+  dirname = tempfile.mkdtemp()
+  try:
+    certpath = makeCert(dirname)
+    (url, server) = serve(certpath)
+    for keepalive in (False, True):
+      config.HTTP.KEEPALIVE = keepalive
+      pool.clear()
+      amapi2.getversion(url, False, certpath, certpath)
+      start = time.perf_counter()
+      for _ in range(opts.calls):
+        amapi2.getversion(url, False, certpath, certpath)
+      elapsed = time.perf_counter() - start
+      print("%-13s %d calls  %6.3fs  %6.2f ms/call" % ("keepalive" if keepalive else "new session",
+                                                      opts.calls, elapsed, elapsed * 1000 / opts.calls))
+    server.shutdown()
+  finally:
+    shutil.rmtree(dirname)
+
+def concurrent (opts):
+  import asyncio
+  from geni.minigcf import aio, amapi2
+
+  dirname = tempfile.mkdtemp()
+  try:
+    certpath = makeCert(dirname)
+    servers = [serve(certpath, opts.delay) for _ in range(opts.hosts)]
+    urls = [url for (url, _) in servers]
+
+    start = time.perf_counter()
+    for url in urls:
+      amapi2.getversion(url, False, certpath, certpath)
+    print("sequential    %d hosts  %6.3fs" % (opts.hosts, time.perf_counter() - start))
+
+    async def calls ():
+      start = time.perf_counter()
+      await asyncio.gather(*[aio.amapi2.getversion(url, False, certpath, certpath) for url in urls])
+      print("asyncio       %d hosts  %6.3fs" % (opts.hosts, time.perf_counter() - start))
+      start = time.perf_counter()
+      await asyncio.gather(*[aio.amapi2.getversion(urls[0], False, certpath, certpath) for _ in urls])
+      print("asyncio       %d calls to 1 host (%d at once)  %6.3fs" % (opts.hosts, aio.default().max_per_host,
+                                                                       time.perf_counter() - start))
+      aio.default().close()
+    asyncio.run(calls())
+
+    for (_, server) in servers:
+      server.shutdown()
+  finally:
+    shutil.rmtree(dirname)
+
+def addAdArgs (parser):
+  parser.add_argument("--nodes", type = int, default = 5000)
+  parser.add_argument("--images", type = int, default = 20)
+  parser.add_argument("--links", type = int, default = 2000)
+
+def parseArgs ():
+  parser = argparse.ArgumentParser()
+  sub = parser.add_subparsers(dest = "bench")
+  sub.required = True
+
+  dparser = sub.add_parser("decode", help = "Decode a ListResources response and parse the advertisement")
+  addAdArgs(dparser)
+  dparser.set_defaults(func = decode)
+
+  cparser = sub.add_parser("compress", help = "Compare plain and geni_compressed ListResources responses")
+  addAdArgs(cparser)
+  cparser.add_argument("--mbps", type = float, default = 20, help = "Link speed for the transfer time estimate")
+  cparser.set_defaults(func = compress)
+
+  pparser = sub.add_parser("pool", help = "Sequential calls to a local TLS stand-in aggregate, with and without keep-alive")
+  pparser.add_argument("--calls", type = int, default = 200)
+  pparser.set_defaults(func = sessions)
+
+  aparser = sub.add_parser("aio", help = "Calls to many local TLS stand-in aggregates, one after another and with asyncio")
+  aparser.add_argument("--hosts", type = int, default = 40)
+  aparser.add_argument("--delay", type = float, default = 0.25, help = "Time each call takes at the aggregate")
+  aparser.set_defaults(func = concurrent)
+
+  wparser = sub.add_parser("write", help = "Write a ListResources response (used by the other benchmarks)")
+  wparser.add_argument("path")
+  addAdArgs(wparser)
+  wparser.add_argument("--compressed", action = "store_true")
+  wparser.set_defaults(func = lambda opts: writeResponse(opts.path, opts))
+
+  rparser = sub.add_parser("run", help = "Run a single decoder (used by the other benchmarks)")
+  rparser.add_argument("mode", choices = sorted(DECODERS))
+  rparser.add_argument("path")
+  rparser.set_defaults(func = lambda opts: run(opts.mode, opts.path))
+
+  return parser.parse_args()
+
+if __name__ == '__main__':
+  opts = parseArgs()
+  opts.func(opts)